@@ -0,0 +1,41 @@
+"""
+Generates `source/termighty/data/cell_widths.json` -- the ranges of code points that take zero or two terminal cells,
+as used by `termighty.CellWidth` -- from the Unicode database of the running Python.  Run again with a newer Python to
+update the table to a newer version of Unicode.
+"""
+
+import json
+import os
+import sys
+import unicodedata
+
+
+def ranges(code_points: list[int, ...]) -> list[list[int, int], ...]:
+    """
+    Merge the given sorted code points into inclusive [first, last] ranges.
+    """
+    merged: list[list[int, int], ...] = []
+    for code_point in code_points:
+        if merged and merged[-1][1] == code_point - 1:
+            merged[-1][1] = code_point
+        else:
+            merged.append([code_point, code_point])
+    return merged
+
+
+zero: list[int, ...] = []
+wide: list[int, ...] = []
+for code_point in range(sys.maxunicode + 1):
+    char: str = chr(code_point)
+    # Combining marks and format characters (such as zero-width joiners) are drawn over the preceding character, apart
+    # from the soft hyphen; so are the medial vowels and final consonants of conjoining Hangul syllables.
+    if (unicodedata.category(char) in ("Mn", "Me", "Cf") and code_point != 0xAD) or 0x1160 <= code_point <= 0x11FF:
+        zero.append(code_point)
+    # Wide and fullwidth characters (CJK ideographs, Hangul syllables, most emoji) take two cells.
+    elif unicodedata.east_asian_width(char) in ("W", "F"):
+        wide.append(code_point)
+
+path: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "source", "termighty", "data", "cell_widths.json")
+with open(path, "w") as outfile:
+    json.dump({"unicode version": unicodedata.unidata_version, "zero": ranges(zero), "wide": ranges(wide)}, outfile)
+    outfile.write("\n")
@@ -1,5 +1,51 @@
-from . import settings
-from .obj import *
-from .utils import *
-from .settings import *
-from .widgets import *
+import importlib
+
+# The public names of the package, mapped to the subpackage that defines them.  Subpackages are only imported the first
+# time one of their names is accessed, such that importing termighty has no side effects: no data files are read, no
+# threads are started, and the terminal is not queried.
+_names: dict[str, str] = {
+    "Color": "obj",
+    "String": "obj",
+    "Config": "settings",
+    "Data": "settings",
+    "System": "settings",
+    "Paste": "utils",
+    "KeyDecoder": "utils",
+    "Listener": "utils",
+    "Term": "utils",
+    "KeyProcessor": "utils",
+    "TextBuffer": "utils",
+    "TextLayout": "utils",
+    "Selection": "utils",
+    "EditHistory": "utils",
+    "Search": "utils",
+    "LineWrapper": "utils",
+    "CellWidth": "utils",
+    "Screen": "widgets",
+    "TextBox": "widgets",
+    "TextEditor": "widgets",
+}
+# The subpackages of termighty, which are also imported on first access.
+_subpackages: tuple[str, ...] = ("obj", "settings", "utils", "widgets")
+
+__all__: list[str, ...] = list(_names)
+
+
+def __getattr__(name: str):
+    """
+    Import the subpackage that defines the given name the first time it is accessed.
+    """
+    if name in _subpackages:
+        return importlib.import_module(f".{name}", __name__)
+    if name not in _names:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_names[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str, ...]:
+    """
+    List the names of the package, including those that have not been imported yet.
+    """
+    return sorted(set(globals()) | set(__all__) | set(_subpackages))
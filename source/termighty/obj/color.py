@@ -2,7 +2,7 @@ from termighty.settings.data import Data
 from termighty.settings.system import System
 from typing import Optional, Sequence
 
-import numpy as np
+import math
 
 
 class Color:
@@ -46,13 +46,12 @@ class Color:
             raise ValueError(error_message)
 
         step: int = 256 // term_width + 1
-        colors: np.ndarray = np.arange(0, 256, step)
-        color_grid: list[np.ndarray, np.ndarray] = np.meshgrid(colors, colors[::2])
+        colors: range = range(0, 256, step)
         out: str = ""
         char: str = "\033[38;2;{:d};{:d};{:d}m█\033[m"
-        rgb: np.ndarray = np.zeros(3, dtype=np.uint8)
-        for m, n in zip(*color_grid):
-            for i, j in zip(m, n):
+        rgb: list[int, int, int] = [0, 0, 0]
+        for j in colors[::2]:
+            for i in colors:
                 rgb[idx] = val
                 rgb[(idx + 1) % 3] = j
                 rgb[(idx + 2) % 3] = i
@@ -80,40 +79,23 @@ class Color:
         rgb_str: str = "{:03d}{:03d}{:03d}"
         if sort_by.lower() == "rgb":
 
-            sorted_list: list = []
-            rgb_vals: list[int, ...] = [int(rgb_str.format(*i._rgb)) for i in colors]
-            idx: int = np.argsort(rgb_vals)
-            for i in idx:
-                sorted_list.append(colors[i])
-            colors: list["Color"] = sorted_list
+            colors: list["Color"] = sorted(colors, key=lambda color: int(rgb_str.format(*color._rgb)))
 
         elif sort_by.lower() == "step":
 
             repetitions: int = 8
+            weights: tuple[float, float, float] = (0.241, 0.691, 0.068)
 
-            sorted_list: list = []
-            weights: np.ndarray = np.array([0.241, 0.691, 0.068], dtype=np.float64)
-            lum_vals: np.ndarray = np.array([np.sqrt(np.sum(weights * i._rgb)) for i in colors])
-            hsv_vals: np.ndarray = np.array([i.hsv() for i in colors])
+            def step_key(color: "Color") -> tuple[int, int, int]:
+                h, _, v = color.hsv()
+                lum: float = math.sqrt(sum(weight * channel for weight, channel in zip(weights, color._rgb)))
+                return (int(h * repetitions), int(lum * repetitions), int(v * repetitions))
 
-            h: np.ndarray = (hsv_vals[:, 0] * repetitions).astype(np.int64)[:, np.newaxis]
-            lum: np.ndarray = (lum_vals * repetitions).astype(np.int64)[:, np.newaxis]
-            v: np.ndarray = (hsv_vals[:, 2] * repetitions).astype(np.int64)[:, np.newaxis]
-
-            sort_keys: np.ndarray = np.concatenate([h, lum, v], axis=1)
-            sort_keys: np.ndarray = np.lexsort((sort_keys[:, 2], sort_keys[:, 1], sort_keys[:, 0]), axis=0)
-            for i in sort_keys:
-                sorted_list.append(colors[i])
-            colors: list["Color"] = sorted_list
+            colors: list["Color"] = sorted(colors, key=step_key)
 
         elif sort_by.lower() == "light":
 
-            sorted_list: list = []
-            rgb_vals: list[float] = [i.lightness(True) for i in colors]
-            idx = np.argsort(rgb_vals)
-            for i in idx:
-                sorted_list.append(colors[i])
-            colors: list["Color", ...] = sorted_list
+            colors: list["Color", ...] = sorted(colors, key=lambda color: color.lightness(True))
 
         elif sort_by.lower() != "alpha":
 
@@ -167,9 +149,7 @@ class Color:
         Return a new instance of class `Color`.  Argument `rgb` should be a sequence containing three integers in the
         range [0, 255].
         """
-        # Creating a np.ndarray of zeros that will contain the rgb values as three 8-bit unsigned integers.
-        self._rgb: np.ndarray = np.zeros(3, np.uint8)
-        # Set the RGB value using the `rgb` property setter.
+        # Set the RGB value using the `rgb` property setter, which stores it as a tuple of three integers.
         self.rgb = rgb
         # Set the name using the `name` property setter.
         self.name = name
@@ -181,8 +161,7 @@ class Color:
         Add colors together by summing over their RGB values.  If this results in a value greater than 255 in one or
         more color channels, sets these channels to 255.
         """
-        rgb: np.ndarray = self._rgb.astype(np.int64) + color._rgb.astype(np.int64)
-        rgb[rgb > 255] = 255
+        rgb: tuple[int, int, int] = tuple(min(i + j, 255) for i, j in zip(self._rgb, color._rgb))
         return self.__class__(rgb)
 
     def __call__(self, string: str) -> str:
@@ -234,8 +213,7 @@ class Color:
         Subtract colors from each other by subtracting their RGB values. If this results in a negative value in one or
         more color channels, sets these channels to zero.
         """
-        rgb: np.ndarray = self._rgb.astype(np.int64) - color._rgb.astype(np.int64)
-        rgb[rgb < 0] = 0
+        rgb: tuple[int, int, int] = tuple(max(i - j, 0) for i, j in zip(self._rgb, color._rgb))
         return self.__class__(rgb)
 
     """PROPERTIES"""
@@ -245,14 +223,14 @@ class Color:
         """
         Return current instance's blue RGB value as an integer in the range [0, 255].
         """
-        return int(self._rgb[2])
+        return self._rgb[2]
 
     @property
     def g(self) -> int:
         """
         Return current instance's green RGB value as an integer in the range [0, 255].
         """
-        return int(self._rgb[1])
+        return self._rgb[1]
 
     @property
     def name(self) -> str:
@@ -266,30 +244,30 @@ class Color:
         """
         Return current instance's red RGB value as an integer in the range [0, 255].
         """
-        return int(self._rgb[0])
+        return self._rgb[0]
 
     @property
     def rgb(self) -> tuple[int, int, int]:
         """
         Return the current instance's RGB values as a tuple of integers.
         """
-        return (int(self._rgb[0]), int(self._rgb[1]), int(self._rgb[2]))
+        return self._rgb
 
     """SETTER METHODS"""
 
     @b.setter
     def b(self, b: int) -> None:
         """
-        Set the blue channel in the rgb array to a new value.  Expects an integer in the range [0, 255].
+        Set the blue channel in the rgb tuple to a new value.  Expects an integer in the range [0, 255].
         """
-        self._rgb[2] = b
+        self._rgb: tuple[int, int, int] = (self._rgb[0], self._rgb[1], int(b))
 
     @g.setter
     def g(self, g: int) -> None:
         """
-        Set the green channel in the rgb array to a new value.  Expects an integer in the range [0, 255].
+        Set the green channel in the rgb tuple to a new value.  Expects an integer in the range [0, 255].
         """
-        self._rgb[1] = g
+        self._rgb: tuple[int, int, int] = (self._rgb[0], int(g), self._rgb[2])
 
     @name.setter
     def name(self, name: str) -> None:
@@ -301,9 +279,9 @@ class Color:
     @r.setter
     def r(self, r: int) -> None:
         """
-        Set the red channel in the rgb array to a new value.  Expects an integer in the range [0, 255].
+        Set the red channel in the rgb tuple to a new value.  Expects an integer in the range [0, 255].
         """
-        self._rgb[0] = r
+        self._rgb: tuple[int, int, int] = (int(r), self._rgb[1], self._rgb[2])
 
     @rgb.setter
     def rgb(self, rgb: Sequence[int]) -> None:
@@ -311,8 +289,7 @@ class Color:
         Reset the rgb values of the `Color` instance. Argument `rgb` should be a sequence containing three integers in
         the range [0,255].
         """
-        for i in range(3):
-            self._rgb[i] = rgb[i]
+        self._rgb: tuple[int, int, int] = (int(rgb[0]), int(rgb[1]), int(rgb[2]))
 
     """PUBLIC METHODS"""
 
@@ -320,7 +297,7 @@ class Color:
         """
         Return the mean of the RGB values, which can be considered a measure of the color's brightness.
         """
-        return int(np.mean(self._rgb))
+        return int(sum(self._rgb) / 3)
 
     def copy(self) -> "Color":
         """
@@ -336,12 +313,11 @@ class Color:
         their equivalent hue, saturation, and brightness.  HSV is a representation of color that attempts to more
         closely represent the way that human vision interprets color.
         """
-        rgb: np.ndarray = self._rgb.astype(np.float64) / 255
+        rgb: tuple[float, float, float] = tuple(i / 255 for i in self._rgb)
         add: tuple[int, int, int] = (360, 120, 240)
 
-        idx_max: int = np.argmax(rgb)
-        idx_min: int = np.argmin(rgb)
-        diff: int = np.max(rgb) - np.min(rgb)
+        idx_max: int = rgb.index(max(rgb))
+        diff: float = max(rgb) - min(rgb)
 
         if diff == 0:
             h: int = 0
@@ -349,12 +325,12 @@ class Color:
             h: float = (rgb[(idx_max + 1) % 3] - rgb[(idx_max + 2) % 3]) / diff
             h: float = (60 * h + add[idx_max]) % 360
 
-        if np.max(rgb) == 0:
+        if max(rgb) == 0:
             s: int = 0
         else:
-            s: float = 100 * diff / np.max(rgb)
+            s: float = 100 * diff / max(rgb)
 
-        v: float = 100 * np.max(rgb)
+        v: float = 100 * max(rgb)
 
         return (h, s, v)
 
@@ -368,16 +344,15 @@ class Color:
         Source of weights: http://alienryderflex.com/hsp.html
         """
         if weighted:
-            weights: np.ndarray = np.array([0.299, 0.587, 0.114], dtype=np.float64)
+            weights: tuple[float, float, float] = (0.299, 0.587, 0.114)
         else:
-            weights: np.ndarray = np.ones(3, dtype=np.float64)
-        return np.sum(weights * self._rgb.astype(np.float64) ** 2) / 65025
+            weights: tuple[float, float, float] = (1.0, 1.0, 1.0)
+        return sum(weight * channel**2 for weight, channel in zip(weights, self._rgb)) / 65025
 
     def negative(self) -> "Color":
         """
         Return the color negative of the current instance, which is the element-wise difference (255-R, 255-G, 255-B),
         where `R`, `G`, and `B` are the current instance's color channels.
         """
-        rgb: np.ndarray = np.full(3, 255, dtype=np.uint8)
-        rgb: np.ndarray = rgb - self._rgb
+        rgb: tuple[int, int, int] = tuple(255 - i for i in self._rgb)
         return self.__class__(rgb=rgb)
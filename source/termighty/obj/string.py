@@ -5,8 +5,6 @@ from termighty.settings.config import Config
 from termighty.settings.data import Data
 from typing import Optional, Union
 
-import numpy as np
-
 
 class String(UserString):
     """
@@ -26,11 +24,8 @@ class String(UserString):
         out: str = "\nList of Available Styles (may differ based on OS/terminal)\n\n\n"
         style_str: str = "\033[{}mSAMPLE text\033[m\t{}"
 
-        style_keys: list[str, ...] = list(Data.styles.keys())
-        style_values: list[str, ...] = list(Data.styles.values())
-
-        for i in np.argsort(style_keys):
-            out += f"{style_str.format(style_values[i], style_keys[i])}\n\n"
+        for key in sorted(Data.styles.keys()):
+            out += f"{style_str.format(Data.styles[key], key)}\n\n"
 
         return out
 
@@ -1,39 +1,70 @@
+from termighty.settings.lazy_attribute import LazyAttribute
+
 import importlib.resources
 import configparser
 
+from typing import Callable
+
+
+def _setting(section: str, option: str, convert: Callable[[str], object] = str) -> LazyAttribute:
+    """
+    Return a `LazyAttribute` for the given option of the given section of `config.ini`, converted with `convert`.
+    """
+
+    def setting(cls: type) -> object:
+        return convert(cls.parser[section][option])
+
+    return LazyAttribute(setting)
+
 
 class Config:
     """
-    Dataclass that contains the program settings as given in `config.ini`.
+    Dataclass that contains the program settings as given in `config.ini`.  The file is only read the first time one
+    of the settings is accessed.
     """
 
-    with importlib.resources.open_text("termighty", "config.ini") as infile:
-        parser = configparser.ConfigParser()
-        parser.readfp(infile)
+    @LazyAttribute
+    def parser(cls) -> configparser.ConfigParser:
+        """
+        The parsed contents of `config.ini`.
+        """
+        with importlib.resources.open_text("termighty", "config.ini") as infile:
+            parser = configparser.ConfigParser()
+            parser.read_file(infile)
+        return parser
 
     # The default background color.
-    background_color = parser["Colors and Style"]["background color"]
+    background_color = _setting("Colors and Style", "background color")
     # The default foreground color.
-    foreground_color = parser["Colors and Style"]["foreground color"]
+    foreground_color = _setting("Colors and Style", "foreground color")
     # The default text style.
-    style = parser["Colors and Style"]["style"]
+    style = _setting("Colors and Style", "style")
 
     # The default background color for selected text.
-    selected_background_color = parser["Colors and Style"]["selected text background color"]
+    selected_background_color = _setting("Colors and Style", "selected text background color")
     # The default foreground color for selected text.
-    selected_foreground_color = parser["Colors and Style"]["selected text foreground color"]
+    selected_foreground_color = _setting("Colors and Style", "selected text foreground color")
     # The default style for selected text.
-    selected_style = parser["Colors and Style"]["selected text style"]
+    selected_style = _setting("Colors and Style", "selected text style")
 
     # The default background color for line numbers.
-    line_numbers_background_color = parser["Colors and Style"]["line numbers background color"]
+    line_numbers_background_color = _setting("Colors and Style", "line numbers background color")
     # The default foreground color for line numbers.
-    line_numbers_foreground_color = parser["Colors and Style"]["line numbers foreground color"]
+    line_numbers_foreground_color = _setting("Colors and Style", "line numbers foreground color")
     # The default style for line numbers.
-    line_numbers_style = parser["Colors and Style"]["line numbers style"]
+    line_numbers_style = _setting("Colors and Style", "line numbers style")
 
     # The default number of spaces per tab.
-    tab_length = int(parser["Formatting"]["tab length"])
+    tab_length = _setting("Formatting", "tab length", int)
 
     # The minimum width of the column containing line numbers (if line numbers are active).
-    line_numbers_width = int(parser["Formatting"]["line numbers minimum width"])
+    line_numbers_width = _setting("Formatting", "line numbers minimum width", int)
+
+    # The maximum number of frames per second drawn by the `Screen` render scheduler.
+    frame_rate = _setting("Rendering", "frame rate", int)
+
+    # The maximum number of inputs kept in the `Listener` history; consumers that fall further behind are overrun.
+    history_capacity = _setting("Input", "history capacity", int)
+
+    # The maximum number of bytes of edits kept by the undo history of each `TextEditor`.
+    undo_history_size = _setting("Editing", "undo history size", int)
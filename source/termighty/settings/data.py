@@ -1,28 +1,147 @@
 import codecs
-import importlib.resources
-import json
+import marshal
+import os
+import sys
+from termighty.settings.lazy_attribute import LazyAttribute
 from termighty.settings.system import System
+from typing import Any, Callable, Optional
 
 
 class Data:
     """
     Dataclass that contains all the package data.  Can be used to decode ANSI escape sequences, get RGB values from
-    color names, and access ANSI codes for string styles.
+    color names, and access ANSI codes for string styles.  Each data file is only loaded the first time it is needed.
+
+    Once decoded, each data file is cached in the user's cache directory with `marshal`, such that later processes load
+    it with a single read -- the cache is ignored (and rewritten) if the data file, Python, or the OS has changed.
+    Neither `json` nor `importlib.resources` are imported unless a data file has to be decoded.
     """
 
-    with importlib.resources.open_text("termighty.data", "keymaps.json") as infile:
-        keymaps = json.load(infile)
+    # Directory containing the data files, if the package is installed on the filesystem (rather than zipped).
+    _data_directory: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+    # Version of the layout of the cached data -- must be incremented whenever the way the data is decoded changes.
+    _cache_format: int = 1
+
+    """PRIVATE METHODS"""
+
+    @staticmethod
+    def _cache_directory() -> str:
+        """
+        Return the directory in which the decoded data files are cached.
+        """
+        if System.os == "Windows":
+            base: str = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        else:
+            base: str = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, "termighty")
+
+    @staticmethod
+    def _decode_cell_widths(table: dict[str, list[list[int, int], ...]]) -> tuple[list[int, ...], ...]:
+        """
+        Merge the ranges of zero-width and wide code points from the contents of `cell_widths.json` into three parallel
+        lists, sorted for bisection: the first and last code point of each range, and the width of its characters.
+        """
+        ranges: list[tuple[int, int, int], ...] = sorted(
+            [(first, last, 0) for first, last in table["zero"]] + [(first, last, 2) for first, last in table["wide"]]
+        )
+        return tuple(list(column) for column in zip(*ranges))
+
+    @staticmethod
+    def _decode_keymaps(keymaps: dict[str, dict[str, str]]) -> dict[bytes, str]:
+        """
+        Select the keymaps of the current OS from the contents of `keymaps.json`, and decode their escape sequences.
+        """
+        # Loads a set of keymaps depending on the current OS in use.
+        if System.os == "Windows":
+            keymaps = keymaps["windows"]
+        else:
+            keymaps = keymaps["linux"]
+        # Encoding the dictionary keys using the OEM-standard.
+        return {codecs.escape_decode(key)[0]: value for key, value in keymaps.items()}
+
+    @classmethod
+    def _load(cls, filename: str, decode: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Return the contents of the given JSON data file, processed by `decode` (if given).  Read from the cache if it
+        was made from the same data file, by the same versions of Python and of the cache layout, on the same OS --
+        otherwise, the data file is decoded and the cache is rewritten.  Failing to read or write the cache is not an
+        error, it only means that the data file is decoded again.
+        """
+        source: str = os.path.join(cls._data_directory, filename)
+        try:
+            stat: os.stat_result = os.stat(source)
+            key: Optional[tuple] = (
+                cls._cache_format,
+                marshal.version,
+                tuple(sys.version_info[:2]),
+                System.os,
+                stat.st_mtime_ns,
+                stat.st_size,
+            )
+        except OSError:
+            # The data file is not on the filesystem (e.g. the package is zipped), so its cache could never be checked.
+            key: Optional[tuple] = None
+        path: str = os.path.join(cls._cache_directory(), os.path.splitext(filename)[0] + ".marshal")
+
+        data: Any = None
+        cached: bool = False
+        if key is not None:
+            try:
+                with open(path, "rb") as infile:
+                    cached_key, cached_data = marshal.loads(infile.read())
+                if cached_key == key:
+                    data, cached = cached_data, True
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+
+        if not cached:
+            import importlib.resources
+            import json
+
+            with importlib.resources.open_text("termighty.data", filename) as infile:
+                data = json.load(infile)
+            if decode is not None:
+                data = decode(data)
+            if key is not None:
+                # Written to a temporary file first, such that other processes never read a partially written cache.
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    temporary_path: str = f"{path}.{os.getpid()}.tmp"
+                    with open(temporary_path, "wb") as outfile:
+                        outfile.write(marshal.dumps((key, data)))
+                    os.replace(temporary_path, path)
+                except (OSError, ValueError):
+                    pass
+        return data
+
+    """DATA"""
+
+    @LazyAttribute
+    def keymaps(cls) -> dict[bytes, str]:
+        """
+        The names of the keys, keyed by the escape sequences that the terminal sends for them.
+        """
+        return cls._load("keymaps.json", cls._decode_keymaps)
 
-    # Loads a set of keymaps depending on the current OS in use.
-    if System.os == "Windows":
-        keymaps = keymaps["windows"]
-    else:
-        keymaps = keymaps["linux"]
-    # Encoding the dictionary keys using the OEM-standard.
-    keymaps = {codecs.escape_decode(key)[0]: value for key, value in keymaps.items()}
+    @LazyAttribute
+    def cell_widths(cls) -> tuple[list[int, ...], list[int, ...], list[int, ...]]:
+        """
+        The ranges of code points whose characters take zero or two terminal cells, as (first code points, last code
+        points, widths) -- every other character takes one cell.  See `CellWidth`.
+        """
+        return cls._load("cell_widths.json", cls._decode_cell_widths)
 
-    with importlib.resources.open_text("termighty.data", "rgb.json") as infile:
-        colors = json.load(infile)
+    @LazyAttribute
+    def colors(cls) -> dict[str, list[int, int, int]]:
+        """
+        The RGB values of the colors in the catalog, keyed by color name.
+        """
+        return cls._load("rgb.json")
 
-    with importlib.resources.open_text("termighty.data", "styles.json") as infile:
-        styles = json.load(infile)
+    @LazyAttribute
+    def styles(cls) -> dict[str, str]:
+        """
+        The ANSI codes of the text styles, keyed by style name.
+        """
+        return cls._load("styles.json")
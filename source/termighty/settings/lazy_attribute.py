@@ -0,0 +1,36 @@
+from typing import Any, Callable
+
+
+class LazyAttribute:
+    """
+    Class attribute whose value is only computed the first time it is accessed, by calling the decorated function with
+    the class it belongs to.  The value then replaces the `LazyAttribute` on that class (even if it was accessed through
+    a subclass, so that the value is shared), such that later accesses are as fast as those of any other class
+    attribute.
+
+    Used to defer loading the package data and settings (and querying the terminal) until they are actually needed,
+    rather than when `termighty` is imported.
+    """
+
+    def __init__(self, function: Callable[[type], Any]) -> None:
+        """
+        Wrap the given function, which is called with the owner class and returns the value of the attribute.
+        """
+        self._function: Callable[[type], Any] = function
+        self._name: str = function.__name__
+        self.__doc__ = function.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        """
+        Record the owner class, and the name the `LazyAttribute` is assigned to in it.
+        """
+        self._owner: type = owner
+        self._name: str = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        """
+        Compute the value of the attribute, and store it on the owner class in place of the `LazyAttribute`.
+        """
+        value: Any = self._function(self._owner)
+        setattr(self._owner, self._name, value)
+        return value
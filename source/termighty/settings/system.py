@@ -1,17 +1,56 @@
+from termighty.settings.lazy_attribute import LazyAttribute
+
 import platform
 import shutil
+import signal
 import threading
 import time
 import warnings
 
+from typing import Callable, Optional
+
+
+class _SystemType(type):
+    """
+    Metaclass of `System`, which makes `kill_all` a property of the class: setting it to `True` calls every callback
+    subscribed with `System.subscribe_kill`, such that threads sleeping until there is work to do are woken up and stop,
+    rather than having to wake up periodically to check it.
+    """
+
+    @property
+    def kill_all(cls) -> bool:
+        """
+        If set to true, stops all processes.
+        """
+        return cls._kill_all
+
+    @kill_all.setter
+    def kill_all(cls, state: bool) -> None:
+        """
+        Set the `kill_all` flag, and call the kill subscribers if it is being set.
+        """
+        cls._kill_all: bool = state
+        if state:
+            with cls._subscribers_lock:
+                callbacks: list[Callable[[], None], ...] = list(cls._kill_subscribers)
+            for callback in callbacks:
+                callback()
+
 
-class System:
+class System(metaclass=_SystemType):
     """
     Used to keep track of the terminal dimensions, and detect the current OS. Also contains the `kill_all` class
     attribute, which is by default set to `False`.  If it is set to `True`, all active termighty threads will be killed.
     """
 
-    terminal_size: tuple[int, int] = tuple(shutil.get_terminal_size())[::-1]
+    @LazyAttribute
+    def terminal_size(cls) -> tuple[int, int]:
+        """
+        The terminal dimensions as (rows, columns) -- queried on first access, and kept up to date once tracking has
+        started (see `track_terminal_shape`).
+        """
+        return cls._read_terminal_size()
+
     os = platform.system()
 
     # If the operating system is Darwin (macOS) then will warn the user that it is untested, and default to Linux mode.
@@ -25,16 +64,146 @@ class System:
     else:
         escape_code_encoding = "utf"
 
-    # If set to true, stops all processes.
-    kill_all = False
+    # Backs the `kill_all` property -- if set to true, stops all processes.
+    _kill_all: bool = False
+    # Callbacks called without arguments when `kill_all` is set to true (dicts preserve the order).
+    _kill_subscribers: dict[Callable[[], None], None] = {}
+
+    # Time (in seconds) the terminal dimensions must stay unchanged after a resize before subscribers are notified, such
+    # that dragging the edge of the window triggers a single relayout once it settles.
+    _resize_debounce: float = 0.05
+    # Interval (in seconds) at which the terminal dimensions are polled, on platforms without `SIGWINCH`.
+    _poll_interval: float = 0.05
+    # Set by the `SIGWINCH` handler, and waited on by the thread tracking the terminal dimensions.
+    _resize_event: threading.Event = threading.Event()
+    # Callbacks to be called with the new terminal dimensions whenever they change (dicts preserve the order).
+    _subscribers: dict[Callable[[tuple[int, int]], None], None] = {}
+    _subscribers_lock: threading.Lock = threading.Lock()
+    # The thread tracking the terminal dimensions, and the `SIGWINCH` handler that was installed before ours (if any).
+    _tracker_thread: Optional[threading.Thread] = None
+    _tracker_lock: threading.Lock = threading.Lock()
+    _previous_handler = None
+
+    """PRIVATE METHODS"""
+
+    @classmethod
+    def _handle_sigwinch(cls, signum: int, frame) -> None:
+        """
+        Signal handler for `SIGWINCH`, sent by the terminal whenever it is resized.  Only wakes up the tracking thread,
+        and passes the signal on to any handler installed beforehand.
+        """
+        cls._resize_event.set()
+        if callable(cls._previous_handler):
+            cls._previous_handler(signum, frame)
+
+    @classmethod
+    def _poll_terminal_shape(cls) -> None:
+        """
+        Fallback for platforms without `SIGWINCH`: poll the terminal dimensions, and update them once they settle.
+        """
+        while not cls.kill_all:
+            if cls._read_terminal_size() != cls.terminal_size:
+                cls._settle()
+            time.sleep(cls._poll_interval)
+
+    @staticmethod
+    def _read_terminal_size() -> tuple[int, int]:
+        """
+        Return the current terminal dimensions as (rows, columns).
+        """
+        return tuple(shutil.get_terminal_size())[::-1]
+
+    @classmethod
+    def _settle(cls) -> None:
+        """
+        Wait until the terminal dimensions stop changing, then update `terminal_size` and notify the subscribers once.
+        """
+        terminal_size: tuple[int, int] = cls._read_terminal_size()
+        while True:
+            time.sleep(cls._resize_debounce)
+            if (new_terminal_size := cls._read_terminal_size()) == terminal_size:
+                break
+            terminal_size = new_terminal_size
+
+        if terminal_size != cls.terminal_size:
+            cls.terminal_size: tuple[int, int] = terminal_size
+            with cls._subscribers_lock:
+                subscribers: list[Callable[[tuple[int, int]], None], ...] = list(cls._subscribers)
+            for callback in subscribers:
+                callback(terminal_size)
 
     @classmethod
-    def track_terminal_shape(cls):
+    def _wait_terminal_shape(cls) -> None:
+        """
+        Sleep until a `SIGWINCH` arrives, then update the terminal dimensions once no further signal has arrived for
+        `_resize_debounce` seconds.
+        """
         while not cls.kill_all:
-            if (terminal_size := tuple(shutil.get_terminal_size())[::-1]) != cls.terminal_size:
-                cls.terminal_size: tuple[int, int] = terminal_size
-            time.sleep(0.05)
+            cls._resize_event.wait()
+            cls._resize_event.clear()
+            while cls._resize_event.wait(timeout=cls._resize_debounce):
+                cls._resize_event.clear()
+            cls._settle()
+
+    """PUBLIC METHODS"""
 
+    @classmethod
+    def subscribe(cls, callback: Callable[[tuple[int, int]], None]) -> None:
+        """
+        Call the given function with the new terminal dimensions (as (rows, columns)) whenever the terminal is resized.
+        Called once per resize, from the thread tracking the terminal dimensions, after the dimensions have settled.
+        Starts tracking the terminal dimensions, if they are not tracked already.
+        """
+        with cls._subscribers_lock:
+            cls._subscribers[callback] = None
+        cls.track_terminal_shape()
 
-track_terminal_shape_thread = threading.Thread(target=System.track_terminal_shape, daemon=True)
-track_terminal_shape_thread.start()
+    @classmethod
+    def subscribe_kill(cls, callback: Callable[[], None]) -> None:
+        """
+        Call the given function (without arguments) whenever `kill_all` is set to true, from the thread that sets it.
+        Used to wake up threads that sleep until they have work to do, such that they notice `kill_all` immediately.
+        """
+        with cls._subscribers_lock:
+            cls._kill_subscribers[callback] = None
+
+    @classmethod
+    def track_terminal_shape(cls) -> threading.Thread:
+        """
+        Start keeping `terminal_size` up to date in a background thread, if it is not already, and return the thread.
+
+        The thread sleeps until the terminal sends `SIGWINCH` -- or, on platforms without it (or if the signal handler
+        cannot be installed because this is not the main thread), polls the terminal dimensions instead.  Called by
+        `subscribe`, and by `Term` when it first outputs to the terminal.
+        """
+        if cls._tracker_thread is None:
+            with cls._tracker_lock:
+                if cls._tracker_thread is None:
+                    # The terminal may have been resized since its dimensions were first queried.
+                    cls.terminal_size: tuple[int, int] = cls._read_terminal_size()
+                    target: Callable[[], None] = cls._poll_terminal_shape
+                    if hasattr(signal, "SIGWINCH"):
+                        try:
+                            System._previous_handler = signal.signal(signal.SIGWINCH, cls._handle_sigwinch)
+                            target = cls._wait_terminal_shape
+                        except ValueError:
+                            pass
+                    System._tracker_thread = threading.Thread(target=target, daemon=True)
+                    System._tracker_thread.start()
+        return cls._tracker_thread
+
+    @classmethod
+    def unsubscribe(cls, callback: Callable[[tuple[int, int]], None]) -> None:
+        """
+        Stop calling the given function when the terminal is resized.
+        """
+        with cls._subscribers_lock:
+            cls._subscribers.pop(callback, None)
+
+    @classmethod
+    def unsubscribe_kill(cls, callback: Callable[[], None]) -> None:
+        """
+        Stop calling the given function when `kill_all` is set to true.
+        """
+        with cls._subscribers_lock:
+            cls._kill_subscribers.pop(callback, None)
@@ -0,0 +1,124 @@
+from termighty.settings.data import Data
+
+import bisect
+
+
+class _CharWidths(dict):
+    """
+    The widths of the characters measured so far, keyed by character -- characters that are not in the dict yet are
+    looked up in the table on first access, such that strings can be measured with `map(widths.__getitem__, text)`.
+    """
+
+    def __missing__(self, char: str) -> int:
+        """
+        Look up the width of a character that has not been measured yet, and remember it.
+        """
+        width: int = CellWidth.char_width(char)
+        self[char] = width
+        return width
+
+
+class CellWidth:
+    """
+    Measures text in terminal cells rather than in characters: wide characters (such as CJK ideographs, Hangul syllables
+    and most emoji) take two cells, combining marks and other zero-width characters (such as accents written as
+    separate code points, variation selectors and zero-width joiners) are drawn over the preceding character, and every
+    other character takes one cell.
+
+    The widths come from a compact table of the ranges of zero-width and wide code points, generated from the Unicode
+    database by `scripts/generate_cell_widths.py` and loaded the first time a non-ASCII character is measured (see
+    `Data.cell_widths`).  ASCII text, which takes one cell per character, is never looked up, and the width of every
+    other character is only looked up once.
+    """
+
+    # Characters below this code point all take one cell, and are not looked up in the table.
+    _narrow_below: int = 0x300
+
+    # The widths of the characters measured so far.
+    _widths: _CharWidths = _CharWidths()
+
+    """PUBLIC METHODS"""
+
+    @classmethod
+    def cells(cls, text: str) -> list[str, ...]:
+        """
+        Split the given text into the contents of the terminal cells it takes, in order.  A wide character is followed
+        by an empty string, standing for the cell taken by its right half, and zero-width characters are kept in the
+        same cell as the character they are drawn over (or the following one, at the start of the text).
+        """
+        if text.isascii():
+            return list(text)
+
+        cells: list[str, ...] = []
+        prefix: str = ""
+        widths: _CharWidths = cls._widths
+        for char in text:
+            if (width := widths[char]) == 0:
+                if cells:
+                    cells[-2 if cells[-1] == "" else -1] += char
+                else:
+                    prefix += char
+            else:
+                cells.append(prefix + char)
+                prefix = ""
+                if width == 2:
+                    cells.append("")
+        return cells
+
+    @classmethod
+    def char_width(cls, char: str) -> int:
+        """
+        Return the number of terminal cells taken by the given character: 0, 1, or 2.
+        """
+        if (code_point := ord(char)) < cls._narrow_below:
+            return 1
+        firsts, lasts, widths = Data.cell_widths
+        index: int = bisect.bisect_right(firsts, code_point) - 1
+        if index >= 0 and code_point <= lasts[index]:
+            return widths[index]
+        return 1
+
+    @classmethod
+    def column(cls, text: str, index: int) -> int:
+        """
+        Return the cell at which the character at the given index of the text is displayed, counting from the start of
+        the text.  Indices past the end of the text are taken to be one cell apart, as if the text were padded with
+        spaces.
+        """
+        if index <= 0 or text.isascii():
+            return index
+        return cls.string_width(text[:index]) + max(index - len(text), 0)
+
+    @classmethod
+    def narrow(cls, text: str) -> bool:
+        """
+        Return True if every character of the given text takes exactly one cell, such that its width is its length.
+        """
+        return text.isascii() or set(map(cls._widths.__getitem__, text)) <= {1}
+
+    @classmethod
+    def slice(cls, text: str, start: int, stop: int) -> str:
+        """
+        Return the part of the given text displayed in cells [start, stop), padded with spaces to be exactly `stop -
+        start` cells wide.  A wide character cut in half by either end is replaced by a space.
+        """
+        if text.isascii():
+            return text[start:stop].ljust(stop - start)
+
+        cells: list[str, ...] = cls.cells(text)
+        part: list[str, ...] = cells[start:stop]
+        if part:
+            if part[0] == "":
+                part[0] = " "
+            if stop < len(cells) and cells[stop] == "":
+                part[-1] = " "
+        return "".join(part) + " " * (stop - start - len(part))
+
+    @classmethod
+    def string_width(cls, text: str) -> int:
+        """
+        Return the number of terminal cells taken by the given text.
+        """
+        if text.isascii():
+            return len(text)
+        return sum(map(cls._widths.__getitem__, text))
@@ -0,0 +1,266 @@
+from termighty.settings.config import Config
+from termighty.utils.selection import Selection
+
+import collections
+import sys
+import time
+
+from typing import Optional, Sequence
+
+
+class EditHistory:
+    """
+    Undo and redo stacks for a `TextEditor`, built from the edits recorded by a `TextBuffer` (see
+    `TextBuffer.pop_edits`) rather than from snapshots of the whole text.
+
+    Each edit is stored as the replacement of a span of characters: the position at which the span starts, the text it
+    contained, and the text that replaced it -- trimmed down to the characters that actually changed.  An undo step
+    holds the edits made by one batch of keys, along with the cursor position and selection before and after them, so
+    undoing or redoing it takes time proportional to the size of its edits, however long the text is.
+
+    Steps that type or delete characters right where the previous step left off, less than `_group_interval` seconds
+    later, are merged into a single step.  Once the history takes up more than its budget of bytes, its oldest steps
+    are discarded.
+    """
+
+    # Maximum time (in seconds) between consecutive steps that type or delete characters for them to be merged.
+    _group_interval: float = 1.0
+
+    """CONSTRUCTOR"""
+
+    def __init__(self, budget: Optional[int] = None):
+        """
+        Create an empty EditHistory that keeps at most `budget` bytes of edits -- except for the most recent step,
+        which is always kept.  The budget defaults to the value given in `config.ini`.
+        """
+        self._budget: int = Config.undo_history_size if budget is None else budget
+        # Steps as (edits, state before, state after, size), where each edit is (position, old text, new text), and
+        # each state is (cursor position, selection).
+        self._undo: collections.deque[tuple[list, tuple, tuple, int]] = collections.deque()
+        self._redo: list[tuple[list, tuple, tuple, int]] = []
+        # Total size of the steps in both stacks, in bytes.
+        self._size: int = 0
+        # Time at which the last step was recorded, or None if the next step may not be merged with it.
+        self._time: Optional[float] = None
+
+    """MAGIC METHODS"""
+
+    def __len__(self) -> int:
+        """
+        Return the number of steps that can be undone.
+        """
+        return len(self._undo)
+
+    """PRIVATE METHODS"""
+
+    @staticmethod
+    def _apply(text: Sequence[str], position: tuple[int, int], old: str, new: str) -> None:
+        """
+        Replace the span of characters `old` starting at the given position in the text (a list of lines, or a
+        `TextBuffer`) with `new`, in place.  Only the lines spanned by `old` are replaced.
+        """
+        row, col = position
+        old_lines: list[str, ...] = old.split("\n")
+        stop_row: int = row + len(old_lines) - 1
+        stop_col: int = len(old_lines[-1]) + (col if len(old_lines) == 1 else 0)
+        if len(text) == 0:
+            text.append("")
+        text[row : stop_row + 1] = (text[row][:col] + new + text[stop_row][stop_col:]).split("\n")
+
+    @staticmethod
+    def _combine(
+        edits: list[tuple[int, list[str, ...], list[str, ...]], ...],
+    ) -> list[tuple[int, list[str, ...], list[str, ...]], ...]:
+        """
+        Combine edits recorded by a `TextBuffer`, in the order they were made, into the net replacements of disjoint
+        runs of lines, in the same form and also to be made in order.  Runs whose lines end up unchanged (such as when
+        a character is typed and deleted again) are dropped.
+        """
+        # Runs of replaced lines, sorted and disjoint, as [start in the edited text, old lines, new lines].
+        runs: list[list, ...] = []
+        for start, old_lines, new_lines in edits:
+            stop: int = start + len(old_lines)
+            # The runs that overlap or touch the lines replaced by this edit are merged with it.
+            first: int = 0
+            while first < len(runs) and runs[first][0] + len(runs[first][2]) < start:
+                first += 1
+            last: int = first
+            while last < len(runs) and runs[last][0] <= stop:
+                last += 1
+            touched: list[list, ...] = runs[first:last]
+            low: int = min([start] + [run[0] for run in touched])
+            high: int = max([stop] + [run[0] + len(run[2]) for run in touched])
+
+            # The lines from `low` to `high` before this edit, and before every edit.  Lines outside of the runs are
+            # unchanged, and lie within the lines replaced by this edit.
+            current: list[str, ...] = []
+            original: list[str, ...] = []
+            row: int = low
+            for run_start, run_old, run_new in touched:
+                current += old_lines[row - start : run_start - start] + run_new
+                original += old_lines[row - start : run_start - start] + run_old
+                row: int = run_start + len(run_new)
+            current += old_lines[row - start : high - start]
+            original += old_lines[row - start : high - start]
+
+            for run in runs[last:]:
+                run[0] += len(new_lines) - len(old_lines)
+            runs[first:last] = [[low, original, current[: start - low] + new_lines + current[stop - low :]]]
+        return [(start, old_lines, new_lines) for start, old_lines, new_lines in runs if old_lines != new_lines]
+
+    @staticmethod
+    def _common_prefix(a: str, b: str, limit: int) -> int:
+        """
+        Return the length of the longest common prefix of the two strings, up to `limit` characters.  Bisects with
+        slice comparisons, which is much faster than comparing characters one at a time in long lines.
+        """
+        low, high = 0, limit
+        while low < high:
+            middle: int = (low + high + 1) // 2
+            if a[:middle] == b[:middle]:
+                low: int = middle
+            else:
+                high: int = middle - 1
+        return low
+
+    @staticmethod
+    def _common_suffix(a: str, b: str, limit: int) -> int:
+        """
+        Return the length of the longest common suffix of the two strings, up to `limit` characters.
+        """
+        low, high = 0, limit
+        while low < high:
+            middle: int = (low + high + 1) // 2
+            if a[len(a) - middle :] == b[len(b) - middle :]:
+                low: int = middle
+            else:
+                high: int = middle - 1
+        return low
+
+    @staticmethod
+    def _merge(
+        edit: tuple[tuple[int, int], str, str], new_edit: tuple[tuple[int, int], str, str]
+    ) -> Optional[tuple[tuple[int, int], str, str]]:
+        """
+        Merge two consecutive edits into one, if the second one types characters right after those typed by the first
+        one, or deletes characters right before or after those deleted by the first one.  Returns None otherwise.
+        Edits spanning more than one row are never merged.
+        """
+        (row, col), old, new = edit
+        (new_row, new_col), new_old, new_new = new_edit
+        merged: Optional[tuple[tuple[int, int], str, str]] = None
+        if row != new_row or "\n" in old + new + new_old + new_new:
+            pass
+        elif not old and not new_old and new_col == col + len(new):
+            merged = ((row, col), "", new + new_new)
+        elif not new and not new_new and new_col + len(new_old) == col:
+            merged = ((new_row, new_col), new_old + old, "")
+        elif not new and not new_new and new_col == col:
+            merged = ((row, col), old + new_old, "")
+        return merged
+
+    @staticmethod
+    def _sizeof(edits: list[tuple[tuple[int, int], str, str], ...]) -> int:
+        """
+        Return the approximate number of bytes taken up by the given edits.
+        """
+        return sum(sys.getsizeof(old) + sys.getsizeof(new) for _, old, new in edits)
+
+    @classmethod
+    def _span(
+        cls, start: int, old_lines: list[str, ...], new_lines: list[str, ...]
+    ) -> tuple[tuple[int, int], str, str]:
+        """
+        Convert an edit recorded by a `TextBuffer` (lines starting at row `start` replaced by other lines) into the
+        replacement of the shortest span of characters that covers every change, as (position, old text, new text).
+        """
+        old: str = "\n".join(old_lines)
+        new: str = "\n".join(new_lines)
+        prefix: int = cls._common_prefix(old, new, min(len(old), len(new)))
+        suffix: int = cls._common_suffix(old, new, min(len(old), len(new)) - prefix)
+        # Find the row and column at which the span starts.
+        row: int = start + old.count("\n", 0, prefix)
+        col: int = prefix - (old.rfind("\n", 0, prefix) + 1)
+        return (row, col), old[prefix : len(old) - suffix], new[prefix : len(new) - suffix]
+
+    """PUBLIC METHODS"""
+
+    def clear(self) -> None:
+        """
+        Discard all the steps that can be undone or redone.
+        """
+        self._undo.clear()
+        self._redo.clear()
+        self._size: int = 0
+        self._time: Optional[float] = None
+
+    def record(
+        self,
+        edits: list[tuple[int, list[str, ...], list[str, ...]], ...],
+        before: tuple[tuple[int, int], Selection],
+        after: tuple[tuple[int, int], Selection],
+    ) -> None:
+        """
+        Add a step made of the given edits, as returned by `TextBuffer.pop_edits`, along with the cursor position and
+        selection from before and after they were made.  Discards all the steps that could be redone -- unless the
+        edits cancel each other out, in which case nothing is recorded.
+        """
+        spans: list[tuple[tuple[int, int], str, str], ...] = [self._span(*edit) for edit in self._combine(edits)]
+        if not spans:
+            return
+
+        for step in self._redo:
+            self._size -= step[3]
+        self._redo.clear()
+
+        now: float = time.monotonic()
+        if (
+            len(spans) == 1
+            and self._undo
+            and len(self._undo[-1][0]) == 1
+            and self._time is not None
+            and now - self._time < self._group_interval
+            and (merged := self._merge(self._undo[-1][0][0], spans[0])) is not None
+        ):
+            step: tuple[list, tuple, tuple, int] = self._undo.pop()
+            self._size -= step[3]
+            spans: list[tuple[tuple[int, int], str, str], ...] = [merged]
+            before: tuple[tuple[int, int], Selection] = step[1]
+        size: int = self._sizeof(spans)
+        self._undo.append((spans, before, after, size))
+        self._size += size
+        self._time: Optional[float] = now
+
+        # Discard the oldest steps until the history fits in its budget.
+        while self._size > self._budget and len(self._undo) > 1:
+            self._size -= self._undo.popleft()[3]
+
+    def redo(self, text: Sequence[str]) -> Optional[tuple[tuple[int, int], Selection]]:
+        """
+        Make the edits of the last step that was undone to the given text again, in place, and return the cursor
+        position and selection from after they were first made -- or None if there is nothing to redo.
+        """
+        state: Optional[tuple[tuple[int, int], Selection]] = None
+        if self._redo:
+            step: tuple[list, tuple, tuple, int] = self._redo.pop()
+            for position, old, new in step[0]:
+                self._apply(text, position, old, new)
+            self._undo.append(step)
+            state = step[2]
+        self._time: Optional[float] = None
+        return state
+
+    def undo(self, text: Sequence[str]) -> Optional[tuple[tuple[int, int], Selection]]:
+        """
+        Revert the edits of the last step made to the given text, in place, and return the cursor position and
+        selection from before they were made -- or None if there is nothing to undo.
+        """
+        state: Optional[tuple[tuple[int, int], Selection]] = None
+        if self._undo:
+            step: tuple[list, tuple, tuple, int] = self._undo.pop()
+            for position, old, new in reversed(step[0]):
+                self._apply(text, position, new, old)
+            self._redo.append(step)
+            state = step[1]
+        self._time: Optional[float] = None
+        return state
@@ -0,0 +1,214 @@
+from termighty.settings.data import Data
+from termighty.settings.system import System
+from termighty.utils.paste import Paste
+
+import codecs
+
+from typing import Optional
+
+
+class KeyDecoder:
+    """
+    Streaming decoder that splits the bytes read from the terminal into individual keys.  Reads of any size may be fed
+    to it, each of which may contain any number of keys, and may end in the middle of an escape sequence or a multibyte
+    character -- incomplete keys are held back until the rest of their bytes arrive.
+
+    Escape sequences are recognized with a prefix trie compiled from `Data.keymaps`.  Since the `Esc` key is itself a
+    prefix of most escape sequences, a lone `Esc` is held back until `escape_timeout` seconds pass without further
+    input; it is then up to the reader to call `flush`.  Unknown CSI and SS3 sequences are kept whole, and returned as
+    multi-character strings rather than being split into separate characters.
+
+    Text pasted while the terminal is in bracketed paste mode (see `Term.bracketed_paste`) is returned as a single
+    `Paste`, however many reads it spans, without interpreting any escape sequences it contains.
+    """
+
+    # Time (in seconds) after which an incomplete escape sequence is assumed to be complete (such as a lone `Esc`).
+    escape_timeout: float = 0.05
+
+    # Escape sequences sent by the terminal before and after pasted text, in bracketed paste mode.
+    _paste_start: bytes = b"\x1b[200~"
+    _paste_end: bytes = b"\x1b[201~"
+
+    # Marks the trie nodes at which a complete key ends; maps to the name of the key.
+    _terminal: None = None
+    # The prefix trie compiled from `Data.keymaps`, shared by all instances (compiled on first use).
+    _trie: Optional[dict] = None
+
+    """PRIVATE METHODS"""
+
+    @classmethod
+    def _build_trie(cls, keymaps: dict[bytes, str]) -> dict:
+        """
+        Compile the keymaps into a prefix trie of nested dicts, in which each byte of an escape sequence maps to the
+        node for the bytes that may follow it.
+        """
+        trie: dict = {}
+        for escape_code, key in keymaps.items():
+            node: dict = trie
+            for byte in escape_code:
+                node = node.setdefault(byte, {})
+            node[cls._terminal] = key
+        return trie
+
+    @staticmethod
+    def _control_sequence_end(buffer: bytes, start: int) -> Optional[int]:
+        """
+        If `buffer` contains a CSI (`ESC [`) or SS3 (`ESC O`) control sequence at index `start`, return the index at
+        which it ends -- or `len(buffer) + 1` if the sequence is incomplete.  Otherwise, return None.
+        """
+        if start + 1 >= len(buffer) or buffer[start + 1] not in b"[O":
+            end: Optional[int] = None
+        elif buffer[start + 1] == ord("O"):
+            # SS3 sequences consist of a single final character.
+            if start + 2 >= len(buffer):
+                end: Optional[int] = len(buffer) + 1
+            elif 0x40 <= buffer[start + 2] <= 0x7E:
+                end: Optional[int] = start + 3
+            else:
+                end: Optional[int] = None
+        else:
+            # CSI sequences consist of parameter bytes, then intermediate bytes, then a single final byte.
+            end: Optional[int] = start + 2
+            while end < len(buffer) and 0x30 <= buffer[end] <= 0x3F:
+                end += 1
+            while end < len(buffer) and 0x20 <= buffer[end] <= 0x2F:
+                end += 1
+            if end >= len(buffer):
+                end: Optional[int] = len(buffer) + 1
+            elif 0x40 <= buffer[end] <= 0x7E:
+                end += 1
+            else:
+                end: Optional[int] = None
+        return end
+
+    def _decode(self, final: bool) -> list[tuple[bytes, str]]:
+        """
+        Split the buffered bytes into keys, returned as pairs of raw bytes and key names.  Unless `final` is set to
+        True, incomplete escape sequences at the end of the buffer are kept in the buffer.
+        """
+        buffer: bytes = self._buffer
+        keys: list[tuple[bytes, str]] = []
+        idx: int = 0
+        while idx < len(buffer):
+            if self._paste is not None:
+                # Collect pasted bytes up to the end of the paste, keeping back any bytes that may be the start of the
+                # escape sequence that ends it.
+                if (end := buffer.find(self._paste_end, idx)) == -1:
+                    end: int = max(idx, len(buffer) - len(self._paste_end) + 1)
+                    self._paste += buffer[idx:end]
+                    idx: int = end
+                    break
+                self._paste += buffer[idx:end]
+                keys.append(self._decode_paste())
+                idx: int = end + len(self._paste_end)
+            elif buffer.startswith(self._paste_start, idx):
+                self._paste: Optional[bytearray] = bytearray()
+                idx += len(self._paste_start)
+            elif buffer[idx] in self._trie:
+                # Walk down the trie, remembering the longest complete key along the way.
+                node: dict = self._trie
+                end: int = idx
+                match: Optional[tuple[int, str]] = None
+                while end < len(buffer) and buffer[end] in node:
+                    node = node[buffer[end]]
+                    end += 1
+                    if self._terminal in node:
+                        match = (end, node[self._terminal])
+                # The buffer ran out in the middle of the trie, so a longer key might still arrive.
+                incomplete: bool = end == len(buffer) and any(byte is not self._terminal for byte in node)
+
+                # Control sequences determine their own length, so unknown ones are kept whole rather than split at the
+                # end of their longest known prefix.
+                if buffer[idx] == 0x1B and (sequence_end := self._control_sequence_end(buffer, idx)) is not None:
+                    incomplete: bool = sequence_end > len(buffer)
+                    if not incomplete and (match is None or match[0] < sequence_end):
+                        match = (sequence_end, buffer[idx:sequence_end].decode("ascii", "replace"))
+
+                if incomplete and not final:
+                    break
+                elif match is not None:
+                    keys.append((buffer[idx : match[0]], match[1]))
+                    idx: int = match[0]
+                else:
+                    keys.extend(self._decode_text(buffer[idx : idx + 1]))
+                    idx += 1
+            else:
+                # Decode the entire run of bytes up to the start of the next escape sequence as text.
+                end: int = idx + 1
+                while end < len(buffer) and buffer[end] not in self._trie:
+                    end += 1
+                keys.extend(self._decode_text(buffer[idx:end]))
+                idx: int = end
+
+        self._buffer: bytes = buffer[idx:]
+        if final:
+            keys.extend(self._decode_text(b"", final=True))
+        return keys
+
+    def _decode_paste(self) -> tuple[bytes, Paste]:
+        """
+        Decode the collected pasted bytes into a `Paste`, returned with its raw bytes (including the escape sequences
+        around it), and leave bracketed paste mode.
+        """
+        data: bytes = bytes(self._paste)
+        self._paste: Optional[bytearray] = None
+        paste: Paste = Paste(data.decode(System.escape_code_encoding, "replace"))
+        return self._paste_start + data + self._paste_end, paste
+
+    def _decode_text(self, data: bytes, final: bool = False) -> list[tuple[bytes, str]]:
+        """
+        Incrementally decode text, returning one key per character.  Bytes that cannot be decoded are returned as the
+        replacement character `�`, but retain their original bytes.
+        """
+        keys: list[tuple[bytes, str]] = []
+        for char in self._text_decoder.decode(data, final):
+            escape_code: bytes = char.encode(System.escape_code_encoding, "surrogateescape")
+            if "\udc80" <= char <= "\udcff":
+                keys.append((escape_code, "�"))
+            else:
+                keys.append((escape_code, char))
+        return keys
+
+    """PUBLIC METHODS"""
+
+    def __init__(self):
+        """
+        Prepare an empty buffer and a fresh incremental text decoder.
+        """
+        if KeyDecoder._trie is None:
+            KeyDecoder._trie: dict = self._build_trie(Data.keymaps)
+        self.reset()
+
+    def feed(self, data: bytes) -> list[tuple[bytes, str]]:
+        """
+        Add the given bytes to the buffer, and return every key they complete as pairs of raw bytes and key names (such
+        as `(b"a", "a")` or `(b"\\x1b[A", "Keypad-Up")`).
+        """
+        self._buffer += data
+        return self._decode(final=False)
+
+    def flush(self) -> list[tuple[bytes, str]]:
+        """
+        Return all the keys held back in the buffer, treating incomplete escape sequences as complete.  To be called
+        once `escape_timeout` seconds have passed without input while `pending` is True.
+        """
+        return self._decode(final=True)
+
+    @property
+    def pending(self) -> bool:
+        """
+        Whether bytes are being held back, waiting for the rest of an escape sequence or multibyte character.  Pasted
+        text is not pending: it is only complete once the terminal signals the end of the paste.
+        """
+        return self._paste is None and (bool(self._buffer) or bool(self._text_decoder.getstate()[0]))
+
+    def reset(self) -> None:
+        """
+        Discard all buffered bytes, including any incomplete paste.
+        """
+        self._buffer: bytes = b""
+        # The pasted bytes collected so far, if in the middle of a paste.
+        self._paste: Optional[bytearray] = None
+        self._text_decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder(System.escape_code_encoding)(
+            "surrogateescape"
+        )
@@ -1,22 +1,267 @@
 from termighty.settings.config import Config
-from typing import Optional, Union
+from termighty.utils.paste import Paste
+from termighty.utils.selection import Selection
+
+from typing import Callable, Optional, Union
 
 
 class KeyProcessor:
     """
     Performs all text processing operations given rows of text, a cursor position, and a key input.
+
+    The rows of text (a list of strings, or a `TextBuffer`) are modified in place, so that each edit only touches the
+    affected rows rather than rebuilding the whole text; they are also returned, for convenience.
     """
 
+    # Maps the name of each bound key to its handler, which takes the text, cursor position, selection, and shape of
+    # the window, and returns the new text, cursor position, and selection.  Compiled on first use.
+    _bindings: Optional[dict[str, Callable[..., tuple[list[str, ...], tuple[int, int], Selection]]]] = None
+
+    @classmethod
+    def _build_bindings(cls) -> dict[str, Callable[..., tuple[list[str, ...], tuple[int, int], Selection]]]:
+        """
+        Compile the default key bindings into a dispatch table, so that each key is handled after a single lookup.
+        """
+        bindings: dict[str, Callable[..., tuple[list[str, ...], tuple[int, int], Selection]]] = {
+            # Arrow Keys (To move the cursor).
+            "Left": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_arrow_left(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            "Right": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_arrow_right(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            "Up": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_arrow_up(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            "Down": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_arrow_down(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            # Arrow Keys (With ALT modifier for text selection).
+            "Alt-Left": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                *cls.key_alt_arrow_left(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+            ),
+            "Alt-Right": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                *cls.key_alt_arrow_right(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+            ),
+            "Alt-Up": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                *cls.key_alt_arrow_up(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+            ),
+            "Alt-Down": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                *cls.key_alt_arrow_down(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+            ),
+            # Arrow Keys (With CTRL modifier for movement over words or swapping rows).
+            "Ctrl-Left": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_ctrl_left(raw_text=raw_text, cursor_position=cursor_position),
+                Selection(),
+            ),
+            "Ctrl-Right": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_ctrl_right(raw_text=raw_text, cursor_position=cursor_position),
+                Selection(),
+            ),
+            "Ctrl-Up": lambda raw_text, cursor_position, selected, shape: cls.key_ctrl_up(
+                raw_text=raw_text, cursor_position=cursor_position, selected=selected
+            ),
+            "Ctrl-Down": lambda raw_text, cursor_position, selected, shape: cls.key_ctrl_down(
+                raw_text=raw_text, cursor_position=cursor_position, selected=selected
+            ),
+            # Character deletion.
+            "Backspace": lambda raw_text, cursor_position, selected, shape: (
+                *cls.key_backspace(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            "Ctrl-Backspace": lambda raw_text, cursor_position, selected, shape: (
+                *cls.key_ctrl_backspace(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            "Ctrl-Delete": lambda raw_text, cursor_position, selected, shape: (
+                *cls.key_ctrl_delete(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            "Delete": lambda raw_text, cursor_position, selected, shape: (
+                *cls.key_delete(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            # Adding newlines or whitespace.
+            "Enter": lambda raw_text, cursor_position, selected, shape: (
+                *cls.key_enter(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            "Space": lambda raw_text, cursor_position, selected, shape: (
+                *cls.key_char(raw_text=raw_text, cursor_position=cursor_position, selected=selected, char=" "),
+                Selection(),
+            ),
+            "Tab": lambda raw_text, cursor_position, selected, shape: cls.key_tab(
+                raw_text=raw_text, cursor_position=cursor_position, selected=selected
+            ),
+            # Cursor movement shortcuts.
+            "Ctrl-End": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_ctrl_end(raw_text=raw_text),
+                selected,
+            ),
+            "Ctrl-Home": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_ctrl_home(),
+                selected,
+            ),
+            "End": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_end(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            "Home": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_home(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+                Selection(),
+            ),
+            "PgDn": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_pgdn(raw_text=raw_text, cursor_position=cursor_position, shape=shape),
+                Selection(),
+            ),
+            "PgUp": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                cls.key_pgup(raw_text=raw_text, cursor_position=cursor_position, shape=shape),
+                Selection(),
+            ),
+            # Character selection shortcuts.
+            "Alt-End": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                *cls.key_alt_end(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+            ),
+            "Alt-Home": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                *cls.key_alt_home(raw_text=raw_text, cursor_position=cursor_position, selected=selected),
+            ),
+            "Alt-PgDn": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                *cls.key_alt_pgdn(raw_text=raw_text, cursor_position=cursor_position, selected=selected, shape=shape),
+            ),
+            "Alt-PgUp": lambda raw_text, cursor_position, selected, shape: (
+                raw_text,
+                *cls.key_alt_pgup(raw_text=raw_text, cursor_position=cursor_position, selected=selected, shape=shape),
+            ),
+            # Special cases (in case of pasting).
+            "\n": cls._key_newline,
+            "\t": lambda raw_text, cursor_position, selected, shape: cls.key_tab(
+                raw_text=raw_text, cursor_position=cursor_position, selected=selected
+            ),
+        }
+
+        # Keys that share the binding of another key.
+        aliases: dict[str, str] = {
+            "Keypad-Left": "Left",
+            "Keypad-Right": "Right",
+            "Keypad-Up": "Up",
+            "Keypad-Down": "Down",
+            "Ctrl-Keypad-Left": "Ctrl-Left",
+            "Ctrl-Keypad-Right": "Ctrl-Right",
+            "Ctrl-Keypad-Up": "Ctrl-Up",
+            "Ctrl-Keypad-Down": "Ctrl-Down",
+            "Ctrl-Keypad-Backspace": "Ctrl-Backspace",
+            "Ctrl-Keypad-Delete": "Ctrl-Delete",
+            "Keypad-Delete": "Delete",
+            "Keypad-End": "End",
+            "Keypad-Home": "Home",
+            "\r": "\n",
+        }
+        for alias, key in aliases.items():
+            bindings[alias] = bindings[key]
+
+        return bindings
+
+    @classmethod
+    def _get_binding(
+        cls, key: str, bindings: Optional[dict[str, Optional[Callable[..., tuple]]]] = None
+    ) -> Optional[Callable[..., tuple[list[str, ...], tuple[int, int], Selection]]]:
+        """
+        Return the handler bound to the given key, looking it up in `bindings` before the default bindings -- or None if
+        the key has no binding, or was unbound in `bindings`.
+        """
+        if bindings is not None and key in bindings:
+            handler = bindings[key]
+        else:
+            # Each subclass compiles its own bindings, so that they call its own methods.
+            if cls.__dict__.get("_bindings") is None:
+                cls._bindings = cls._build_bindings()
+            handler = cls._bindings.get(key)
+        return handler
+
+    @classmethod
+    def _key_newline(
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection, shape: tuple[int, int]
+    ) -> tuple[list[str, ...], tuple[int, int], Selection]:
+        """
+        Add a newline received as a character (as when pasting), without the automatic indentation of `key_enter`.
+        """
+        raw_text, cursor_position = cls.key_enter(
+            raw_text=raw_text,
+            cursor_position=cursor_position,
+            selected=selected,
+        )
+        cursor_position, selected = cls.key_alt_home(
+            raw_text=raw_text,
+            cursor_position=cursor_position,
+            selected=Selection(),
+        )
+        raw_text, cursor_position = cls.key_backspace(
+            raw_text=raw_text,
+            cursor_position=cursor_position,
+            selected=selected,
+        )
+        return raw_text, cursor_position, Selection()
+
+    @classmethod
+    def insert_text(
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection, text: str
+    ) -> tuple[list[str, ...], tuple[int, int]]:
+        """
+        Insert a string at the designated cursor position in a single splice, and move the cursor to its end -- rather
+        than adding it one character at a time.  Newlines within the string split the current row, without any of the
+        automatic indentation applied by `key_enter`.
+
+        If some text is selected, deletes all selected text, and inserts the string at the beginning of the selection.
+        """
+        if selected:
+            raw_text, cursor_position = cls.remove_selected(raw_text, cursor_position, selected)
+        row, col = cursor_position
+        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+        if len(lines) == 1:
+            raw_text[row] = raw_text[row][:col] + text + raw_text[row][col:]
+            new_cursor_position = (row, col + len(text))
+        else:
+            raw_text[row : row + 1] = [raw_text[row][:col] + lines[0]] + lines[1:-1] + [lines[-1] + raw_text[row][col:]]
+            new_cursor_position = (row + len(lines) - 1, len(lines[-1]))
+
+        return raw_text, new_cursor_position
+
     @classmethod
     def key_alt_arrow_down(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
-    ) -> tuple[tuple[int, int], list[tuple[int, int], ...]]:
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
+    ) -> tuple[tuple[int, int], Selection]:
         """
         Perform the actions of method `key_arrow_down` and also adds all the characters between the current cursor
         position and new cursor position to the list of currently selected keys if they aren't already in the list. If
         they are already in the list, deselects the given characters, removing them from the list.
         """
-        new_cursor_position = cls.key_arrow_down(raw_text=raw_text, cursor_position=cursor_position, selected=[])
+        new_cursor_position = cls.key_arrow_down(
+            raw_text=raw_text, cursor_position=cursor_position, selected=Selection()
+        )
         selected = cls.select_range(
             raw_text=raw_text,
             cursor_position=cursor_position,
@@ -27,14 +272,16 @@ class KeyProcessor:
 
     @classmethod
     def key_alt_arrow_left(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
-    ) -> tuple[tuple[int, int], list[tuple[int, int], ...]]:
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
+    ) -> tuple[tuple[int, int], Selection]:
         """
         Perform the actions of method `key_arrow_left` and also adds the character to the left of the cursor to the list
         of currently selected keys if it isn't already in the list.  If it is already in the list, deselects the given
         character, removing it from the list.
         """
-        new_cursor_position = cls.key_arrow_left(raw_text=raw_text, cursor_position=cursor_position, selected=[])
+        new_cursor_position = cls.key_arrow_left(
+            raw_text=raw_text, cursor_position=cursor_position, selected=Selection()
+        )
         selected = cls.select_range(
             raw_text=raw_text,
             cursor_position=cursor_position,
@@ -45,14 +292,16 @@ class KeyProcessor:
 
     @classmethod
     def key_alt_arrow_right(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
-    ) -> tuple[tuple[int, int], list[tuple[int, int], ...]]:
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
+    ) -> tuple[tuple[int, int], Selection]:
         """
         Perform the actions of method `key_arrow_right` and also adds the character to the right of the cursor to the
         list of currently selected keys if it isn't already in the list.  If it is already in the list, deselects the
         given character, removing it from the list.
         """
-        new_cursor_position = cls.key_arrow_right(raw_text=raw_text, cursor_position=cursor_position, selected=[])
+        new_cursor_position = cls.key_arrow_right(
+            raw_text=raw_text, cursor_position=cursor_position, selected=Selection()
+        )
         selected = cls.select_range(
             raw_text=raw_text,
             cursor_position=cursor_position,
@@ -63,14 +312,14 @@ class KeyProcessor:
 
     @classmethod
     def key_alt_arrow_up(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
-    ) -> tuple[tuple[int, int], list[tuple[int, int], ...]]:
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
+    ) -> tuple[tuple[int, int], Selection]:
         """
         Perform the actions of method `key_arrow_up` and also adds all the characters between the current cursor
         position and new cursor position to the list of currently selected keys if they aren't already in the list. If
         they are already in the list, deselects the given characters, removing them from the list.
         """
-        new_cursor_position = cls.key_arrow_up(raw_text=raw_text, cursor_position=cursor_position, selected=[])
+        new_cursor_position = cls.key_arrow_up(raw_text=raw_text, cursor_position=cursor_position, selected=Selection())
         selected = cls.select_range(
             raw_text=raw_text,
             cursor_position=cursor_position,
@@ -81,8 +330,8 @@ class KeyProcessor:
 
     @classmethod
     def key_alt_end(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
-    ) -> tuple[tuple[int, int], list[tuple[int, int], ...]]:
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
+    ) -> tuple[tuple[int, int], Selection]:
         """
         Perform the actions of method `key_end` and toggle selection of the characters following the current cursor
         position.
@@ -98,8 +347,8 @@ class KeyProcessor:
 
     @classmethod
     def key_alt_home(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
-    ) -> tuple[tuple[int, int], list[tuple[int, int], ...]]:
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
+    ) -> tuple[tuple[int, int], Selection]:
         """
         Perform the actions of method `key_home` and toggle selection of the characters preceeding the current cursor
         position.
@@ -118,9 +367,9 @@ class KeyProcessor:
         cls,
         raw_text: list[str, ...],
         cursor_position: tuple[int, int],
-        selected: list[tuple[int, int], ...],
+        selected: Selection,
         shape: tuple[int, int],
-    ) -> tuple[tuple[int, int], list[tuple[int, int], ...]]:
+    ) -> tuple[tuple[int, int], Selection]:
         """
         Perform the actions of method `key_pgdn` and toggle selection of the characters following the current cursor
         position.
@@ -139,9 +388,9 @@ class KeyProcessor:
         cls,
         raw_text: list[str, ...],
         cursor_position: tuple[int, int],
-        selected: list[tuple[int, int], ...],
+        selected: Selection,
         shape: tuple[int, int],
-    ) -> tuple[tuple[int, int], list[tuple[int, int], ...]]:
+    ) -> tuple[tuple[int, int], Selection]:
         """
         Perform the actions of method `key_pgup` and toggle selection of the characters preceeding the current cursor
         position.
@@ -157,7 +406,7 @@ class KeyProcessor:
 
     @classmethod
     def key_arrow_down(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[int, int]:
         """
         Move the cursor down by one row, unless it is positioned at the last row of the text.
@@ -170,7 +419,7 @@ class KeyProcessor:
         if not selected:
             row, col = cursor_position
         else:
-            row, col = selected[-1]
+            row, col = selected.last
 
         if row == len(raw_text) - 1:
             new_cursor_position = cursor_position
@@ -181,7 +430,7 @@ class KeyProcessor:
 
     @classmethod
     def key_arrow_left(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[int, int]:
         """
         Move the cursor left by one column, unless it is positioned at the first row & column of the text.
@@ -193,7 +442,7 @@ class KeyProcessor:
         if not selected:
             row, col = cursor_position
         else:
-            row, col = selected[0]
+            row, col = selected.start
 
         if cursor_position == (0, 0):
             new_cursor_position = cursor_position
@@ -205,7 +454,7 @@ class KeyProcessor:
 
     @classmethod
     def key_arrow_right(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[int, int]:
         """
         Move the cursor right by one column, unless it is positioned at the last row & column of the text.
@@ -217,7 +466,7 @@ class KeyProcessor:
         if not selected:
             row, col = cursor_position
         else:
-            row, col = selected[-1]
+            row, col = selected.last
 
         if cursor_position == (len(raw_text) - 1, len(raw_text[-1])):
             new_cursor_position = (row, col)
@@ -229,7 +478,7 @@ class KeyProcessor:
 
     @classmethod
     def key_arrow_up(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[int, int]:
         """
         Move the cursor up by one row, unless it is positioned at the first row of the text.
@@ -240,7 +489,7 @@ class KeyProcessor:
         if not selected:
             row, col = cursor_position
         else:
-            row, col = selected[0]
+            row, col = selected.start
 
         if row == 0:
             new_cursor_position = cursor_position
@@ -251,7 +500,7 @@ class KeyProcessor:
 
     @classmethod
     def key_backspace(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[list[str, ...], tuple[int, int]]:
         """
         Remove the character to the left of the current cursor position.  Moot if the cursor is positioned at the first
@@ -267,36 +516,31 @@ class KeyProcessor:
         If some text is selected, deletes all selected text, and sets the cursor to the beginning of the selection.
         """
         if selected:
-            new_text, new_cursor_position = cls.remove_selected(raw_text, cursor_position, selected)
+            raw_text, new_cursor_position = cls.remove_selected(raw_text, cursor_position, selected)
         else:
             row, col = cursor_position
             # If the cursor is at position (0,0), backspace has no effect, so make no changes to the text.
             if cursor_position == (0, 0):
-                new_text = raw_text
                 new_cursor_position = cursor_position
             # If the cursor is at position (N,0), backspace appends row N to row N-1.
             elif col == 0:
-                new_text = raw_text[: row - 1] + [raw_text[row - 1] + raw_text[row]] + raw_text[row + 1 :]
                 new_cursor_position = (row - 1, len(raw_text[row - 1]))
+                raw_text[row - 1 : row + 1] = [raw_text[row - 1] + raw_text[row]]
             # If all characters to the left of the cursor are spaces, and the column is a multiple of the tab-length,
             # remove one tab-length's worth of preceeding spaces.
             elif raw_text[row][:col].strip() == "" and col % Config.tab_length == 0:
-                new_text = (
-                    raw_text[:row]
-                    + [raw_text[row][: col - Config.tab_length] + raw_text[row][col:]]
-                    + raw_text[row + 1 :]
-                )
+                raw_text[row] = raw_text[row][: col - Config.tab_length] + raw_text[row][col:]
                 new_cursor_position = (row, col - Config.tab_length)
             # If the cursor is at position (M,N), backspace removes character (M,N-1).
             else:
-                new_text = raw_text[:row] + [raw_text[row][: col - 1] + raw_text[row][col:]] + raw_text[row + 1 :]
+                raw_text[row] = raw_text[row][: col - 1] + raw_text[row][col:]
                 new_cursor_position = (row, col - 1)
 
-        return new_text, new_cursor_position
+        return raw_text, new_cursor_position
 
     @classmethod
     def key_char(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...], char: str
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection, char: str
     ) -> tuple[list[str, ...], tuple[int, int]]:
         """
         Add a character at the designated cursor position.
@@ -307,15 +551,15 @@ class KeyProcessor:
         if selected:
             raw_text, cursor_position = cls.remove_selected(raw_text, cursor_position, selected)
         row, col = cursor_position
-        new_text = raw_text[:row] + [raw_text[row][:col] + char + raw_text[row][col:]] + raw_text[row + 1 :]
+        raw_text[row] = raw_text[row][:col] + char + raw_text[row][col:]
 
         new_cursor_position = (row, col + 1)
 
-        return new_text, new_cursor_position
+        return raw_text, new_cursor_position
 
     @classmethod
     def key_ctrl_backspace(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[list[str, ...], tuple[int, int]]:
         """
         Deletes all whitespace to the left of the current cursor position, as well as the first preceeding word.
@@ -335,14 +579,14 @@ class KeyProcessor:
 
         for i in range(new_cursor_position[0] - cursor_position[0]):
             new_text, new_cursor_position = cls.key_delete(
-                raw_text=new_text, cursor_position=new_cursor_position, selected=[]
+                raw_text=new_text, cursor_position=new_cursor_position, selected=Selection()
             )
 
         return new_text, new_cursor_position
 
     @classmethod
     def key_ctrl_delete(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[list[str, ...], tuple[int, int]]:
         """
         Deletes all whitespace to the right of the current cursor position, as well as the first word that follows.
@@ -362,15 +606,15 @@ class KeyProcessor:
 
         for i in range(new_cursor_position[0] - cursor_position[0]):
             new_text, new_cursor_position = cls.key_backspace(
-                raw_text=new_text, cursor_position=new_cursor_position, selected=[]
+                raw_text=new_text, cursor_position=new_cursor_position, selected=Selection()
             )
 
         return new_text, new_cursor_position
 
     @classmethod
     def key_ctrl_down(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
-    ) -> tuple[list[str, ...], tuple[int, int], list[tuple[int, int], ...]]:
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
+    ) -> tuple[list[str, ...], tuple[int, int], Selection]:
         """
         Swaps the current row (or selected rows) with the subsequent row.
 
@@ -378,36 +622,33 @@ class KeyProcessor:
 
         If one of the selected rows is the last row, no changes are made.
         """
-        selected_rows = set([cursor_position[0]] + [position[0] for position in selected])
-        if len(raw_text) - 1 in selected_rows:
-            new_text = raw_text
+        row, col = cursor_position
+        row_min = min(row, row if not selected else selected.start[0])
+        row_max = max(row, row if not selected else selected.stop[0])
+        if row_max == len(raw_text) - 1:
             new_cursor_position = cursor_position
             new_selected = selected
         else:
-            row, col = cursor_position
-            row_min = min(row, row if not selected else selected[0][0])
-            row_max = max(row, row if not selected else selected[-1][0])
-
             indent = 0
-            for indent_row in raw_text[row_max + 1 :]:
-                if indent_row.strip():
+            for idx in range(row_max + 1, len(raw_text)):
+                if (indent_row := raw_text[idx]).strip():
                     indent = len(indent_row) - len(indent_row.lstrip())
                     break
 
+            # The change in indentation of each moved row must be measured before the rows are modified.
+            diffs = {
+                idx: indent - (len(raw_text[idx]) - len(raw_text[idx].lstrip()))
+                for idx in [row] + [position[0] for selected_range in selected for position in selected_range]
+            }
+
             pad = " " * indent
             indent_rows = [pad + indent_rows.strip() for indent_rows in raw_text[row_min : row_max + 1]]
-            new_text = raw_text[:row_min] + [raw_text[row_max + 1]] + indent_rows + raw_text[row_max + 2 :]
+            raw_text[row_min : row_max + 2] = [raw_text[row_max + 1]] + indent_rows
 
-            diffs = {idx: indent - (len(raw_text[idx]) - len(raw_text[idx].lstrip())) for idx in selected_rows}
-            if selected:
-                new_selected = []
-                for position in selected:
-                    new_selected.append((position[0] + 1, position[1] + diffs[position[0]]))
-            else:
-                new_selected = selected
+            new_selected = selected.shift(rows=1, cols=diffs).normalize(raw_text)
             new_cursor_position = (cursor_position[0] + 1, cursor_position[1] + diffs[cursor_position[0]])
 
-        return new_text, new_cursor_position, new_selected
+        return raw_text, new_cursor_position, new_selected
 
     @classmethod
     def key_ctrl_end(cls, raw_text: list[str, ...]) -> tuple[int, int]:
@@ -477,8 +718,8 @@ class KeyProcessor:
 
     @classmethod
     def key_ctrl_up(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
-    ) -> tuple[list[str, ...], tuple[int, int], list[tuple[int, int], ...]]:
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
+    ) -> tuple[list[str, ...], tuple[int, int], Selection]:
         """
         Swaps the current row (or selected rows) with the preceeding row.
 
@@ -486,40 +727,37 @@ class KeyProcessor:
 
         If one of the selected rows is row zero, no changes are made.
         """
-        selected_rows = set([cursor_position[0]] + [position[0] for position in selected])
-        if 0 in selected_rows:
-            new_text = raw_text
+        row, col = cursor_position
+        row_min = min(row, row if not selected else selected.start[0])
+        row_max = max(row, row if not selected else selected.stop[0])
+        if row_min == 0:
             new_cursor_position = cursor_position
             new_selected = selected
         else:
-            row, col = cursor_position
-            row_min = min(row, row if not selected else selected[0][0])
-            row_max = max(row, row if not selected else selected[-1][0])
-
             indent = 0
-            for indent_row in raw_text[: row_min - 1][::-1]:
-                if indent_row.strip():
+            for idx in range(row_min - 2, -1, -1):
+                if (indent_row := raw_text[idx]).strip():
                     indent = len(indent_row) - len(indent_row.lstrip())
                     break
 
+            # The change in indentation of each moved row must be measured before the rows are modified.
+            diffs = {
+                idx: indent - (len(raw_text[idx]) - len(raw_text[idx].lstrip()))
+                for idx in [row] + [position[0] for selected_range in selected for position in selected_range]
+            }
+
             pad = " " * indent
             indent_rows = [pad + indent_rows.strip() for indent_rows in raw_text[row_min : row_max + 1]]
-            new_text = raw_text[: row_min - 1] + indent_rows + [raw_text[row_min - 1]] + raw_text[row_max + 1 :]
+            raw_text[row_min - 1 : row_max + 1] = indent_rows + [raw_text[row_min - 1]]
 
-            diffs = {idx: indent - (len(raw_text[idx]) - len(raw_text[idx].lstrip())) for idx in selected_rows}
-            if selected:
-                new_selected = []
-                for position in selected:
-                    new_selected.append((position[0] - 1, position[1] + diffs[position[0]]))
-            else:
-                new_selected = selected
+            new_selected = selected.shift(rows=-1, cols=diffs).normalize(raw_text)
             new_cursor_position = (cursor_position[0] - 1, cursor_position[1] + diffs[cursor_position[0]])
 
-        return new_text, new_cursor_position, new_selected
+        return raw_text, new_cursor_position, new_selected
 
     @classmethod
     def key_delete(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[list[str, ...]]:
         """
         Remove the character to the right of the current cursor position.  Moot if the cursor is positioned at the last
@@ -529,27 +767,27 @@ class KeyProcessor:
         If some text is selected, deletes all selected text, and sets the cursor to the beginning of the selection.
         """
         if selected:
-            new_text, new_cursor_position = cls.remove_selected(raw_text, cursor_position, selected)
+            raw_text, new_cursor_position = cls.remove_selected(raw_text, cursor_position, selected)
         else:
             new_cursor_position = cursor_position
             row, col = cursor_position
             # If the cursor is at the end of the text, delete has no effect, so make no changes to the text.
             if cursor_position == (len(raw_text) - 1, len(raw_text[-1])):
-                new_text = raw_text
+                pass
 
             # If the cursor is at the end of row N, delete appends row N+1 to row N.
             elif col == len(raw_text[row]):
-                new_text = raw_text[:row] + [raw_text[row] + raw_text[row + 1]] + raw_text[row + 2 :]
+                raw_text[row : row + 2] = [raw_text[row] + raw_text[row + 1]]
 
             # If the cursor is at position (M,N), backspace removes character (M,N-1).
             else:
-                new_text = raw_text[:row] + [raw_text[row][:col] + raw_text[row][col + 1 :]] + raw_text[row + 1 :]
+                raw_text[row] = raw_text[row][:col] + raw_text[row][col + 1 :]
 
-        return new_text, new_cursor_position
+        return raw_text, new_cursor_position
 
     @classmethod
     def key_end(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[int, int]:
         """
         Move the cursor to the end of the current row, if it isn't already there.
@@ -557,14 +795,14 @@ class KeyProcessor:
         if not selected:
             row, col = cursor_position
         else:
-            row, col = selected[-1]
+            row, col = selected.last
 
         new_cursor_position = (row, len(raw_text[row]))
         return new_cursor_position
 
     @classmethod
     def key_enter(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[list[str, ...], tuple[int, int]]:
         """
         If the cursor is at the last column, create a new empty row below the current row and move the cursor there.
@@ -582,14 +820,14 @@ class KeyProcessor:
         row, col = cursor_position
         indent = len(raw_text[row]) - len(raw_text[row].lstrip())
         pad = " " * indent
-        new_text = raw_text[:row] + [raw_text[row][:col]] + [pad + raw_text[row][col:]] + raw_text[row + 1 :]
+        raw_text[row : row + 1] = [raw_text[row][:col], pad + raw_text[row][col:]]
         new_cursor_position = (row + 1, indent)
 
-        return new_text, new_cursor_position
+        return raw_text, new_cursor_position
 
     @classmethod
     def key_home(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[int, int]:
         """
         Move the cursor to the beginning of the current row, if it isn't already there.
@@ -601,7 +839,7 @@ class KeyProcessor:
         if not selected:
             row, col = cursor_position
         else:
-            row, col = selected[-1]
+            row, col = selected.last
 
         indent = len(raw_text[row]) - len(raw_text[row].lstrip())
         if col > indent:
@@ -664,8 +902,8 @@ class KeyProcessor:
 
     @classmethod
     def key_tab(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
-    ) -> tuple[list[str, ...], tuple[int, int], list[tuple[int, int], ...]]:
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
+    ) -> tuple[list[str, ...], tuple[int, int], Selection]:
         """
         If the nearest non-empty row above the cursor has a larger indentation than the current row, sets the current
         row's indentation to that of the specified row.
@@ -679,16 +917,18 @@ class KeyProcessor:
         """
         row, col = cursor_position
         if selected:
-            rows = set([row] + [position[0] for position in selected])
-            new_text = [" " * Config.tab_length + row if n in rows else row for n, row in enumerate(raw_text)]
-            selected = [(row, column + Config.tab_length) for row, column in selected]
+            # Indent the current row, and every row containing selected characters.
+            rows = {row} | {n for start, stop in selected for n in range(start[0], stop[0] + 1) if raw_text[n]}
+            for n in rows:
+                raw_text[n] = " " * Config.tab_length + raw_text[n]
+            selected = selected.shift(rows=0, cols=dict.fromkeys(rows, Config.tab_length)).normalize(raw_text)
 
             new_cursor_position = (cursor_position[0], cursor_position[1] + Config.tab_length)
 
         elif col <= (current_indent := len(raw_text[row]) - len(raw_text[row].lstrip())):
             indent = 0
-            for indent_row in raw_text[:row][::-1]:
-                if indent_row.strip():
+            for idx in range(row - 1, -1, -1):
+                if (indent_row := raw_text[idx]).strip():
                     indent = len(indent_row) - len(indent_row.lstrip())
                     break
 
@@ -698,319 +938,149 @@ class KeyProcessor:
                 new_col = Config.tab_length * (col // Config.tab_length) + Config.tab_length
 
             N_spaces = new_col - col
-            new_text = (
-                raw_text[:row] + [raw_text[row][:col] + " " * N_spaces + raw_text[row][col:]] + raw_text[row + 1 :]
-            )
+            raw_text[row] = raw_text[row][:col] + " " * N_spaces + raw_text[row][col:]
             new_cursor_position = (row, new_col)
 
         else:
             new_col = Config.tab_length * (col // Config.tab_length) + Config.tab_length
             N_spaces = new_col - col
-            new_text = (
-                raw_text[:row] + [raw_text[row][:col] + " " * N_spaces + raw_text[row][col:]] + raw_text[row + 1 :]
-            )
+            raw_text[row] = raw_text[row][:col] + " " * N_spaces + raw_text[row][col:]
 
             new_cursor_position = (row, new_col)
 
-        return new_text, new_cursor_position, selected
+        return raw_text, new_cursor_position, selected
 
     @classmethod
     def process_key(
         cls,
         raw_text: list[str, ...],
         cursor_position: tuple[int, int],
-        selected: list[tuple[int, int], ...],
+        selected: Selection,
         shape: tuple[int, int],
         key: str,
         ignore_keys: Optional[Union[str, tuple[str, ...]]] = None,
-    ) -> tuple[bool, list[str, ...], tuple[int, int], list[tuple[int, int], ...]]:
+        bindings: Optional[dict[str, Optional[Callable[..., tuple]]]] = None,
+    ) -> tuple[bool, list[str, ...], tuple[int, int], Selection]:
         """
         Take the current text and cursor position, and modify them using the given key input.
+
+        The key is looked up in a dispatch table of handlers, which `bindings` may extend or override: it maps key names
+        to handlers, or to None to unbind a key.  Each handler takes the text, cursor position, selection, and shape of
+        the window, and returns the new text, cursor position, and selection.  Characters without a binding are added
+        to the text.
         """
         # By default, the text will be updated.  Is set to False if a key without a binding is detected.
         call = True
 
+        # Pasted text is inserted as it is, even if it happens to match the name of a key.
+        if isinstance(key, Paste):
+            raw_text, cursor_position = cls.insert_text(
+                raw_text=raw_text,
+                cursor_position=cursor_position,
+                selected=selected,
+                text=key,
+            )
+            selected = Selection()
+            return call, raw_text, cursor_position, selected
+
         if ignore_keys is not None and (key == ignore_keys or key in ignore_keys):
             call = False
             return call, raw_text, cursor_position, selected
 
-        # Keybindings map to classmethods
-        match key:
-
-            # Arrow Keys (To move the cursor).
-
-            case "Left" | "Keypad-Left":
-                cursor_position = cls.key_arrow_left(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-            case "Right" | "Keypad-Right":
-                cursor_position = cls.key_arrow_right(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-            case "Up" | "Keypad-Up":
-                cursor_position = cls.key_arrow_up(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-            case "Down" | "Keypad-Down":
-                cursor_position = cls.key_arrow_down(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-
-            # Arrow Keys (With ALT modifier for text selection).
-
-            case "Alt-Left":
-                cursor_position, selected = cls.key_alt_arrow_left(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-            case "Alt-Right":
-                cursor_position, selected = cls.key_alt_arrow_right(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-            case "Alt-Up":
-                cursor_position, selected = cls.key_alt_arrow_up(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-            case "Alt-Down":
-                cursor_position, selected = cls.key_alt_arrow_down(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-
-            # Arrow Keys (With CTRL modifier for movement over words or swapping rows).
-
-            case "Ctrl-Left" | "Ctrl-Keypad-Left":
-                cursor_position = cls.key_ctrl_left(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                )
-                selected = []
-            case "Ctrl-Right" | "Ctrl-Keypad-Right":
-                cursor_position = cls.key_ctrl_right(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                )
-                selected = []
-            case "Ctrl-Up" | "Ctrl-Keypad-Up":
-                raw_text, cursor_position, selected = cls.key_ctrl_up(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-            case "Ctrl-Down" | "Ctrl-Keypad-Down":
-                raw_text, cursor_position, selected = cls.key_ctrl_down(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-
-            # Character deletion.
-
-            case "Backspace":
-                raw_text, cursor_position = cls.key_backspace(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-
-            case "Ctrl-Backspace" | "Ctrl-Keypad-Backspace":
-                raw_text, cursor_position = cls.key_ctrl_backspace(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-
-            case "Ctrl-Delete" | "Ctrl-Keypad-Delete":
-                raw_text, cursor_position = cls.key_ctrl_delete(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-
-            case "Delete" | "Keypad-Delete":
-                raw_text, cursor_position = cls.key_delete(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-
-            # Adding newlines or whitespace.
-
-            case "Enter":
-                raw_text, cursor_position = cls.key_enter(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-            case "Space":
-                raw_text, cursor_position = cls.key_char(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                    char=" ",
-                )
-                selected = []
-            case "Tab":
-                raw_text, cursor_position, selected = cls.key_tab(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
+        if (handler := cls._get_binding(key, bindings)) is not None:
+            raw_text, cursor_position, selected = handler(raw_text, cursor_position, selected, shape)
+        elif len(key) == 1 and (bindings is None or key not in bindings):
+            raw_text, cursor_position = cls.key_char(
+                raw_text=raw_text,
+                cursor_position=cursor_position,
+                selected=selected,
+                char=key,
+            )
+            selected = Selection()
+        else:
+            # No binding detected, so no changes should be made.
+            call = False
 
-            # Cursor movement shortcuts.
+        return call, raw_text, cursor_position, selected
 
-            case "Ctrl-End":
-                cursor_position = cls.key_ctrl_end(raw_text=raw_text)
-            case "Ctrl-Home":
-                cursor_position = cls.key_ctrl_home()
-            case "End" | "Keypad-End":
-                cursor_position = cls.key_end(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-            case "Home" | "Keypad-Home":
-                cursor_position = cls.key_home(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-            case "PgDn":
-                cursor_position = cls.key_pgdn(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    shape=shape,
-                )
-                selected = []
-            case "PgUp":
-                cursor_position = cls.key_pgup(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    shape=shape,
+    @classmethod
+    def process_keys(
+        cls,
+        raw_text: list[str, ...],
+        cursor_position: tuple[int, int],
+        selected: Selection,
+        shape: tuple[int, int],
+        keys: list[str, ...],
+        ignore_keys: Optional[Union[str, tuple[str, ...]]] = None,
+        bindings: Optional[dict[str, Optional[Callable[..., tuple]]]] = None,
+    ) -> tuple[bool, list[str, ...], tuple[int, int], Selection]:
+        """
+        Take the current text and cursor position, and modify them using each of the given key inputs in turn -- such as
+        a burst of keys read all at once.  Runs of consecutive characters and pastes are inserted as a single string by
+        `insert_text`, rather than one at a time.  See `process_key` for `bindings`.
+
+        Returns True as its first value if any of the keys had a binding.
+        """
+        # Whether `Space` still adds a space to the text, in which case it is inserted along with the surrounding text.
+        default_space: bool = cls._get_binding("Space") is cls._get_binding("Space", bindings)
+        call = False
+        idx = 0
+        while idx < len(keys):
+            # Find the run of consecutive characters (which would each be added by `key_char`) and pastes starting at
+            # this key.
+            end = idx
+            while end < len(keys) and (
+                isinstance(keys[end], Paste)
+                or (
+                    (keys[end] == "Space" and default_space)
+                    or (len(keys[end]) == 1 and cls._get_binding(keys[end], bindings) is None)
+                    and (bindings is None or keys[end] not in bindings)
                 )
-                selected = []
+                and (ignore_keys is None or not (keys[end] == ignore_keys or keys[end] in ignore_keys))
+            ):
+                end += 1
 
-            # Character selection shortcuts.
-
-            case "Alt-End":
-                cursor_position, selected = cls.key_alt_end(
+            if end > idx:
+                text = "".join(" " if key == "Space" and not isinstance(key, Paste) else key for key in keys[idx:end])
+                raw_text, cursor_position = cls.insert_text(
                     raw_text=raw_text,
                     cursor_position=cursor_position,
                     selected=selected,
+                    text=text,
                 )
-            case "Alt-Home":
-                cursor_position, selected = cls.key_alt_home(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-            case "Alt-PgDn":
-                cursor_position, selected = cls.key_alt_pgdn(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                    shape=shape,
-                )
-            case "Alt-PgUp":
-                cursor_position, selected = cls.key_alt_pgup(
+                selected = Selection()
+                call = True
+                idx = end
+            else:
+                key_call, raw_text, cursor_position, selected = cls.process_key(
                     raw_text=raw_text,
                     cursor_position=cursor_position,
                     selected=selected,
                     shape=shape,
+                    key=keys[idx],
+                    ignore_keys=ignore_keys,
+                    bindings=bindings,
                 )
-
-            # Special cases (in case of pasting).
-
-            case "\n" | "\r":
-                raw_text, cursor_position = cls.key_enter(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                selected = []
-                cursor_position, selected = cls.key_alt_home(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-                raw_text, cursor_position = cls.key_backspace(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-            case "\t":
-                raw_text, cursor_position, selected = cls.key_tab(
-                    raw_text=raw_text,
-                    cursor_position=cursor_position,
-                    selected=selected,
-                )
-
-            # Characters or unbound inputs.
-
-            case other:
-                if len(key) == 1:
-                    raw_text, cursor_position = cls.key_char(
-                        raw_text=raw_text,
-                        cursor_position=cursor_position,
-                        selected=selected,
-                        char=key,
-                    )
-                    selected = []
-                else:
-                    # No binding detected, so no changes should be made.
-                    call = False
+                call = call or key_call
+                idx += 1
 
         return call, raw_text, cursor_position, selected
 
     @classmethod
     def remove_selected(
-        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: list[tuple[int, int], ...]
+        cls, raw_text: list[str, ...], cursor_position: tuple[int, int], selected: Selection
     ) -> tuple[list[str, ...], tuple[int, int]]:
         """
-        Given a set of coordinates for characters that are currently selected, removes these characters from the text
-        and sets the position of the cursor to that of the first selected character.
+        Removes all the characters from the first selected character to the last one from the text, and sets the
+        position of the cursor to that of the first selected character.
         """
-        row, col = selected[-1]
-        new_cursor_position = selected[0]
-        rows = list(set(position[0] for position in selected))
+        new_cursor_position = selected.start
+        row_min, col_min = selected.start
+        row_max, col_max = selected.stop
 
-        row_min = rows[0]
-        col_min = selected[0][1]
-        row_max = rows[-1]
-        col_max = selected[-1][1]
+        raw_text[row_min : row_max + 1] = [raw_text[row_min][:col_min] + raw_text[row_max][col_max:]]
 
-        new_text = (
-            raw_text[: rows[0]]
-            + [raw_text[row_min][:col_min] + raw_text[row_max][col_max + 1 :]]
-            + raw_text[row_max + 1 :]
-        )
-
-        return new_text, new_cursor_position
+        return raw_text, new_cursor_position
 
     @classmethod
     def select_range(
@@ -1018,57 +1088,10 @@ class KeyProcessor:
         raw_text: list[str, ...],
         cursor_position: tuple[int, int],
         new_cursor_position: tuple[int, int],
-        selected: list[tuple[int, int], ...],
-    ) -> list[tuple[int, int], ...]:
+        selected: Selection,
+    ) -> Selection:
         """
-        Determine which coordinates should be added and/or removed from the list of selected keys based on the movement
-        of the cursor.
+        Toggle the selection of the characters between the current and new cursor positions: those that are not yet
+        selected are added to the selection, and those that already are are removed from it.
         """
-        position_range = []
-        row_start = cursor_position[0]
-        row_stop = new_cursor_position[0]
-
-        if row_start == row_stop:
-            reversed = cursor_position[1] > new_cursor_position[1]
-        else:
-            reversed = row_start > row_stop
-
-        if reversed:
-            step = -1
-            row_stop -= 1
-        else:
-            step = 1
-            row_stop += 1
-
-        rows = range(row_start, row_stop, step)[::step]
-        for row in rows:
-            if reversed:
-                column_start = len(raw_text[row]) - 1
-                column_stop = -1
-                if row == rows[-1]:
-                    column_start = min(cursor_position[1], len(raw_text[row])) - 1
-                if row == rows[0]:
-                    column_stop = new_cursor_position[1] - 1
-            else:
-                column_start = 0
-                column_stop = len(raw_text[row])
-                if row == rows[0]:
-                    column_start = cursor_position[1]
-                if row == rows[-1]:
-                    column_stop = min(new_cursor_position[1], len(raw_text[row]))
-
-            columns = range(column_start, column_stop, step)[::step]
-
-            for column in columns:
-                position_range.append((row, column))
-
-        for position in position_range:
-            if position not in selected:
-                selected.append(position)
-            else:
-                selected.remove(position)
-
-        selected.sort(key=lambda element: element[1])
-        selected.sort(key=lambda element: element[0])
-
-        return selected
+        return selected.toggle(raw_text, cursor_position, new_cursor_position)
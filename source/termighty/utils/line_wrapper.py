@@ -0,0 +1,307 @@
+from termighty.settings.system import System
+from termighty.utils.cell_width import CellWidth
+
+import bisect
+import itertools
+import re
+import textwrap
+
+
+class LineWrapper:
+    """
+    Wraps lines of text to a given width, producing the same display rows as `textwrap.TextWrapper` with the same
+    options (with each row stripped of surrounding whitespace, as displayed by `TextBox`) -- only much faster, and with
+    the rows of every line cached.  Unlike `textwrap.TextWrapper`, widths are measured in terminal cells (see
+    `CellWidth`), such that lines containing wide characters or combining marks fill their rows exactly.
+
+    Rather than moving chunks of text (words and runs of whitespace) from one list to another, the rows are found from
+    the offsets at which the chunks end, with a bisection per row.  Lines that fit within the width, which are the vast
+    majority in most texts, are never split into chunks at all, and the slower regular expression that splits words at
+    their hyphens is only used for the lines that contain one.
+
+    The rows are cached per line and set of options, such that wrapping a line again -- when it is scrolled back into
+    view, or when the terminal is resized back to a previous width -- is a single dictionary lookup.
+    """
+
+    # Characters considered whitespace when splitting lines into chunks, as in `textwrap`.
+    _whitespace: str = "\t\n\x0b\x0c\r "
+    _whitespace_translation: dict[int, int] = {ord(char): ord(" ") for char in _whitespace}
+    # Splits text into words and runs of whitespace, or into words split at their hyphens as well.
+    _split_simple: re.Pattern = re.compile(f"([{re.escape(_whitespace)}]+)")
+    _split_hyphens: re.Pattern = textwrap.TextWrapper.wordsep_re
+    _spaces: re.Pattern = re.compile(" +")
+
+    # Maximum number of lines whose rows are cached per set of options, after which their cache is cleared.
+    _cache_size: int = 1 << 17
+    # Maximum number of sets of options (e.g. widths) whose caches are kept, the least recently used being discarded.
+    _cache_count: int = 8
+    # The cached rows of each line, for each set of options.
+    _caches: dict[tuple, dict[str, tuple[str, ...]]] = {}
+
+    """CONSTRUCTOR"""
+
+    def __init__(
+        self,
+        width: int,
+        subsequent_indent: str = "",
+        break_on_hyphens: bool = True,
+        break_long_words: bool = True,
+        expand_tabs: bool = True,
+        replace_whitespace: bool = True,
+        drop_whitespace: bool = True,
+        tabsize: int = 8,
+    ):
+        """
+        Prepare a LineWrapper for the given width and options, which have the same meaning as those of
+        `textwrap.TextWrapper`.
+        """
+        self._width: int = width
+        self._subsequent_indent: str = subsequent_indent
+        self._break_on_hyphens: bool = break_on_hyphens
+        self._break_long_words: bool = break_long_words
+        self._expand_tabs: bool = expand_tabs
+        self._replace_whitespace: bool = replace_whitespace
+        self._drop_whitespace: bool = drop_whitespace
+        self._tabsize: int = tabsize
+        self._indent_width: int = CellWidth.string_width(subsequent_indent)
+        # Rows can only be found without splitting lines into chunks if the indent leaves room for at least one
+        # character.
+        self._spaces_only: bool = self._indent_width < width
+
+        # Reuse the cache of any LineWrapper with the same options, marking it as the most recently used.
+        options: tuple = (
+            width,
+            subsequent_indent,
+            break_on_hyphens,
+            break_long_words,
+            expand_tabs,
+            replace_whitespace,
+            drop_whitespace,
+            tabsize,
+        )
+        self._cache: dict[str, tuple[str, ...]] = LineWrapper._caches.pop(options, {})
+        LineWrapper._caches[options] = self._cache
+        while len(LineWrapper._caches) > self._cache_count:
+            del LineWrapper._caches[next(iter(LineWrapper._caches))]
+
+    """PRIVATE METHODS"""
+
+    def _munge(self, line: str) -> str:
+        """
+        Expand the tabs and replace the whitespace characters of the line by spaces, as set by the options.
+        """
+        if self._expand_tabs and "\t" in line:
+            line = line.expandtabs(self._tabsize)
+        # Printable strings contain no whitespace other than spaces, so there is nothing to replace.
+        if self._replace_whitespace and not line.isprintable():
+            line = line.translate(self._whitespace_translation)
+        return line
+
+    def _wrap_spaces(self, text: str) -> tuple[str, ...]:
+        """
+        Wrap text that is wider than the width, and whose only whitespace characters are spaces (and that need not be
+        split at its hyphens) -- the same as `_wrap_long`, but finding the end of each row directly with `str.rfind`,
+        without splitting the text into chunks.
+        """
+        rows: list[str, ...] = []
+        position: int = 0
+        length: int = len(text)
+        while position < length:
+            indent: str = self._subsequent_indent if rows else ""
+            width: int = self._width - (self._indent_width if rows else 0)
+
+            # A run of spaces is dropped from the start of every row but the first.
+            if self._drop_whitespace and rows and text[position] == " ":
+                position = self._spaces.match(text, position).end()
+                if position == length:
+                    break
+
+            # Take as many whole words and runs of spaces as fit in the row.
+            limit: int = position + width
+            if limit >= length:
+                end: int = length
+            elif text[limit] != " " and text[limit - 1] != " ":
+                # The row would end within a word, so it ends before the word instead.
+                end: int = max(text.rfind(" ", position, limit) + 1, position)
+            elif text[limit] == " " and text[limit - 1] == " ":
+                # The row would end within a run of spaces, so it ends before the run instead.
+                end: int = position + len(text[position:limit].rstrip(" "))
+            else:
+                end: int = limit
+
+            # If the next word (or run of spaces) is wider than a whole row, break it to fill the rest of this one.
+            drop: bool = self._drop_whitespace
+            if end < length:
+                if text[end] == " ":
+                    next_end: int = self._spaces.match(text, end).end()
+                elif (next_end := text.find(" ", end)) < 0:
+                    next_end = length
+                if next_end - end > width:
+                    if self._break_long_words:
+                        # If the row is already full, the (empty) part of the word is what ends it, and is dropped.
+                        if end - position == width:
+                            drop = False
+                        end = position + width
+                    elif end == position:
+                        end = next_end
+
+            row_start: int = position
+            position = end
+            # A run of spaces is dropped from the end of every row.
+            if drop and text[end - 1] == " ":
+                end = row_start + len(text[row_start:end].rstrip(" "))
+            if end > row_start:
+                rows.append((indent + text[row_start:end]).strip())
+        return tuple(rows) or ("",)
+
+    def _wrap_cells(self, text: str) -> tuple[str, ...]:
+        """
+        Wrap text containing characters that do not take exactly one cell (such as CJK characters, emoji, or combining
+        marks), measuring chunks in cells rather than in characters.  Follows `textwrap.TextWrapper` chunk by chunk,
+        which is slower than `_wrap_long` but only needed for such text.  A wide character is never split across rows.
+        """
+        if CellWidth.string_width(text) <= self._width:
+            return (text.strip(),)
+        if self._break_on_hyphens and "-" in text:
+            chunks: list[str, ...] = self._split_hyphens.split(text)
+        else:
+            chunks: list[str, ...] = self._split_simple.split(text)
+        # Reversed, such that the next chunk can be popped from the end.
+        chunks: list[str, ...] = [chunk for chunk in reversed(chunks) if chunk]
+
+        rows: list[str, ...] = []
+        while chunks:
+            indent: str = self._subsequent_indent if rows else ""
+            width: int = self._width - (self._indent_width if rows else 0)
+
+            # A run of whitespace is dropped from the start of every row but the first.
+            if self._drop_whitespace and rows and chunks[-1].strip() == "":
+                del chunks[-1]
+
+            # Take as many whole chunks as fit in the row.
+            row: list[str, ...] = []
+            row_width: int = 0
+            while chunks and row_width + (chunk_width := CellWidth.string_width(chunks[-1])) <= width:
+                row.append(chunks.pop())
+                row_width += chunk_width
+
+            # If the next chunk is wider than a whole row, break it to fill the rest of this one.
+            if chunks and chunk_width > width:
+                chunk: str = chunks[-1]
+                space_left: int = 1 if width < 1 else width - row_width
+                if self._break_long_words:
+                    cells: list[str, ...] = CellWidth.cells(chunk)
+                    # The cells that fit, without the left half of a wide character.
+                    fit: int = space_left - 1 if cells[space_left : space_left + 1] == [""] else space_left
+                    split: int = sum(map(len, cells[:fit]))
+                    if self._break_on_hyphens and chunk_width > space_left:
+                        hyphen: int = chunk.rfind("-", 0, split)
+                        if hyphen > 0 and chunk[:hyphen].strip("-"):
+                            split = hyphen + 1
+                    # A wide character wider than the whole row (or zero-width characters) are given a row of their own.
+                    if split == 0 and not row:
+                        split = len(cells[0]) if cells else len(chunk)
+                    row.append(chunk[:split])
+                    if split < len(chunk):
+                        chunks[-1] = chunk[split:]
+                    else:
+                        del chunks[-1]
+                elif not row:
+                    row.append(chunks.pop())
+
+            # A run of whitespace is dropped from the end of every row.
+            if self._drop_whitespace and row and row[-1].strip() == "":
+                del row[-1]
+            if row:
+                rows.append((indent + "".join(row)).strip())
+        return tuple(rows) or ("",)
+
+    def _wrap_long(self, text: str) -> tuple[str, ...]:
+        """
+        Wrap text that is wider than the width, following the same greedy algorithm as `textwrap.TextWrapper`: each row
+        takes as many whole chunks as fit, and chunks wider than a whole row are broken (if `break_long_words` is set)
+        to fill the rest of it.  Works on the offsets at which the chunks end, rather than on the chunks themselves.
+        """
+        if self._break_on_hyphens and "-" in text:
+            chunks: list[str, ...] = self._split_hyphens.split(text)
+        else:
+            chunks: list[str, ...] = self._split_simple.split(text)
+        bounds: list[int, ...] = list(itertools.accumulate(map(len, chunks), initial=0))
+        length: int = len(text)
+
+        rows: list[str, ...] = []
+        position: int = 0
+        while position < length:
+            indent: str = self._subsequent_indent if rows else ""
+            width: int = self._width - (self._indent_width if rows else 0)
+            # End of the chunk (or of what remains of it) that starts the row.
+            chunk_end: int = bounds[bisect.bisect_right(bounds, position)]
+
+            # A run of whitespace is dropped from the start of every row but the first.
+            if self._drop_whitespace and rows and text[position:chunk_end].strip() == "":
+                position = chunk_end
+                if position == length:
+                    break
+
+            # Take as many whole chunks as fit in the row.
+            end: int = bounds[bisect.bisect_right(bounds, position + width) - 1]
+            if end < position:
+                end = position
+            last: int = max(bounds[bisect.bisect_left(bounds, end) - 1] if end > 0 else 0, position)
+
+            # If the next chunk is wider than a whole row, break it to fill the rest of this one.
+            if end < length and bounds[bisect.bisect_right(bounds, end)] - end > width:
+                next_end: int = bounds[bisect.bisect_right(bounds, end)]
+                space_left: int = 1 if width < 1 else width - (end - position)
+                if self._break_long_words:
+                    chunk: str = text[end:next_end]
+                    split: int = space_left
+                    if self._break_on_hyphens and len(chunk) > space_left:
+                        hyphen: int = chunk.rfind("-", 0, space_left)
+                        if hyphen > 0 and chunk[:hyphen].strip("-"):
+                            split = hyphen + 1
+                    last, end = end, end + split
+                elif end == position:
+                    last, end = end, next_end
+
+            row_start: int = position
+            position = end
+            # A run of whitespace is dropped from the end of every row.
+            if self._drop_whitespace and last < end and text[last:end].strip() == "":
+                end = last
+            if end > row_start:
+                rows.append((indent + text[row_start:end]).strip())
+        return tuple(rows) or ("",)
+
+    """PUBLIC METHODS"""
+
+    def wrap(self, line: str) -> tuple[str, ...]:
+        """
+        Return the display rows of the given line, each stripped of surrounding whitespace.  Always returns at least one
+        row, so that empty lines remain visible.
+        """
+        if (rows := self._cache.get(line)) is None:
+            if self._width <= 0:
+                error_message: str = f"\n\nInvalid width {self._width} in LineWrapper (must be larger than zero).\n"
+                System.kill_all = True
+                raise ValueError(error_message)
+            text: str = self._munge(line)
+            if not CellWidth.narrow(text):
+                rows = self._wrap_cells(text)
+            elif len(text) <= self._width:
+                rows = (text.strip(),)
+            elif self._spaces_only and text.isprintable() and not (self._break_on_hyphens and "-" in text):
+                rows = self._wrap_spaces(text)
+            else:
+                rows = self._wrap_long(text)
+            if len(self._cache) >= self._cache_size:
+                self._cache.clear()
+            self._cache[line] = rows
+        return rows
+
+    @property
+    def width(self) -> int:
+        """
+        Return the width to which lines are wrapped.
+        """
+        return self._width
@@ -1,14 +1,17 @@
+import asyncio
 import os
+import selectors
 import sys
 
-from termighty.settings.data import Data
+from termighty.settings.config import Config
+from termighty.settings.lazy_attribute import LazyAttribute
 from termighty.settings.system import System
+from termighty.utils.key_decoder import KeyDecoder
 from termighty.utils.term import Term
 
 import threading
-import time
 
-from typing import Optional, Union
+from typing import AsyncIterator, Optional, Union
 
 # If the OS is Windows, uses msvcrt to read inputs from the terminal.
 if System.os == "Windows":
@@ -22,8 +25,11 @@ else:
 
 class GetchIterator:
     """
-    Iterate over the Listener's history starting at the provided index, and continuously yields all new additions to
-    the history until the Listener is stopped.  Designed to be used in a for-loop.
+    Iterate over the Listener's history starting at the provided sequence number, and continuously yields all new
+    additions to the history until the Listener is stopped.  Designed to be used in a for-loop.
+
+    Each iterator keeps its own cursor into the history; if it falls so far behind that the inputs it has yet to read
+    have been overwritten, it yields the command `Overrun` and skips ahead to the oldest input still available.
     """
 
     def __init__(self, idx: Optional[int] = None):
@@ -35,27 +41,38 @@ class GetchIterator:
 
     def __iter__(self):
         """
-        If the start index is not given, set it to the current length of the Listener history, in order to start the
-        iterator on its last getch inputs. Otherwise, use the given `idx`.
+        If the start index is not given, set it to the sequence number of the next input recorded by the Listener, in
+        order to start the iterator on its next getch inputs. Otherwise, use the given `idx`.
         """
-        if self._idx == None:
-            self._idx = len(Listener._history)
+        if self._start_idx is None:
+            self._idx = Listener._sequence
         else:
             self._idx = self._start_idx
         return self
 
     def __next__(self):
         """
-        Every time a new input is detected by the Listener and appended to its history, return it.
+        Every time a new input is detected by the Listener and appended to its history, return it.  Sleeps until the
+        Listener signals that a new input has arrived, or that it has been stopped (see `Listener._wake`).
         """
-        while Listener._active and not System.kill_all:
-            if self._idx < len(Listener._history):
-                self._idx += 1
-                return Listener._history[self._idx - 1]
-            else:
-                time.sleep(0.01)
+        with Listener._condition:
+            while Listener._active and not System.kill_all:
+                self._idx, key = Listener._read(self._idx)
+                if key is not None:
+                    return key
+                else:
+                    Listener._condition.wait()
         raise StopIteration
 
+    def drain(self) -> list[Union[str, bytes], ...]:
+        """
+        Return every input that has been recorded since the last one returned, without waiting for new inputs -- so that
+        bursts of inputs (such as pastes, or held keys) can be processed all at once.
+        """
+        with Listener._condition:
+            self._idx, keys = Listener._read_all(self._idx)
+        return keys
+
 
 class Listener:
 
@@ -70,10 +87,51 @@ class Listener:
     """
 
     _active: bool = False
+    # Number of bytes requested from the standard input per read -- any number of keys may be decoded from one read.
+    _chunk_size: int = 4096
+    # Notified every time an input is appended to the history, waking up the consumers waiting for new inputs.
+    _condition: threading.Condition = threading.Condition()
+
+    @LazyAttribute
+    def _decoder(cls) -> KeyDecoder:
+        """
+        Splits the bytes read from the standard input into keys, holding back incomplete escape sequences.  Created on
+        first use, as it compiles the key maps.
+        """
+        return KeyDecoder()
+
     _escape_hits: int = 15
-    _history: list[str, ...] = []
+    # If this reaches the value given to `_escape_hits`, will trigger the `Kill` command.
+    _escape_hitcount: int = 0
+
+    @LazyAttribute
+    def _history_capacity(cls) -> int:
+        """
+        The number of inputs kept in the history, as given in `config.ini` (read on first use).
+        """
+        return Config.history_capacity
+
+    @LazyAttribute
+    def _history(cls) -> list[Optional[Union[str, bytes]], ...]:
+        """
+        Ring buffer containing the most recent inputs: the input with sequence number `n` is stored at index
+        `n % _history_capacity`, and `_sequence` is the sequence number that will be given to the next input.
+        """
+        return [None] * cls._history_capacity
+
+    _sequence: int = 0
     _raw: bool = False
-    _sleep_time: Union[int, float] = 0.01
+    # Pipe (as read and write file descriptors) written to by `_wake`, which wakes up the thread waiting for the
+    # standard input to be readable -- created the first time the Listener is started on Linux.
+    _wake_pipe: Optional[tuple[int, int]] = None
+
+    # The asyncio event loop used by `start_async` and `aiter_keys`, and the event they wait on for new inputs.
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _async_event: asyncio.Event = asyncio.Event()
+    # Whether the standard input is registered as a reader with `_loop`, as opposed to being read by a thread.
+    _async_reader: bool = False
+    # Timer flushing an incomplete escape sequence out of the decoder if no input follows it (asyncio reader only).
+    _async_flush_timer: Optional[asyncio.TimerHandle] = None
 
     """PRIVATE METHODS"""
 
@@ -83,11 +141,27 @@ class Listener:
         Listen for keyboard input, and return a string with a key name (such as `a`, `Z`, or `Backspace`).
 
         Expects `_raw_mode` to be True, implying the terminal will read user inputs immediately without echoing to the
-        terminal.
+        terminal.  Sleeps until the standard input is readable, returning empty bytes if the Listener is stopped first
+        (which writes to `_wake_pipe`), or if the decoder is holding back an incomplete escape sequence and no more
+        input arrives in time.
 
         Functions exclusively in Linux.
         """
-        escape_code: str = os.read(1, 10)
+        escape_code: bytes = b""
+        with selectors.DefaultSelector() as selector:
+            selector.register(cls._fd, selectors.EVENT_READ)
+            selector.register(cls._wake_pipe[0], selectors.EVENT_READ)
+            while not escape_code and Listener._active and not System.kill_all:
+                # Only the rest of an incomplete escape sequence is waited for with a timeout.
+                timeout: Optional[float] = cls._decoder.escape_timeout if cls._decoder.pending else None
+                if not (events := selector.select(timeout=timeout)):
+                    break
+                for key, _ in events:
+                    if key.fd == cls._fd:
+                        escape_code: bytes = os.read(cls._fd, cls._chunk_size)
+                    else:
+                        # Empty the pipe, such that it only wakes up the next call once written to again.
+                        os.read(key.fd, cls._chunk_size)
         return escape_code
 
     @classmethod
@@ -105,13 +179,119 @@ class Listener:
         return escape_code
 
     @classmethod
-    def _interpret_escape_code(cls, escape_code: bytes) -> str:
-        """ """
-        if escape_code in Data.keymaps.keys():
-            chars: str = [Data.keymaps[escape_code]]
+    def _decode_escape_code(cls, escape_code: bytes) -> list[tuple[bytes, str]]:
+        """
+        Feed the given bytes to the decoder, and return the keys it completes as pairs of raw bytes and key names.
+        Empty bytes signal that no input followed the bytes held back by the decoder, which are then returned as they
+        are.
+        """
+        if escape_code:
+            keys: list[tuple[bytes, str]] = cls._decoder.feed(escape_code)
+        else:
+            keys: list[tuple[bytes, str]] = cls._decoder.flush()
+        # Windows reads whole keys at once, so there is no need to wait for the rest of an escape sequence.
+        if System.os == "Windows":
+            keys.extend(cls._decoder.flush())
+        return keys
+
+    @classmethod
+    def _interpret_escape_code(cls, escape_code: bytes) -> list[str]:
+        """
+        Return the characters or commands (such as `a`, `Z`, or `Backspace`) decoded from the given escape code.
+        """
+        return [key for _, key in cls._decode_escape_code(escape_code)]
+
+    @classmethod
+    def _read(cls, idx: int) -> tuple[int, Optional[Union[str, bytes]]]:
+        """
+        Return the input with sequence number `idx` from the history along with the sequence number that follows it, or
+        `None` (and `idx` unchanged) if that input has not been recorded yet.  If the input has already been
+        overwritten, return the command `Overrun` along with the sequence number of the oldest input still in the
+        history.
+
+        Must be called while holding `_condition`.
+        """
+        if idx < (oldest := cls._sequence - cls._history_capacity):
+            return oldest, "Overrun"
+        elif idx < cls._sequence:
+            return idx + 1, cls._history[idx % cls._history_capacity]
         else:
-            chars: str = list(escape_code.decode(System.escape_code_encoding))
-        return chars
+            return idx, None
+
+    @classmethod
+    def _read_all(cls, idx: int) -> tuple[int, list[Union[str, bytes], ...]]:
+        """
+        Return all the inputs recorded from sequence number `idx` onwards, along with the sequence number that follows
+        them.  Starts with the command `Overrun` if some of these inputs have already been overwritten (see `_read`).
+
+        Must be called while holding `_condition`.
+        """
+        keys: list[Union[str, bytes], ...] = []
+        while (read := cls._read(idx))[1] is not None:
+            idx, key = read
+            keys.append(key)
+        return idx, keys
+
+    @classmethod
+    def _record(cls, *keys: Union[str, bytes]) -> None:
+        """
+        Append the given keys to the history (overwriting the oldest inputs once the history is full), and wake up all
+        the consumers waiting for new inputs (including coroutines iterating over `aiter_keys`).  All the keys decoded
+        from a single read are recorded at once, so that a burst of input only wakes the consumers up once.
+        """
+        if not keys:
+            return
+        with cls._condition:
+            for key in keys:
+                cls._history[cls._sequence % cls._history_capacity] = key
+                cls._sequence += 1
+            cls._condition.notify_all()
+        cls._wake_async()
+
+    @classmethod
+    def _set_async_event(cls) -> None:
+        """
+        Wake up every coroutine currently waiting in `aiter_keys`, and prepare a new event for the next wait.  Must run
+        in the thread of the event loop.
+        """
+        event, cls._async_event = cls._async_event, asyncio.Event()
+        event.set()
+
+    @classmethod
+    def _use_loop(cls, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Set the event loop used to wake up coroutines waiting for inputs; asyncio events cannot be shared between loops,
+        so a new one is created if the loop has changed.
+        """
+        if cls._loop is not loop:
+            cls._loop: asyncio.AbstractEventLoop = loop
+            cls._async_event: asyncio.Event = asyncio.Event()
+
+    @classmethod
+    def _wake(cls) -> None:
+        """
+        Wake up everything waiting on the Listener -- the thread waiting for the standard input to be readable, the
+        consumers waiting for new inputs, and the coroutines iterating over `aiter_keys` -- such that they notice that
+        the Listener has been stopped.  Subscribed to `System` while the Listener is active, such that setting
+        `System.kill_all` also wakes them up.
+        """
+        with cls._condition:
+            cls._condition.notify_all()
+        if cls._wake_pipe is not None:
+            try:
+                os.write(cls._wake_pipe[1], b"\0")
+            except BlockingIOError:
+                # The pipe is full, so the thread reading the standard input is already due to wake up.
+                pass
+        cls._wake_async()
+
+    @classmethod
+    def _wake_async(cls) -> None:
+        """
+        Schedule the coroutines waiting in `aiter_keys` to be woken up -- safe to call from any thread.
+        """
+        if (loop := cls._loop) is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(cls._set_async_event)
 
     @classmethod
     def _listener(cls) -> None:
@@ -121,41 +301,11 @@ class Listener:
 
         Expects `_raw_mode` to be True, implying the terminal will read user inputs immediately without echoing to the
         terminal.
-
-        To kill all running threads, hold key `ESC` for a few seconds, or hit it as many times in a row as the value
-        given in cls._escape_hits -- be sure not to press any other keys in between or the kill process is interrupted.
         """
-        # If this reaches the value given to `cls._escape_hits`, will trigger the `Kill` command.
-        escape_hitcount: int = 0
         # While the Listener is active, run the listener loop.
         while Listener._active and not System.kill_all:
-
-            # Get an escape code from the getch method.
-            escape_code: str = cls._getch()
-            # Get a character or command from the acquired escape code.
-            chars = cls._interpret_escape_code(escape_code)
-
-            for char in chars:
-                # Check if the character is `Esc`.
-                if char == "Esc":
-                    cls._history.append(char)
-                    # If increment `escape_hitcount`. hasn't reached its limit, increment it by one.
-                    if escape_hitcount < cls._escape_hits - 1:
-                        escape_hitcount += 1
-                        continue
-                    # If increment `escape_hitcount`. has reached its limit, send the `Kill` command and break.
-                    else:
-                        cls._history.append("Kill")
-                        System.kill_all = True
-                        cls.stop()
-
-                # If the character is not `Esc`, and `escape_hitcount` is greater than 0, set `escape_hitcount` to zero.
-                elif escape_hitcount > 0:
-                    escape_hitcount = 0
-
-                # If getch returned a string, append it to the key history.
-                if isinstance(char, str):
-                    cls._history.append(char)
+            # Get an escape code from the getch method, and append its characters or commands to the history.
+            cls._process_escape_code(cls._getch())
 
     @classmethod
     def _listener_raw(cls) -> None:
@@ -165,38 +315,128 @@ class Listener:
 
         Expects `_raw_mode` to be True, implying the terminal will read user inputs immediately without echoing to the
         terminal.
+        """
+        # While the Listener is active, run the listener loop.
+        while Listener._active and not System.kill_all:
+            # Get a character or command from the selected getch method, and append it to the history.
+            cls._process_escape_code_raw(cls._getch())
+
+    @classmethod
+    def _process_escape_code(cls, escape_code: bytes) -> None:
+        """
+        Interpret the given escape code and append the resulting characters or commands to the history.  Shared by the
+        threaded listener and the asyncio reader callback.
 
         To kill all running threads, hold key `ESC` for a few seconds, or hit it as many times in a row as the value
         given in cls._escape_hits -- be sure not to press any other keys in between or the kill process is interrupted.
         """
-        # If this reaches the value given to `cls._escape_hits`, will trigger the `Kill` command.
-        escape_hitcount: int = 0
-        # While the Listener is active, run the listener loop.
-        while Listener._active and not System.kill_all:
-            # Get a character or command from the selected getch method.
-            escape_code: bytes = cls._getch()
+        # Get a character or command from the acquired escape code.
+        chars = cls._interpret_escape_code(escape_code)
+        # Keys to append to the history, all at once.
+        keys: list[str, ...] = []
+
+        for char in chars:
+            # Check if the character is `Esc`.
+            if char == "Esc":
+                keys.append(char)
+                # If increment `escape_hitcount`. hasn't reached its limit, increment it by one.
+                if cls._escape_hitcount < cls._escape_hits - 1:
+                    cls._escape_hitcount += 1
+                    continue
+                # If increment `escape_hitcount`. has reached its limit, send the `Kill` command and break.
+                else:
+                    cls._record(*keys, "Kill")
+                    keys.clear()
+                    System.kill_all = True
+                    cls.stop()
+
+            # If the character is not `Esc`, and `escape_hitcount` is greater than 0, set `escape_hitcount` to zero.
+            elif cls._escape_hitcount > 0:
+                cls._escape_hitcount = 0
+
+            # If getch returned a string, append it to the key history.
+            if isinstance(char, str):
+                keys.append(char)
+
+        cls._record(*keys)
+
+    @classmethod
+    def _process_escape_code_raw(cls, escape_code: bytes) -> None:
+        """
+        Split the given escape code into keys, and append their raw escape codes to the history without interpreting
+        them.  Shared by the threaded listener and the asyncio reader callback.
+
+        To kill all running threads, hold key `ESC` for a few seconds, or hit it as many times in a row as the value
+        given in cls._escape_hits -- be sure not to press any other keys in between or the kill process is interrupted.
+        """
+        # Keys to append to the history, all at once.
+        keys: list[Union[str, bytes], ...] = []
+
+        for key_code, _ in cls._decode_escape_code(escape_code):
             # Check if the escape code for `Esc` is returned.
-            if escape_code == b"\x1b":
+            if key_code == b"\x1b":
                 # If increment `escape_hitcount`. hasn't reached its limit, increment it by one.
-                if escape_hitcount < cls._escape_hits - 1:
-                    escape_hitcount += 1
+                if cls._escape_hitcount < cls._escape_hits - 1:
+                    cls._escape_hitcount += 1
                 # If increment `escape_hitcount`. has reached its limit, send the `Kill` command and break.
                 else:
-                    cls._history.append("Kill")
+                    cls._record(*keys, "Kill")
+                    keys.clear()
                     System.kill_all = True
                     cls.stop()
 
-            cls._history.append(escape_code)
+            # If the character is not `Esc`, and `escape_hitcount` is greater than 0, set `escape_hitcount` to zero.
+            elif cls._escape_hitcount > 0:
+                cls._escape_hitcount = 0
+
+            keys.append(key_code)
+
+        cls._record(*keys)
+
+    @classmethod
+    def _read_ready(cls, raw: bool, flush: bool = False) -> None:
+        """
+        Reader callback registered with the asyncio event loop by `start_async`: reads the available input without
+        blocking, and processes it exactly like the threaded listener would.  If the decoder is left holding back an
+        incomplete escape sequence, schedules it to be flushed unless more input arrives first.
+
+        Also used as the callback of the flush timer, in which case `flush` is set to True and nothing is read.
+        """
+        if cls._async_flush_timer is not None:
+            cls._async_flush_timer.cancel()
+            cls._async_flush_timer = None
+
+        if flush:
+            escape_code: bytes = b""
+        else:
+            escape_code: bytes = os.read(cls._fd, cls._chunk_size)
+
+        if raw:
+            cls._process_escape_code_raw(escape_code)
+        else:
+            cls._process_escape_code(escape_code)
+
+        if cls._async_reader and cls._decoder.pending:
+            cls._async_flush_timer = cls._loop.call_later(cls._decoder.escape_timeout, cls._read_ready, raw, True)
 
     @classmethod
     def _raw_mode_linux(cls, state: bool) -> None:
         """
-        Set the terminal to raw mode if True, or to echo mode if False
+        Set the terminal to raw mode if True, or to echo mode if False.  Bracketed paste mode is enabled along with raw
+        mode, so that pasted text reaches the Listener as a single `Paste` rather than one key per character.
+
+        The terminal's tty attributes are saved when raw mode is activated (rather than when the module is imported), so
+        that they can be restored when it is deactivated.
         """
         if state:
-            tty.setraw(fd=sys.stdin.fileno())
-        elif not state:
-            termios.tcsetattr(fd=cls._fd, when=termios.TCSADRAIN, attributes=cls._old_settings)
+            if cls._fd is None:
+                cls._fd: int = sys.stdin.fileno()
+            cls._old_settings: list = termios.tcgetattr(cls._fd)
+            tty.setraw(fd=cls._fd)
+            Term().bracketed_paste(True, flush=True)
+        elif cls._old_settings is not None:
+            Term().bracketed_paste(False, flush=True)
+            termios.tcsetattr(cls._fd, termios.TCSADRAIN, cls._old_settings)
         cls._raw: bool = state
 
     @classmethod
@@ -208,6 +448,37 @@ class Listener:
 
     """PUBLIC METHODS"""
 
+    @classmethod
+    async def aiter_key_batches(cls, idx: Optional[int] = None) -> AsyncIterator[list[Union[str, bytes], ...]]:
+        """
+        Like `aiter_keys`, but yields all the inputs available at once as a list, rather than one at a time -- so that
+        bursts of inputs (such as pastes, or held keys) can be processed all at once.
+        """
+        cls._use_loop(asyncio.get_running_loop())
+        if idx is None:
+            idx = cls._sequence
+        while Listener._active and not System.kill_all:
+            with cls._condition:
+                idx, keys = cls._read_all(idx)
+            if keys:
+                yield keys
+            else:
+                await cls._async_event.wait()
+
+    @classmethod
+    async def aiter_keys(cls, idx: Optional[int] = None) -> AsyncIterator[Union[str, bytes]]:
+        """
+        Asynchronous counterpart to `getch_iterator`, designed to be used in an `async for` loop.  Yields every input
+        appended to the history from sequence number `idx` onwards (or from the next input if `idx` is not given),
+        awaiting new inputs without blocking the event loop, until the Listener is stopped.  Like `GetchIterator`,
+        yields `Overrun` if it falls behind by more than the capacity of the history.
+
+        Works with the Listener started either by `start_async` or by `start`.
+        """
+        async for keys in cls.aiter_key_batches(idx):
+            for key in keys:
+                yield key
+
     @classmethod
     def getch_iterator(cls, idx: Optional[int] = None, keytest: bool = False) -> GetchIterator:
         """ """
@@ -221,6 +492,11 @@ class Listener:
         """
         if not Listener._active:
             Listener._active: bool = True
+            System.subscribe_kill(cls._wake)
+            if System.os != "Windows" and Listener._wake_pipe is None:
+                Listener._wake_pipe = os.pipe()
+                for fd in Listener._wake_pipe:
+                    os.set_blocking(fd, False)
 
             if raw:
                 thread_listener: threading.Thread = threading.Thread(target=cls._listener_raw, daemon=False)
@@ -236,14 +512,53 @@ class Listener:
                 System.kill_all = True
                 raise Exception(e)
 
+    @classmethod
+    def start_async(cls, raw: bool = False) -> None:
+        """
+        Activate the Listener session within the running asyncio event loop: rather than starting a thread, registers
+        the standard input with the event loop, which processes each input as soon as it is available.  Inputs can then
+        be consumed with `async for key in Listener.aiter_keys()`.  If `raw` is set to True, will not interpret the
+        escape codes input by the user, and simply append the raw escape code bytes to the history.
+
+        Must be called from within a coroutine, and is only available on Linux-based systems.
+        """
+        if System.os == "Windows":
+            error_message: str = (
+                f"\n\nListener.start_async is not supported on Windows, since its asyncio event loops cannot watch the "
+                f"console for input.  Use Listener.start instead.\n"
+            )
+            System.kill_all = True
+            raise NotImplementedError(error_message)
+
+        if not Listener._active:
+            cls._use_loop(asyncio.get_running_loop())
+            Listener._active: bool = True
+            System.subscribe_kill(cls._wake)
+            cls._raw_mode(True)
+            cls._loop.add_reader(cls._fd, cls._read_ready, raw)
+            cls._async_reader: bool = True
+
     @classmethod
     def stop(cls) -> None:
         """
         Deactivate the Listener session.
         """
+        System.unsubscribe_kill(cls._wake)
         cls._raw_mode(False)
-        Listener._active: bool = False
-        Listener._history = []
+        if cls._async_reader:
+            cls._loop.remove_reader(cls._fd)
+            cls._async_reader: bool = False
+            if cls._async_flush_timer is not None:
+                cls._async_flush_timer.cancel()
+                cls._async_flush_timer = None
+        with cls._condition:
+            Listener._active: bool = False
+            # Release the recorded inputs; the sequence numbers keep increasing, so stale cursors remain detectable.
+            Listener._history = [None] * cls._history_capacity
+            Listener._escape_hitcount = 0
+            Listener._decoder.reset()
+        # Wake up the thread reading the standard input and all consumers waiting for new inputs, so that they stop.
+        cls._wake()
         Term().clear(flush=True)
 
     """DYNAMICALLY SELECT CLASSMETHODS BY OS"""
@@ -253,9 +568,10 @@ class Listener:
         _getch: classmethod = _getch_windows
         _raw_mode: classmethod = _raw_mode_windows
     # If the OS is Linux, use _getch_linux as backend for _getch, and _raw_mode_linux as backend for _raw.
-    # Additionally, save the terminal's old tty attributes for when raw mode is deactivated.
+    # Additionally, the file descriptor of the terminal and its old tty attributes (saved by `_raw_mode_linux` for when
+    # raw mode is deactivated) -- the file descriptor defaults to that of the standard input.
     else:
         _getch: classmethod = _getch_linux
         _raw_mode: classmethod = _raw_mode_linux
-        _fd: str = sys.stdin.fileno()
-        _old_settings: list[str, list[bytes]] = termios.tcgetattr(_fd)
+        _fd: Optional[int] = None
+        _old_settings: Optional[list] = None
@@ -0,0 +1,15 @@
+class Paste(str):
+    """
+    Text pasted into the terminal, delivered by the `Listener` as a single input rather than one key per character.
+
+    Terminals in bracketed paste mode wrap pasted text in the escape sequences `ESC [ 200 ~` and `ESC [ 201 ~`, which
+    `KeyDecoder` uses to collect everything in between into one `Paste`.  Since it is a subclass of `str`, a `Paste`
+    can be used like any other input -- but it always stands for literal text, never for the name of a key: a pasted
+    `Enter` is the five characters it contains, and is inserted as such by `KeyProcessor`.
+    """
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the Paste.
+        """
+        return f"Paste({str.__repr__(self)})"
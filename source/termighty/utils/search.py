@@ -0,0 +1,168 @@
+import re
+import threading
+
+from typing import Optional, Sequence
+
+
+class Search:
+    """
+    A search for a plain string or a regular expression within a `TextEditor`, matched against one line at a time.
+
+    Matches are only ever computed for the lines that are actually needed: those displayed (see `spans`, which caches
+    the matches of each line it is given), and those between the cursor and the next match (see `find`).  The total
+    number of matches in the text is counted separately, in a background thread (see `count`).
+
+    An invalid regular expression, such as one that is still being typed, is not an error: it simply matches nothing.
+    """
+
+    # Maximum number of lines whose matches are cached by `spans`, after which the cache is cleared.
+    _cache_size: int = 4096
+    # Number of lines counted by the background thread between checks of whether its count is still needed.
+    _count_chunk_size: int = 1024
+    # Number of lines taken from the text at once by `find`, as slicing a `TextBuffer` is faster than indexing it.
+    _find_chunk_size: int = 256
+
+    """CONSTRUCTOR"""
+
+    def __init__(self, query: str, regex: bool = False, case_sensitive: bool = True):
+        """
+        Prepare a search for the given query, which is a regular expression if `regex` is set to True, or a plain
+        string otherwise.
+        """
+        self._query: str = query
+        self._regex: bool = regex
+        self._case_sensitive: bool = case_sensitive
+        try:
+            self._pattern: Optional[re.Pattern] = re.compile(
+                query if regex else re.escape(query), 0 if case_sensitive else re.IGNORECASE
+            )
+        except re.error:
+            self._pattern: Optional[re.Pattern] = None
+
+        # Matches of the lines displayed so far, keyed by the contents of the line.
+        self._cache: dict[str, list[tuple[int, int], ...]] = {}
+        # The number of matches counted in the background, and the number of the count in progress -- counts that have
+        # since been superseded (or cancelled) stop as soon as they notice.
+        self._count: Optional[int] = None
+        self._generation: int = 0
+
+    """PRIVATE METHODS"""
+
+    def _count_matches(self, lines: Sequence[str], generation: int) -> None:
+        """
+        Count the matches in the given lines, unless the count is superseded first.  Run in a background thread.
+        """
+        if self._pattern is None or not self._query:
+            total: int = 0
+        elif not self._regex and self._case_sensitive and "\n" not in self._query:
+            # Plain strings cannot match across the newlines that separate the lines, so they are counted all at once.
+            total: int = "\n".join(lines).count(self._query)
+        else:
+            total: int = 0
+            for start in range(0, len(lines), self._count_chunk_size):
+                if generation != self._generation:
+                    return
+                for line in lines[start : start + self._count_chunk_size]:
+                    total += len(self._match(line))
+        if generation == self._generation:
+            self._count: Optional[int] = total
+
+    def _match(self, line: str) -> list[tuple[int, int], ...]:
+        """
+        Return the start and stop columns of every match in the given line, ignoring empty matches.
+        """
+        if self._pattern is None or not self._query:
+            spans: list[tuple[int, int], ...] = []
+        else:
+            spans: list[tuple[int, int], ...] = [
+                match.span() for match in self._pattern.finditer(line) if match.end() > match.start()
+            ]
+        return spans
+
+    """PUBLIC METHODS"""
+
+    def cancel(self) -> None:
+        """
+        Stop the count in progress, if any.
+        """
+        self._generation += 1
+
+    @property
+    def count(self) -> Optional[int]:
+        """
+        Return the number of matches found by the last call to `start_count`, or None if it is still counting.
+        """
+        return self._count
+
+    def find(
+        self, text: Sequence[str], position: tuple[int, int], backward: bool = False, limit: Optional[int] = None
+    ) -> Optional[tuple[tuple[int, int], tuple[int, int]]]:
+        """
+        Return the start and stop positions of the first match that starts at or after the given position -- or of the
+        last match that starts before it, if `backward` is set to True -- wrapping around the ends of the text.  Returns
+        None if there are no matches.  Only the lines up to the match found are searched, and at most `limit` lines if
+        it is given.
+        """
+        row, col = position
+        found: Optional[tuple[tuple[int, int], tuple[int, int]]] = None
+        # The lines of the text from index `chunk_start` onwards, taken in the direction of the search.
+        chunk_start: int = 0
+        chunk: list[str, ...] = []
+        steps: int = len(text) + 1 if len(text) > 0 else 0
+        for step in range(steps if limit is None else min(steps, limit)):
+            current: int = (row - step if backward else row + step) % len(text)
+            if not chunk_start <= current < chunk_start + len(chunk):
+                if backward:
+                    chunk_start = max(current + 1 - self._find_chunk_size, 0)
+                else:
+                    chunk_start = current
+                chunk = text[chunk_start : chunk_start + self._find_chunk_size]
+            spans: list[tuple[int, int], ...] = self._match(chunk[current - chunk_start])
+            # On the row of the given position, only matches on the appropriate side of it count -- until the search
+            # wraps around to the other side.
+            if step == 0:
+                spans = [span for span in spans if (span[0] < col if backward else span[0] >= col)]
+            elif step == len(text):
+                spans = [span for span in spans if (span[0] >= col if backward else span[0] < col)]
+            if spans:
+                start, stop = spans[-1] if backward else spans[0]
+                found = ((current, start), (current, stop))
+                break
+        return found
+
+    @property
+    def query(self) -> str:
+        """
+        Return the string or regular expression searched for.
+        """
+        return self._query
+
+    def spans(self, line: str) -> list[tuple[int, int], ...]:
+        """
+        Return the start and stop columns of every match in the given line.  The matches of each line are cached, so
+        that lines scrolled back into view are not searched again.
+        """
+        if (spans := self._cache.get(line)) is None:
+            if len(self._cache) >= self._cache_size:
+                self._cache.clear()
+            spans = self._cache[line] = self._match(line)
+        return spans
+
+    def start_count(self, lines: Sequence[str]) -> None:
+        """
+        Start counting the matches in the given lines in a background thread, superseding any count in progress.  The
+        lines must not be modified until the count is done, so a copy of them should be given.
+        """
+        self._generation += 1
+        self._count: Optional[int] = None
+        thread: threading.Thread = threading.Thread(
+            target=self._count_matches, args=(lines, self._generation), daemon=True
+        )
+        thread.start()
+
+    @property
+    def valid(self) -> bool:
+        """
+        Return False if the query is an invalid regular expression, which matches nothing.
+        """
+        return self._pattern is not None
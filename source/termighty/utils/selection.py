@@ -0,0 +1,166 @@
+import bisect
+
+from typing import Iterable, Iterator, Sequence
+
+
+class Selection:
+    """
+    The text selected in a `TextEditor`, stored as a sorted list of disjoint, half-open ranges of (row, column)
+    positions, rather than as a list of the coordinates of every selected character.
+
+    Only characters can be selected: the ends of rows are skipped over, so a range always starts at its first selected
+    character and stops right after its last one, on the same row.  Since this form is unique to any set of selected
+    characters, ranges can be toggled (see `toggle`) and compared without ever enumerating the characters they contain,
+    and the parts of a row that are selected can be found in O(log n) time for n ranges (see `spans`).
+    """
+
+    """CONSTRUCTOR"""
+
+    def __init__(self, ranges: Iterable[tuple[tuple[int, int], tuple[int, int]]] = ()):
+        """
+        Create a new Selection from the given ranges, which must already be sorted, disjoint, and normalized (such as
+        those of another Selection).  Selections are usually created empty, then extended with `toggle`.
+        """
+        self._ranges: list[tuple[tuple[int, int], tuple[int, int]], ...] = list(ranges)
+
+    """MAGIC METHODS"""
+
+    def __bool__(self) -> bool:
+        """
+        Return True if any characters are selected.
+        """
+        return bool(self._ranges)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Return True if the given Selection contains the same ranges.
+        """
+        if isinstance(other, Selection):
+            equal: bool = self._ranges == other._ranges
+        else:
+            equal: bool = NotImplemented
+        return equal
+
+    def __iter__(self) -> Iterator[tuple[tuple[int, int], tuple[int, int]]]:
+        """
+        Iterate over the selected ranges, as pairs of (row, column) positions.
+        """
+        return iter(self._ranges)
+
+    def __len__(self) -> int:
+        """
+        Return the number of selected ranges.
+        """
+        return len(self._ranges)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the Selection.
+        """
+        return f"Selection({self._ranges!r})"
+
+    """PRIVATE METHODS"""
+
+    @staticmethod
+    def _skip_forward(raw_text: Sequence[str], position: tuple[int, int]) -> tuple[int, int]:
+        """
+        Return the position of the first character at or after the given position -- or the end of the text, if there
+        is none.
+        """
+        row, col = position
+        while row < len(raw_text) - 1 and col >= len(raw_text[row]):
+            row, col = row + 1, 0
+        return row, min(max(col, 0), len(raw_text[row]))
+
+    @staticmethod
+    def _skip_backward(raw_text: Sequence[str], position: tuple[int, int]) -> tuple[int, int]:
+        """
+        Return the position right after the last character before the given position, on the same row as that
+        character -- or the start of the text, if there is none.
+        """
+        row, col = position
+        while row > 0 and col == 0:
+            row -= 1
+            col: int = len(raw_text[row])
+        return row, min(col, len(raw_text[row]))
+
+    """PUBLIC METHODS"""
+
+    @property
+    def last(self) -> tuple[int, int]:
+        """
+        Return the position of the last selected character.  The Selection must not be empty.
+        """
+        row, col = self._ranges[-1][1]
+        return row, col - 1
+
+    def normalize(self, raw_text: Sequence[str]) -> "Selection":
+        """
+        Return a copy of the Selection with each range fitted to the given text, such that it starts at its first
+        character and stops right after its last one -- and with ranges that contain no characters removed.  Required
+        after the selected ranges are moved (see `shift`), or the text they refer to is modified.
+        """
+        ranges: list[tuple[tuple[int, int], tuple[int, int]], ...] = []
+        for start, stop in self._ranges:
+            start: tuple[int, int] = self._skip_forward(raw_text, start)
+            stop: tuple[int, int] = self._skip_backward(raw_text, stop)
+            if start < stop:
+                ranges.append((start, stop))
+        return Selection(ranges)
+
+    def shift(self, rows: int, cols: dict[int, int]) -> "Selection":
+        """
+        Return a copy of the Selection in which every range is moved by the given number of rows, and each end of a
+        range is moved by the number of columns given for its (original) row in `cols` -- or by zero columns, if its row
+        is not in `cols`.  The result should be normalized against the modified text (see `normalize`).
+        """
+        return Selection(
+            (
+                (start[0] + rows, max(start[1] + cols.get(start[0], 0), 0)),
+                (stop[0] + rows, max(stop[1] + cols.get(stop[0], 0), 0)),
+            )
+            for start, stop in self._ranges
+        )
+
+    def spans(self, row: int, length: int) -> list[tuple[int, int], ...]:
+        """
+        Return the selected parts of the given row, whose length must be given, as half-open ranges of columns.
+        """
+        spans: list[tuple[int, int], ...] = []
+        # Find the first range that stops on or after the given row.
+        idx: int = bisect.bisect_left(self._ranges, (row,), key=lambda selected: selected[1])
+        while idx < len(self._ranges) and (selected := self._ranges[idx])[0][0] <= row:
+            start: int = selected[0][1] if selected[0][0] == row else 0
+            stop: int = selected[1][1] if selected[1][0] == row else length
+            if start < stop:
+                spans.append((start, stop))
+            idx += 1
+        return spans
+
+    @property
+    def start(self) -> tuple[int, int]:
+        """
+        Return the position of the first selected character.  The Selection must not be empty.
+        """
+        return self._ranges[0][0]
+
+    @property
+    def stop(self) -> tuple[int, int]:
+        """
+        Return the position right after the last selected character, on the same row.  The Selection must not be empty.
+        """
+        return self._ranges[-1][1]
+
+    def toggle(self, raw_text: Sequence[str], position: tuple[int, int], new_position: tuple[int, int]) -> "Selection":
+        """
+        Return a new Selection in which the characters between the two given positions of the cursor are selected if
+        they were not already, and deselected if they were.
+        """
+        # Every boundary of a range toggles whether the characters that follow it are selected, so the boundaries of
+        # both the old and new ranges combine into the boundaries of the result, once duplicates cancel each other out.
+        boundaries: set[tuple[int, int], ...] = set()
+        for start, stop in self._ranges + [(min(position, new_position), max(position, new_position))]:
+            boundaries ^= {self._skip_forward(raw_text, start)}
+            boundaries ^= {self._skip_forward(raw_text, stop)}
+        ordered: list[tuple[int, int], ...] = sorted(boundaries)
+        return Selection(zip(ordered[::2], ordered[1::2])).normalize(raw_text)
@@ -1,13 +1,46 @@
+import atexit
+import io
+import os
+import queue
 import sys
 import threading
 
+from termighty.settings.system import System
+from termighty.utils.cell_width import CellWidth
+
+from typing import Optional, Union
+
 
 class Term:
     """
     A collection of commands that can be used to make modifications to the terminal state.
+
+    All instances share a front buffer containing the cells currently displayed by the terminal, while the grid of each
+    instance acts as a back buffer for the cells drawn since its last flush.  Only the cells of the back buffer that
+    differ from the front buffer are output when flushing.
+
+    Cells are terminal cells rather than characters (see `CellWidth`): a wide character is stored in the cell of its
+    left half, followed by an empty cell for its right half, and combining marks are stored in the cell of the character
+    they are drawn over -- such that the positions in the buffers always match those on the screen.
+
+    By default, the thread that flushes also writes to the terminal.  Calling `Term.start_writer` instead hands every
+    compiled frame to a dedicated writer thread, so that threads drawing to the terminal never wait on its output.
     """
 
-    _flush_lock = threading.Lock()
+    # Guards the front buffer, and ensures frames reach the terminal in the order they were compiled.
+    _screen_lock = threading.Lock()
+
+    # Frames waiting to be output by the writer thread, or None if the writer thread is inactive.
+    _frames: Optional[queue.Queue] = None
+    _writer_thread: Optional[threading.Thread] = None
+
+    # The cells currently displayed in the terminal, keyed by (line, column) and mapped to (format, char) pairs.
+    _front_buffer: dict[tuple[int, int], tuple[str, str]] = {}
+    # The terminal dimensions at the time the front buffer was last written to (None until the first frame).
+    _front_buffer_size: Optional[tuple[int, int]] = None
+    # Incremented whenever the terminal may have been cleared, such that widgets caching what they have already drawn
+    # (such as the line numbers of a `TextEditor`) know to draw it again.
+    _front_buffer_generation: int = 0
 
     def __init__(self, flush: bool = False) -> None:
         """
@@ -19,17 +52,42 @@ class Term:
         If the `flush` parameter is set to True however, then the buffer is bypassed and the command outputs immediately
         to the terminal.
         """
+        # Guards this instance's buffers, such that they can be written to while another thread flushes them.
+        self._flush_lock = threading.Lock()
+        # Cells written since the last non-cell command, keyed by (line, column) and mapped to (format, char) pairs.
         self._text_buffer_grid = {}
         self._text_buffer = []
         self._cursor_buffer = []
 
+    def _append(self, string: str) -> None:
+        """
+        Append a command string to the buffer.  Any cells written beforehand are moved into the buffer first, so that
+        commands such as `cursor_save` and `cursor_load` keep their position relative to the written text.
+        """
+        with self._flush_lock:
+            if self._text_buffer_grid:
+                self._text_buffer.append(self._text_buffer_grid)
+                self._text_buffer_grid = {}
+            self._text_buffer.append(string)
+
     def bell(self, flush: bool = False) -> None:
         """
         Play the terminal bell sound.
         """
         string = "\a"
         if not flush:
-            self._text_buffer.append(string)
+            self._append(string)
+        else:
+            self.flush_string(string)
+
+    def bracketed_paste(self, state: bool, flush: bool = False) -> None:
+        """
+        Enable bracketed paste mode if `state` is True, or disable it if False (appends to the buffer).  In bracketed
+        paste mode, the terminal wraps pasted text in escape sequences, so that it can be told apart from typed keys.
+        """
+        string = "\033[?2004h" if state else "\033[?2004l"
+        if not flush:
+            self._append(string)
         else:
             self.flush_string(string)
 
@@ -38,20 +96,105 @@ class Term:
         Cross-platform terminal clear command (appends to the buffer).
         """
         string = "\033[2J\033[3J\033[f"
+        with Term._screen_lock:
+            Term._front_buffer_generation += 1
         if not flush:
-            self._text_buffer.append(string)
             # There is no need to keep the prior buffer elements as they will be cleared anyways.
-            for i in range(len(buffer))[::-1]:
-                self._text_buffer.pop(i)
+            with self._flush_lock:
+                self._text_buffer_grid = {}
+                self._text_buffer = [string]
         else:
             self.flush_string(string)
 
-    def _compile_buffer(self, text_buffer_grid):
+    def _compile_buffer(self, text_buffer_grid: dict[tuple[int, int], tuple[str, str]]) -> str:
         """
         Prepares the buffer for flushing -- improves efficiency by avoiding printing over a specific position more than
         once.
+
+        Each position in the grid holds only the last cell written to it, and cells that are already displayed in the
+        terminal (according to the shared front buffer) are skipped.  Every horizontal run of adjacent cells is preceded
+        by a single cursor movement rather than one per character.  The right half of a wide character is output along
+        with its left half, and a wide character that is partly drawn over is forgotten by the front buffer, as the
+        terminal erases it.  Must be called while holding `_screen_lock`.
+
+        The current SGR state (colors and style) is tracked while compiling, such that an escape sequence is only output
+        when the format changes between consecutive cells, and the terminal is only reset once at the very end.
+        """
+        front_buffer = Term._front_buffer
+        out = []
+        prev_line, prev_column = None, None
+        # The format currently active in the terminal, where an empty string represents the terminal's default.
+        sgr = ""
+        for position in sorted(text_buffer_grid):
+            cell = text_buffer_grid[position]
+            if (previous := front_buffer.get(position)) == cell:
+                continue
+            front_buffer[position] = cell
+            line, column = position
+            fmt, char = cell
+            if previous is not None and previous[1] != char:
+                if previous[1] == "":
+                    # Drawing over the right half of a wide character erases its left half.
+                    lead = front_buffer.get((line, column - 1))
+                    if lead is not None and CellWidth.string_width(lead[1]) == 2:
+                        del front_buffer[(line, column - 1)]
+                elif CellWidth.string_width(previous[1]) == 2 and CellWidth.string_width(char) != 2:
+                    # Drawing over the left half of a wide character erases its right half.
+                    front_buffer.pop((line, column + 1), None)
+            if char == "":
+                # The right half of a wide character, already output along with its left half.
+                if line == prev_line and column == prev_column + 1:
+                    prev_column = column
+                continue
+            if line != prev_line or column != prev_column + 1:
+                out.append(f"\x1b[{line+1};{column+1}f")
+            if fmt != sgr:
+                out.append(self._sgr_transition(sgr, fmt))
+                sgr = fmt
+            out.append(char)
+            prev_line, prev_column = line, column
+        if sgr:
+            out.append("\033[m")
+        return "".join(out)
+
+    @staticmethod
+    def _sgr_transition(sgr: str, fmt: str) -> str:
+        """
+        Return the escape sequence that changes the terminal from format `sgr` to format `fmt`.  Unless `fmt` already
+        starts by resetting all attributes (as formats using the "default" style do) the reset is merged into its
+        sequence, so that styles such as underlining cannot carry over from the previous format.
         """
-        # TODO
+        if not fmt:
+            return "\033[m"
+        elif not sgr or fmt.startswith("\033[0;"):
+            return fmt
+        else:
+            return f"\033[0;{fmt[2:]}"
+
+    def _compile_elements(self, elements: list[Union[str, dict[tuple[int, int], tuple[str, str]]]]) -> str:
+        """
+        Combine buffered command strings and cell grids into a single string.  Keeps the shared front buffer in sync
+        with the commands being output; must be called while holding `_screen_lock`.
+        """
+        # The terminal dimensions are only kept up to date while they are tracked, which starts with the first frame if
+        # nothing (such as `Screen`) has started it already.
+        System.track_terminal_shape()
+        # If the terminal has been resized, its contents may have been reflowed, so nothing can be assumed to be shown.
+        if Term._front_buffer_size != (terminal_size := System.terminal_size):
+            Term._front_buffer.clear()
+            Term._front_buffer_size = terminal_size
+            Term._front_buffer_generation += 1
+
+        out = []
+        for element in elements:
+            if isinstance(element, dict):
+                out.append(self._compile_buffer(element))
+            else:
+                if element.startswith("\033[2J"):
+                    Term._front_buffer.clear()
+                    Term._front_buffer_generation += 1
+                out.append(element)
+        return "".join(out)
 
     def cursor_hide(self, flush: bool = False) -> None:
         """
@@ -59,7 +202,7 @@ class Term:
         """
         string = "\033[?25l"
         if not flush:
-            self._text_buffer.append(string)
+            self._append(string)
         else:
             self.flush_string(string)
 
@@ -69,7 +212,7 @@ class Term:
         """
         string = "\0338"
         if not flush:
-            self._text_buffer.append(string)
+            self._append(string)
         else:
             self.flush_string(string)
 
@@ -79,7 +222,7 @@ class Term:
         """
         string = f"\033[{line+1};{column+1}H"
         if not flush:
-            self._text_buffer.append(string)
+            self._append(string)
         else:
             self.flush_string(string)
 
@@ -89,7 +232,7 @@ class Term:
         """
         string = "\0337"
         if not flush:
-            self._text_buffer.append(string)
+            self._append(string)
         else:
             self.flush_string(string)
 
@@ -99,48 +242,155 @@ class Term:
         """
         string = "\033[?25h"
         if not flush:
-            self._text_buffer.append(string)
+            self._append(string)
         else:
             self.flush_string(string)
 
-    def flush(self) -> None:
+    @classmethod
+    def _output(cls, string: str) -> None:
         """
-        Flush the entire buffer to the terminal. Remove whatever is flushed from the buffer; if something is appended
-        to the buffer while the flushing occurs, does not remove that element from the buffer.
+        Encode the given string once, and hand it to the terminal's file descriptor in as few system calls as possible,
+        looping only if the operating system accepts part of the output.  Falls back to `sys.stdout.write` if the
+        standard output has no file descriptor (for instance, if it has been redirected to an in-memory stream).  Must
+        only be called by the writer thread, or while holding `_screen_lock` if the writer thread is inactive.
         """
-        with self.__class__._flush_lock:
-            current_buffer_state = self._text_buffer.copy()
-            buffer = self._compile_buffer(self._text_buffer.copy())
-            sys.stdout.write("".join(current_buffer_state))
+        try:
+            fd = sys.stdout.fileno()
+        except (AttributeError, ValueError, io.UnsupportedOperation):
+            fd = None
+
+        if fd is None:
+            sys.stdout.write(string)
+            sys.stdout.flush()
+        elif string:
+            # Anything printed through `sys.stdout` must reach the terminal before the output of this class.
             sys.stdout.flush()
-            for i in range(len(current_buffer_state)):
-                self._text_buffer.pop(0)
+            with memoryview(string.encode(sys.stdout.encoding or "utf-8", "replace")) as view:
+                while view:
+                    view = view[os.write(fd, view) :]
 
-    def flush_string(self, string: str) -> None:
+    @classmethod
+    def _run_writer_thread(cls, frames: queue.Queue) -> None:
         """
-        Write and flushes the given string to the terminal.
+        Output the frames placed in the queue until a `None` is received.  Frames that have accumulated while the
+        previous output was being written are coalesced into a single write.
         """
-        with self.__class__._flush_lock:
-            sys.stdout.write(string)
-            sys.stdout.flush()
+        active = True
+        while active:
+            pending = [frames.get()]
+            while not frames.empty():
+                pending.append(frames.get_nowait())
+            if None in pending:
+                active = False
+                pending = pending[: pending.index(None)]
+            cls._output("".join(pending))
+
+    def _submit(self, elements: list[Union[str, dict[tuple[int, int], tuple[str, str]]]]) -> None:
+        """
+        Compile the given buffer elements into a frame, and either output it directly or hand it to the writer thread.
+        Never waits on the writer thread: if the queue is full (i.e. if the terminal cannot keep up with the frames
+        being drawn), the frames still waiting in it are merged with the new one into a single frame.
+        """
+        with Term._screen_lock:
+            frame = self._compile_elements(elements)
+            if Term._frames is None:
+                self._output(frame)
+            elif frame:
+                try:
+                    Term._frames.put_nowait(frame)
+                except queue.Full:
+                    # Frames are only queued while holding `_screen_lock`, so once the waiting frames have been taken
+                    # out of the queue there is room for the merged frame.  The writer thread may take some of them
+                    # first, but it outputs those before the merged frame, so the order of the frames is kept.
+                    pending = []
+                    while True:
+                        try:
+                            pending.append(Term._frames.get_nowait())
+                        except queue.Empty:
+                            break
+                    pending.append(frame)
+                    Term._frames.put_nowait("".join(pending))
 
-    # def write(self, string: str, flush: bool = False) -> None:
-    #     """
-    #     TODO: Rewrite for buffer compiler
-    #     Write the given `string` wherever the cursor is currently positioned to the buffer (appends to the buffer).
-    #     """
-    #     if not flush:
-    #         self._text_buffer.append(f"{string}")
-    #     else:
-    #         self.flush_string(string)
+    @classmethod
+    def start_writer(cls, max_frames: int = 64) -> None:
+        """
+        Start a dedicated thread that owns all output to the terminal.  Once active, flushing only compiles the buffer
+        and places the resulting frame in a queue of size `max_frames` (merging the waiting frames if it is full), such
+        that slow terminals (e.g. over SSH) do not stall the threads that are drawing to the terminal.  Does nothing if
+        the writer thread is already running.
+        """
+        with cls._screen_lock:
+            if cls._frames is None:
+                Term._frames = queue.Queue(maxsize=max_frames)
+                Term._writer_thread = threading.Thread(target=cls._run_writer_thread, args=(cls._frames,), daemon=True)
+                Term._writer_thread.start()
+                atexit.register(cls.stop_writer)
+
+    @classmethod
+    def stop_writer(cls) -> None:
+        """
+        Output all frames still waiting in the queue, then stop the writer thread and return to writing directly to the
+        terminal when flushing.
+        """
+        with cls._screen_lock:
+            if cls._frames is not None:
+                cls._frames.put(None)
+                cls._writer_thread.join()
+                Term._frames = None
+                Term._writer_thread = None
+                atexit.unregister(cls.stop_writer)
+
+    def flush(self) -> None:
+        """
+        Flush the entire buffer to the terminal.  The buffer is swapped out for an empty one before compiling, such that
+        anything appended to the buffer while the flushing occurs is kept for the next flush.
+        """
+        with self._flush_lock:
+            buffer, self._text_buffer = self._text_buffer, []
+            grid, self._text_buffer_grid = self._text_buffer_grid, {}
+        if grid:
+            buffer.append(grid)
+        self._submit(buffer)
 
-    def write(self, line: int, column: int, string: str, flush: bool = False) -> None:
+    def flush_string(self, string: Union[str, dict[tuple[int, int], tuple[str, str]]]) -> None:
+        """
+        Write and flushes the given string (or grid of cells) to the terminal.
+        """
+        self._submit([string])
+
+    def write(self, line: int, column: int, string: str, flush: bool = False, fmt: str = "") -> None:
         """
         Write the given `string` starting at the designated `line` and `column` coordinates to the buffer.  ANSI uses a
         one-based indexing system, but this class instead uses a zero-based indexing system.
+
+        Argument `fmt` is an optional ANSI escape sequence (such as `"\\033[1;38;2;255;0;0m"`) applied to every
+        character of the string.  Each terminal cell the string takes is stored separately (see `CellWidth.cells`), so
+        writing over the same position more than once before flushing only outputs the last character written there.
+        Strings containing escape sequences cannot be split into cells, and are instead appended to the buffer as they
+        are.
         """
-        if not flush:
-            self._text_buffer.append(f"\x1b[{line+1};{column+1}f{string}")
-            # self._text_buffer_grid[f"line+1 column+1"] = string
+        if "\x1b" in string:
+            # The cells covered by the escape sequence are unknown, so the rest of the line can no longer be trusted.
+            with Term._screen_lock:
+                for position in [i for i in Term._front_buffer if i[0] == line and i[1] >= column]:
+                    del Term._front_buffer[position]
+            string = f"\x1b[{line+1};{column+1}f{fmt}{string}"
+            if not flush:
+                self._append(string)
+            else:
+                self.flush_string(string)
+        elif not flush:
+            cells = CellWidth.cells(string)
+            with self._flush_lock:
+                grid = self._text_buffer_grid
+                if cells:
+                    # Drawing over half of a wide character that is already in the buffer erases the other half, as it
+                    # would on the screen.
+                    if (right := grid.get((line, column))) is not None and right[1] == "":
+                        grid[(line, column - 1)] = (grid.get((line, column - 1), right)[0], " ")
+                    if (right := grid.get((line, column + len(cells)))) is not None and right[1] == "":
+                        grid[(line, column + len(cells))] = (right[0], " ")
+                for n, cell in enumerate(cells):
+                    grid[(line, column + n)] = (fmt, cell)
         else:
-            self.flush_string(f"\x1b[{line+1};{column+1}f{string}")
+            self.flush_string({(line, column + n): (fmt, cell) for n, cell in enumerate(CellWidth.cells(string))})
@@ -0,0 +1,358 @@
+import collections.abc
+
+from typing import Iterable, Iterator, Optional, Union
+
+
+class TextBuffer(collections.abc.MutableSequence):
+    """
+    Mutable sequence of lines of text, designed to be edited in place by `KeyProcessor`.  Behaves like a list of
+    strings (supporting indexing, slicing, slice assignment, deletion, and insertion), but stores its lines in blocks of
+    at most `_block_size` lines, indexed by a Fenwick tree of the block lengths.
+
+    Looking up or replacing a line takes O(log n) time, and inserting or deleting one takes O(log n) time plus a copy
+    within its block -- rather than the O(n) required to rebuild a list of n lines.
+
+    Also keeps track of the range of lines changed since the last call to `pop_changes`, so that whatever displays the
+    lines only needs to update the ones that changed -- and, once `track_edits` is called, of the lines replaced by
+    every edit, so that edits can be undone (see `pop_edits`).
+    """
+
+    # Blocks that grow larger than this are split in two halves, and blocks that shrink below a quarter of this are
+    # merged with a neighbor.
+    _block_size: int = 512
+
+    """CONSTRUCTOR"""
+
+    def __init__(self, lines: Iterable[str] = ("",)):
+        """
+        Create a new TextBuffer containing the given lines.
+        """
+        self._set_lines(list(lines))
+        # Lines changed since the last call to `pop_changes`, as (start, old stop, new stop) -- see `_record_change`.
+        self._changes: Optional[tuple[int, int, int]] = None
+        # Edits made since the last call to `pop_edits`, if tracked -- see `_record_edit`.
+        self._edits: Optional[list[tuple[int, list[str, ...], list[str, ...]], ...]] = None
+
+    """MAGIC METHODS"""
+
+    def __delitem__(self, key: Union[int, slice]) -> None:
+        """
+        Remove the line at the given index, or the lines in the given slice.
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step != 1:
+                lines: list[str, ...] = list(self)
+                del lines[key]
+                self._record_edit(0, self._len, lines)
+                self._record_change(0, self._len, len(lines))
+                self._set_lines(lines)
+            elif start < stop:
+                self._replace(start, stop, [])
+        else:
+            idx: int = self._normalize_index(key)
+            self._replace(idx, idx + 1, [])
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Return True if the given `TextBuffer` or list contains the same lines.
+        """
+        if isinstance(other, (TextBuffer, list)):
+            equal: bool = self._len == len(other) and all(i == j for i, j in zip(self, other))
+        else:
+            equal: bool = NotImplemented
+        return equal
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[str, list[str, ...]]:
+        """
+        Return the line at the given index, or a list of the lines in the given slice.
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step != 1:
+                lines: list[str, ...] = [self[idx] for idx in range(start, stop, step)]
+            else:
+                lines: list[str, ...] = []
+                block, offset = self._locate(start)
+                while len(lines) < stop - start:
+                    lines.extend(self._blocks[block][offset : offset + stop - start - len(lines)])
+                    block, offset = block + 1, 0
+            item: Union[str, list[str, ...]] = lines
+        else:
+            block, offset = self._locate(self._normalize_index(key))
+            item: Union[str, list[str, ...]] = self._blocks[block][offset]
+        return item
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Iterate over all the lines, block by block.
+        """
+        for block in self._blocks:
+            yield from block
+
+    def __len__(self) -> int:
+        """
+        Return the number of lines.
+        """
+        return self._len
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the TextBuffer, in the same format as a list.
+        """
+        return f"TextBuffer({list(self)!r})"
+
+    def __setitem__(self, key: Union[int, slice], value: Union[str, Iterable[str]]) -> None:
+        """
+        Replace the line at the given index, or replace the lines in the given slice with any number of lines.
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._len)
+            if step != 1:
+                lines: list[str, ...] = list(self)
+                lines[key] = value
+                self._record_edit(0, self._len, lines)
+                self._record_change(0, self._len, len(lines))
+                self._set_lines(lines)
+            else:
+                self._replace(start, max(start, stop), list(value))
+        else:
+            idx: int = self._normalize_index(key)
+            block, offset = self._locate(idx)
+            if self._edits is not None:
+                self._record_edit(idx, idx + 1, [value])
+            self._blocks[block][offset] = value
+            self._record_change(idx, idx + 1, idx + 1)
+
+    """PRIVATE METHODS"""
+
+    @staticmethod
+    def _build_tree(sizes: list[int, ...]) -> list[int, ...]:
+        """
+        Build a Fenwick tree from the given sizes, such that the sum of the first n sizes can be found, and any one size
+        updated, in O(log n) time.  Index zero of the tree is unused.
+        """
+        tree: list[int, ...] = [0] + sizes
+        for node in range(1, len(tree)):
+            if (parent := node + (node & -node)) < len(tree):
+                tree[parent] += tree[node]
+        return tree
+
+    @staticmethod
+    def _descend_tree(tree: list[int, ...], step: int, value: int) -> tuple[int, int]:
+        """
+        Find the number of leading sizes in the Fenwick tree whose sum does not exceed `value`, and return it along with
+        the remainder of `value`.  `step` must be the largest power of two not exceeding the number of sizes.
+        """
+        node: int = 0
+        while step > 0:
+            if node + step < len(tree) and tree[node + step] <= value:
+                node += step
+                value -= tree[node]
+            step //= 2
+        return node, value
+
+    @staticmethod
+    def _sum_tree(tree: list[int, ...], idx: int) -> int:
+        """
+        Return the sum of the first `idx` sizes in the Fenwick tree.
+        """
+        total: int = 0
+        while idx > 0:
+            total += tree[idx]
+            idx -= idx & -idx
+        return total
+
+    @staticmethod
+    def _update_tree(tree: list[int, ...], idx: int, delta: int) -> None:
+        """
+        Add `delta` to size `idx` in the Fenwick tree.
+        """
+        node: int = idx + 1
+        while node < len(tree):
+            tree[node] += delta
+            node += node & -node
+
+    def _locate(self, idx: int) -> tuple[int, int]:
+        """
+        Return the block containing the line at index `idx`, and the offset of the line within that block.  An index
+        equal to the number of lines locates the end of the last block.
+        """
+        block, offset = self._descend_tree(self._index, self._index_step, idx)
+        if block == len(self._blocks):
+            block -= 1
+            offset: int = len(self._blocks[block])
+        return block, offset
+
+    def _merge_block(self, block: int) -> None:
+        """
+        Merge an undersized block into its smaller neighbor, splitting the result if it grows too large.
+        """
+        blocks: list[list[str, ...], ...] = self._blocks
+        if block == 0 or (block + 1 < len(blocks) and len(blocks[block + 1]) < len(blocks[block - 1])):
+            neighbor: int = block + 1
+        else:
+            neighbor: int = block - 1
+        first: int = min(block, neighbor)
+        self._blocks[first : first + 2] = [self._blocks[first] + self._blocks[first + 1]]
+        if len(self._blocks[first]) > self._block_size:
+            self._split_block(first)
+        else:
+            self._rebuild_index()
+
+    def _normalize_index(self, idx: int) -> int:
+        """
+        Convert a possibly negative index into a positive one, raising an IndexError if it is out of range.
+        """
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError("TextBuffer index out of range")
+        return idx
+
+    def _rebalance(self, block: int, delta: int) -> None:
+        """
+        Update the index after the given block changed length by `delta` lines, splitting the block if it has grown too
+        large, or merging it with a neighbor if it has shrunk too small.
+        """
+        if len(self._blocks[block]) > self._block_size:
+            self._split_block(block)
+        elif len(self._blocks[block]) < self._block_size // 4 and len(self._blocks) > 1:
+            self._merge_block(block)
+        else:
+            self._update_index(block, delta)
+
+    def _rebuild_index(self) -> None:
+        """
+        Rebuild the Fenwick tree of block lengths from scratch -- required whenever blocks are added or removed.
+        """
+        self._index: list[int, ...] = self._build_tree([len(block) for block in self._blocks])
+        # The largest power of two not exceeding the number of blocks, used to descend the tree in `_locate`.
+        self._index_step: int = 1 << (len(self._blocks).bit_length() - 1)
+
+    def _record_change(self, start: int, old_stop: int, new_stop: int) -> None:
+        """
+        Record that the lines in range [start, old_stop) were replaced by the lines now in range [start, new_stop),
+        merging the change with those recorded since the last call to `pop_changes` into a single range.
+        """
+        if self._changes is None:
+            self._changes: Optional[tuple[int, int, int]] = (start, old_stop, new_stop)
+        else:
+            changed_start, changed_old_stop, changed_new_stop = self._changes
+            # The end of the merged range, before this change is applied.
+            stop: int = max(changed_new_stop, old_stop)
+            self._changes: Optional[tuple[int, int, int]] = (
+                min(changed_start, start),
+                changed_old_stop + stop - changed_new_stop,
+                stop + new_stop - old_stop,
+            )
+
+    def _record_edit(self, start: int, stop: int, lines: list[str, ...]) -> None:
+        """
+        If edits are tracked, record that the lines in range [start, stop) are about to be replaced by the given lines.
+        Edits that insert or remove whole lines are widened to include a neighboring line, such that every recorded
+        edit replaces at least one line with at least one line -- and can therefore be expressed as the replacement of
+        a span of characters.
+        """
+        if self._edits is not None:
+            old_lines: list[str, ...] = self[start:stop]
+            if not old_lines or not lines:
+                if start > 0:
+                    start -= 1
+                    old_lines: list[str, ...] = [self[start]] + old_lines
+                    lines: list[str, ...] = [old_lines[0]] + lines
+                elif stop < self._len:
+                    old_lines.append(self[stop])
+                    lines: list[str, ...] = lines + [self[stop]]
+            self._edits.append((start, old_lines, list(lines)))
+
+    def _replace(self, start: int, stop: int, lines: list[str, ...]) -> None:
+        """
+        Replace the lines in range [start, stop) with the given lines.  Edits within a single block only update the
+        index, while edits spanning several blocks splice them together and rebuild it.
+        """
+        if self._edits is not None:
+            self._record_edit(start, stop, lines)
+        self._record_change(start, stop, start + len(lines))
+        block, offset = self._locate(start)
+        self._len += len(lines) - (stop - start)
+        if offset + stop - start <= len(self._blocks[block]):
+            self._blocks[block][offset : offset + stop - start] = lines
+            self._rebalance(block, len(lines) - (stop - start))
+        else:
+            last, last_offset = self._locate(stop)
+            spliced: list[str, ...] = self._blocks[block][:offset] + lines + self._blocks[last][last_offset:]
+            self._blocks[block : last + 1] = [spliced] if spliced else []
+            if not self._blocks:
+                self._blocks.append([])
+            self._rebuild_index()
+            self._rebalance(min(block, len(self._blocks) - 1), 0)
+
+    def _set_lines(self, lines: list[str, ...]) -> None:
+        """
+        Replace all the lines, filling blocks halfway so that they have room to grow before being split.
+        """
+        size: int = self._block_size // 2
+        blocks: list[list[str, ...], ...] = [lines[idx : idx + size] for idx in range(0, len(lines), size)]
+        self._blocks: list[list[str, ...], ...] = blocks or [[]]
+        self._len: int = len(lines)
+        self._rebuild_index()
+
+    def _split_block(self, block: int) -> None:
+        """
+        Split an oversized block into blocks filled halfway.
+        """
+        lines: list[str, ...] = self._blocks[block]
+        size: int = self._block_size // 2
+        self._blocks[block : block + 1] = [lines[idx : idx + size] for idx in range(0, len(lines), size)]
+        self._rebuild_index()
+
+    def _update_index(self, block: int, delta: int) -> None:
+        """
+        Add `delta` to the length of the given block in the Fenwick tree.
+        """
+        self._update_tree(self._index, block, delta)
+
+    """PUBLIC METHODS"""
+
+    def copy(self) -> "TextBuffer":
+        """
+        Return a shallow copy of the TextBuffer.
+        """
+        return TextBuffer(self)
+
+    def pop_changes(self) -> Optional[tuple[int, int, int]]:
+        """
+        Return the range of lines changed since the last call, as (start, old stop, new stop): the lines that were in
+        range [start, old stop) have been replaced by those now in range [start, new stop).  Returns None if no lines
+        have changed.
+        """
+        changes, self._changes = self._changes, None
+        return changes
+
+    def pop_edits(self) -> list[tuple[int, list[str, ...], list[str, ...]], ...]:
+        """
+        Return the edits made since the last call (or since `track_edits` was called), in the order they were made, as
+        (start, old lines, new lines): the lines that were in range [start, start + len(old lines)) were replaced by the
+        new lines.  Every edit replaces at least one line with at least one line, unless the TextBuffer was empty.
+        """
+        edits: list[tuple[int, list[str, ...], list[str, ...]], ...] = self._edits or []
+        if self._edits is not None:
+            self._edits: Optional[list[tuple[int, list[str, ...], list[str, ...]], ...]] = []
+        return edits
+
+    def track_edits(self, state: bool = True) -> None:
+        """
+        Start recording the lines replaced by every edit, to be collected by `pop_edits` -- or stop, if `state` is set
+        to False.  Not tracked by default, since it requires copying the lines that each edit replaces.
+        """
+        self._edits: Optional[list[tuple[int, list[str, ...], list[str, ...]], ...]] = [] if state else None
+
+    def insert(self, idx: int, line: str) -> None:
+        """
+        Insert a line before the given index.
+        """
+        if idx < 0:
+            idx: int = max(idx + self._len, 0)
+        idx: int = min(idx, self._len)
+        self._replace(idx, idx, [line])
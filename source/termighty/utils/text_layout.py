@@ -0,0 +1,123 @@
+from termighty.utils.cell_width import CellWidth
+from termighty.utils.text_buffer import TextBuffer
+
+import collections
+import itertools
+
+from typing import Callable, Iterable, Sequence, Union
+
+
+class TextLayout(TextBuffer):
+    """
+    The shape of a text, as laid out within a `TextBox`: item `n` is the tuple of the widths (in terminal cells, see
+    `CellWidth`) of the display rows that line `n` of the text is wrapped onto.  Since the layout is kept per line, an
+    edit to the text only requires laying out the lines it changed again (see `update`), rather than the whole text.
+
+    The rows themselves are not stored -- only the lines in view are wrapped again when drawn -- so the layout takes
+    O(n) integers for n lines of text, however long they are.  Also keeps track of the total number of display rows and
+    the width of the widest one, and finds the line displayed on any given row in O(log n) time, by indexing the number
+    of rows in each block with a second Fenwick tree.
+    """
+
+    """CONSTRUCTOR"""
+
+    def __init__(self, text: Iterable[str], wrap: Callable[[str], tuple[str, ...]]):
+        """
+        Lay out the given lines of text, using the callable `wrap` to split each one into display rows.
+        """
+        self._wrap: Callable[[str], tuple[str, ...]] = wrap
+        # Number of display rows of each width, used to keep track of the width of the widest row.
+        self._widths: collections.Counter = collections.Counter()
+        self._width: int = 0
+        super().__init__(self._layout_lines(text))
+
+    """MAGIC METHODS"""
+
+    def __setitem__(self, key: Union[int, slice], value: Union[tuple[int, ...], Iterable[tuple[int, ...]]]) -> None:
+        """
+        Replace the row widths of a line, or of the lines in the given slice, keeping the row index up to date.
+        """
+        super().__setitem__(key, value)
+        if not isinstance(key, slice):
+            block, _ = self._locate(self._normalize_index(key))
+            self._update_index(block, 0)
+
+    """PRIVATE METHODS"""
+
+    def _layout_lines(self, lines: Iterable[str]) -> list[tuple[int, ...], ...]:
+        """
+        Split the given lines into display rows, and count the widths of the new rows.
+        """
+        layout: list[tuple[int, ...], ...] = [
+            # The width of ASCII rows is their length, which is faster to find.
+            tuple(map(len if all(map(str.isascii, rows)) else CellWidth.string_width, rows))
+            for rows in map(self._wrap, lines)
+        ]
+        self._widths.update(itertools.chain.from_iterable(layout))
+        if self._widths:
+            self._width: int = max(self._width, max(self._widths))
+        return layout
+
+    def _rebuild_index(self) -> None:
+        """
+        Rebuild the Fenwick trees of block lengths and of the number of display rows in each block.
+        """
+        super()._rebuild_index()
+        self._block_rows: list[int, ...] = [sum(map(len, block)) for block in self._blocks]
+        self._row_index: list[int, ...] = self._build_tree(list(self._block_rows))
+        self._rows: int = sum(self._block_rows)
+
+    def _update_index(self, block: int, delta: int) -> None:
+        """
+        Update the Fenwick trees after the lines in the given block changed, and their number changed by `delta`.
+        """
+        super()._update_index(block, delta)
+        rows: int = sum(map(len, self._blocks[block]))
+        if (difference := rows - self._block_rows[block]) != 0:
+            self._block_rows[block] = rows
+            self._update_tree(self._row_index, block, difference)
+            self._rows += difference
+
+    """PUBLIC METHODS"""
+
+    @property
+    def rows(self) -> int:
+        """
+        Return the total number of display rows.
+        """
+        return self._rows
+
+    @property
+    def width(self) -> int:
+        """
+        Return the width of the widest display row.
+        """
+        return self._width
+
+    def locate_row(self, row: int) -> tuple[int, int]:
+        """
+        Return the index of the line displayed on the given row, and the index of that row among the rows of the line.
+        A row past the last one locates the end of the text.
+        """
+        block, row = self._descend_tree(self._row_index, self._index_step, max(row, 0))
+        line: int = self._sum_tree(self._index, block)
+        if block < len(self._blocks):
+            # Skip the lines in the block that end before the given row.
+            for widths in self._blocks[block]:
+                if row < len(widths):
+                    break
+                row -= len(widths)
+                line += 1
+        return line, row
+
+    def update(self, text: Sequence[str], start: int, old_stop: int, new_stop: int) -> None:
+        """
+        Lay out the lines of the text again after the lines in range [start, old_stop) were replaced by those now in
+        range [start, new_stop) -- as given by `TextBuffer.pop_changes`.
+        """
+        self._widths.subtract(itertools.chain.from_iterable(self[start:old_stop]))
+        self[start:old_stop] = self._layout_lines(text[start:new_stop])
+        # If the widest rows were removed, find the new widest row.
+        if self._widths[self._width] <= 0:
+            self._widths = +self._widths
+            self._width: int = max(self._widths, default=0)
@@ -1,2 +1,29 @@
-from .text_box import TextBox
-from .text_editor import TextEditor
+import importlib
+
+# The public names of the subpackage, mapped to the module that defines them.  Modules are only imported the first
+# time one of their names is accessed, so that importing the subpackage only loads what is used.
+_names: dict[str, str] = {
+    "Screen": "screen",
+    "TextBox": "text_box",
+    "TextEditor": "text_editor",
+}
+
+__all__: list[str, ...] = list(_names)
+
+
+def __getattr__(name: str):
+    """
+    Import the module that defines the given name the first time it is accessed.
+    """
+    if name not in _names:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_names[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str, ...]:
+    """
+    List the names of the subpackage, including those that have not been imported yet.
+    """
+    return sorted(set(globals()) | set(__all__))
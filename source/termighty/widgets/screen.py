@@ -0,0 +1,213 @@
+from termighty.settings.config import Config
+from termighty.settings.lazy_attribute import LazyAttribute
+from termighty.settings.system import System
+
+import asyncio
+import threading
+import time
+
+from typing import Optional
+
+
+class Screen:
+    """
+    Central render scheduler shared by all widgets.  Widgets register themselves when started, and mark themselves as
+    dirty whenever their contents or view change; a single thread then redraws only the dirty widgets, at most
+    `frame_rate` times per second, and sleeps while nothing has changed -- it is only woken up by widgets becoming
+    dirty, terminal resizes, `stop`, and `System.kill_all` being set.
+
+    The render loop runs either on its own thread (see `start`) or as a task in an asyncio event loop (see
+    `start_async`).  Only one `Screen` may be active at once, so all of its state is kept in class attributes.
+    """
+
+    _active: bool = False
+    _condition: threading.Condition = threading.Condition()
+    # Registered widgets, and the subset of them that must be redrawn on the next frame (dicts preserve draw order).
+    _widgets: dict = {}
+    _dirty: dict = {}
+
+    @LazyAttribute
+    def _frame_rate(cls) -> int:
+        """
+        The maximum number of frames drawn per second, as given in `config.ini` (read on first use) unless set by
+        `start` or `start_async`.
+        """
+        return Config.frame_rate
+
+    # The terminal dimensions the widgets were last laid out for (set when the screen is activated).
+    _terminal_size: Optional[tuple[int, int]] = None
+    _thread: Optional[threading.Thread] = None
+    # The asyncio event loop running the render task (if started by `start_async`), and the event it waits on.
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _async_event: Optional[asyncio.Event] = None
+    _task: Optional[asyncio.Task] = None
+
+    """PRIVATE METHODS"""
+
+    @classmethod
+    def _on_resize(cls, terminal_size: tuple[int, int]) -> None:
+        """
+        Subscribed to `System` while the screen is active: wake up the render loop once the terminal has been resized,
+        such that every widget is resized and redrawn in a single frame.
+        """
+        cls._wake()
+
+    @classmethod
+    def _render(cls, widgets: list) -> None:
+        """
+        Redraw the given widgets.  If the terminal has changed shape since the last frame, every registered widget is
+        resized and redrawn instead.
+        """
+        if cls._terminal_size != (terminal_size := System.terminal_size):
+            cls._terminal_size: tuple[int, int] = terminal_size
+            with cls._condition:
+                widgets = list(cls._widgets)
+            for widget in widgets:
+                widget._resize(terminal_size)
+
+        for widget in widgets:
+            widget.write()
+
+    @classmethod
+    async def _run_async(cls) -> None:
+        """
+        Coroutine equivalent of `_run_thread`, which awaits dirty widgets without blocking the event loop.
+        """
+        next_frame: float = time.monotonic()
+        while cls._active and not System.kill_all:
+            await cls._async_event.wait()
+            cls._async_event.clear()
+
+            if (dirty := cls._take_dirty()) or cls._terminal_size != System.terminal_size:
+                if (delay := next_frame - time.monotonic()) > 0:
+                    await asyncio.sleep(delay)
+                next_frame: float = time.monotonic() + 1 / cls._frame_rate
+                cls._render(dirty)
+
+    @classmethod
+    def _run_thread(cls) -> None:
+        """
+        Wait until at least one widget is dirty, then redraw the dirty widgets -- waiting first if necessary, such that
+        frames are never drawn more frequently than the frame rate allows.
+        """
+        next_frame: float = time.monotonic()
+        while cls._active and not System.kill_all:
+            # Everything that wakes up the render thread is checked while holding `_condition`, and notifies it while
+            # holding `_condition` after the change, so no wake-up can be missed.
+            with cls._condition:
+                idle: bool = not cls._dirty and cls._terminal_size == System.terminal_size
+                if idle and cls._active and not System.kill_all:
+                    cls._condition.wait()
+
+            if (dirty := cls._take_dirty()) or cls._terminal_size != System.terminal_size:
+                if (delay := next_frame - time.monotonic()) > 0:
+                    time.sleep(delay)
+                next_frame: float = time.monotonic() + 1 / cls._frame_rate
+                cls._render(dirty)
+
+    @classmethod
+    def _wake(cls) -> None:
+        """
+        Wake up the render loop, whether it runs on its own thread or as an asyncio task.  Also subscribed to `System`
+        while the screen is active, such that setting `System.kill_all` stops the render loop immediately.
+        """
+        with cls._condition:
+            cls._condition.notify()
+        if (loop := cls._loop) is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(cls._async_event.set)
+
+    @classmethod
+    def _take_dirty(cls) -> list:
+        """
+        Return the widgets that are currently dirty, and mark them as clean.
+        """
+        with cls._condition:
+            dirty: list = list(cls._dirty)
+            cls._dirty.clear()
+        return dirty
+
+    """PUBLIC METHODS"""
+
+    @classmethod
+    def mark_dirty(cls, widget) -> None:
+        """
+        Schedule the given widget to be redrawn on the next frame.  Has no effect if the widget is not registered.
+        """
+        with cls._condition:
+            if widget in cls._widgets:
+                cls._dirty[widget] = None
+                cls._condition.notify()
+        if (loop := cls._loop) is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(cls._async_event.set)
+
+    @classmethod
+    def register(cls, widget) -> None:
+        """
+        Add a widget to the screen, and schedule it to be drawn on the next frame.
+        """
+        with cls._condition:
+            cls._widgets[widget] = None
+        cls.mark_dirty(widget)
+
+    @classmethod
+    def start(cls, frame_rate: Optional[int] = None) -> None:
+        """
+        Activate the render thread, if it is not already running.  The maximum number of frames per second defaults to
+        the value given in `config.ini`.
+        """
+        if frame_rate is not None:
+            cls._frame_rate: int = frame_rate
+        if not cls._active:
+            cls._active: bool = True
+            cls._terminal_size: tuple[int, int] = System.terminal_size
+            System.subscribe(cls._on_resize)
+            System.subscribe_kill(cls._wake)
+            cls._thread: threading.Thread = threading.Thread(target=cls._run_thread, daemon=False)
+            cls._thread.start()
+
+    @classmethod
+    def start_async(cls, frame_rate: Optional[int] = None) -> asyncio.Task:
+        """
+        Activate the render loop as a task in the running asyncio event loop instead of on its own thread, and return
+        the task.  Widgets started afterwards are drawn by this task.  Must be called from within a coroutine.
+        """
+        if frame_rate is not None:
+            cls._frame_rate: int = frame_rate
+        if not cls._active:
+            cls._active: bool = True
+            cls._terminal_size: tuple[int, int] = System.terminal_size
+            cls._async_event: asyncio.Event = asyncio.Event()
+            cls._loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            cls._task: asyncio.Task = cls._loop.create_task(cls._run_async())
+            System.subscribe(cls._on_resize)
+            System.subscribe_kill(cls._wake)
+        return cls._task
+
+    @classmethod
+    def stop(cls) -> None:
+        """
+        Deactivate the render thread, and wait for the frame currently being drawn to finish.
+        """
+        System.unsubscribe(cls._on_resize)
+        System.unsubscribe_kill(cls._wake)
+        with cls._condition:
+            cls._active: bool = False
+            cls._condition.notify()
+        if cls._loop is not None:
+            if not cls._loop.is_closed():
+                cls._loop.call_soon_threadsafe(cls._async_event.set)
+            cls._loop = None
+        elif cls._thread is not None and cls._thread is not threading.current_thread():
+            cls._thread.join()
+
+    @classmethod
+    def unregister(cls, widget) -> None:
+        """
+        Remove a widget from the screen; it will no longer be redrawn.  Stops the render thread once no widgets remain.
+        """
+        with cls._condition:
+            cls._widgets.pop(widget, None)
+            cls._dirty.pop(widget, None)
+            empty: bool = not cls._widgets
+        if empty:
+            cls.stop()
@@ -1,15 +1,15 @@
 import collections.abc
-import numpy as np
 
 from termighty.obj.color import Color
 from termighty.settings.config import Config
 from termighty.settings.data import Data
 from termighty.settings.system import System
+from termighty.utils.cell_width import CellWidth
+from termighty.utils.line_wrapper import LineWrapper
 from termighty.utils.term import Term
-
-import threading
-import time
-from textwrap import TextWrapper
+from termighty.utils.text_buffer import TextBuffer
+from termighty.utils.text_layout import TextLayout
+from termighty.widgets.screen import Screen
 
 from typing import Optional, Union, Literal
 
@@ -41,8 +41,8 @@ class TextBox:
     ):
         """
         Return a new instance of class `TextBox` at the specified coordinates.  If negative coordinates are given, they
-        will be set dynamically relative to the size of the terminal; a thread will loop in the background keeping
-        track of the terminal dimensions and resizing the TextBox if its coordinates are dynamic.
+        will be set dynamically relative to the size of the terminal; once started, the TextBox is resized by the
+        `Screen` render scheduler whenever the terminal dimensions change.
         """
         # Create a new instance of class Term, which is used to perform writing and cursor operations to the terminal.
         self._term: Term = Term()
@@ -68,8 +68,9 @@ class TextBox:
         self._init_color_attributes(background=background, foreground=foreground, style=style)
 
         self._active: bool = False
-        self._view_changed: bool = False
         self._text: list[str, ...] = None  # [""]
+        # The display rows of each line of text, laid out by `_process_text`.
+        self._layout: Optional[TextLayout] = None
 
         # Whether the text should wrap to the next line if a line exceeds the width of the underlying TextBox.
         self._wrap_text: bool = wrap_text
@@ -80,69 +81,47 @@ class TextBox:
 
     """MAGIC METHODS"""
 
-    def __call__(self, text: Union[str, list[str, ...]]) -> None:
+    def __call__(self, text: Union[str, list[str, ...], TextBuffer]) -> None:
         """
         Modify the current state of the TextBox by replacing its contents with the given text. Accepts a single string,
         or a list of strings -- if a list is given, will place each element in its own row within the TextBox.
 
+        If called again with the same `TextBuffer` after editing it in place, only the lines that changed are laid out
+        again.
+
         Does not support the use of strings containing ANSI escape sequences!
         """
         if isinstance(text, str):
             text: list[str, ...] = [text]
-        elif not isinstance(text, list) and any(not isinstance(i, str) for i in text):
+        elif not isinstance(text, (list, TextBuffer)) and any(not isinstance(i, str) for i in text):
             error_message: str = (
                 f"\n\nArgument `text` in calling of {self._type} instance must be a list containing <class 'str'>."
             )
             System.kill_all = True
             raise TypeError(error_message)
 
-        self._text: list[str, ...] = text
-        self._process_text()
+        if text is self._text and isinstance(text, TextBuffer) and self._layout is not None:
+            if (changes := text.pop_changes()) is not None:
+                self._layout.update(text, *changes)
+        else:
+            self._text: list[str, ...] = text
+            self._process_text()
         self._set_view()
 
     def _process_text(self):
         """
-        Justify the raw text given to the __call__ method such that all lines of text are equally-sized, and wide enough
-        to allow for the view of the text to be moved left, right, up, and down, until the text is just out of view.
+        Lay out the raw text given to the __call__ method as display rows, wrapping each line to the width of the
+        TextBox if text wrapping is enabled.  Only the widths of the rows are kept (per line, in a `TextLayout`), so
+        that when the text is a `TextBuffer` edited in place, only the lines that changed need to be laid out again
+        (see `__call__`).
 
-        Takes the `self._alignment` attribute into account, aligning the text either to the left, right, or center of
-        the TextBox.
+        The rows themselves are produced by `_rows_in_view`, and aligned and padded by `_set_view`, for the rows in view
+        only.
         """
-        if self._wrap_text:
-            self._new_line: list[bool, ...] = [
-                i == 0 for row in self._text for i in range(len(self._text_wrapper.wrap(row)))
-            ]
-            text: list[str, ...] = [line.strip() for row in self._text for line in self._text_wrapper.wrap(row)]
-        else:
-            self._new_line: list[bool] = [True for i in range(self._shape[0])]
-            text: list[str, ...] = self._text
-
-        rows: int = len(text)
-        cols: int = max(len(row) for row in text) if len(text) > 0 else 0
-
-        if self._alignment == "left":
-            pad_char: str = "<"
-        elif self._alignment == "right":
-            pad_char: str = ">"
-        elif self._alignment == "center":
-            pad_char: str = "^"
-
-        vertical_pad: list[str, ...] = [" " * (cols + 2 * self._shape[1])] * self._shape[0]
-        text: list[str, ...] = [f"{line:{pad_char}{self._shape[1]}s}" for line in text]
-        text: list[str, ...] = [line.ljust(cols + self._shape[1]) for line in text]
-        text: list[str, ...] = [line.rjust(cols + 2 * self._shape[1]) for line in text]
-        text: list[str, ...] = vertical_pad + text + vertical_pad
-
-        vertical_pad: list[str, ...] = [False] * self._shape[0]
-        new_line: list[str, ...] = vertical_pad + self._new_line + vertical_pad
-
-        dimensions: tuple[int, int] = (2 * self._shape[0] + rows, 2 * self._shape[1] + cols)
-
-        self._text_grid: np.ndarray = np.zeros(dimensions, dtype="<U1")
-        self._text_grid: np.ndarray = np.array([list(row) for row in text])
-        self._new_line_grid: np.npdarray = np.array(new_line)
-        self._text_shape: tuple[int, int] = self._text_grid.shape
-        self._text_size: int = self._text_grid.size
+        if isinstance(self._text, TextBuffer):
+            # The layout is built from the current text, so any previously recorded changes are already accounted for.
+            self._text.pop_changes()
+        self._layout: TextLayout = TextLayout(self._text, self._wrap_line)
 
     """PRIVATE METHODS"""
 
@@ -194,10 +173,20 @@ class TextBox:
         self._terminal_size: tuple[int, int] = System.terminal_size
 
         self._origin: tuple[int, int] = view
-        self._current_output: list[str, ...] = None
+
+    def _wrap_line(self, line: str) -> tuple[str, ...]:
+        """
+        Split a single line of text into the display rows it occupies -- several if text wrapping is enabled and the
+        line is wider than the TextBox.  Always returns at least one row, so that empty lines remain visible.
+        """
+        if self._wrap_text:
+            rows: tuple[str, ...] = self._text_wrapper.wrap(line)
+        else:
+            rows: tuple[str, ...] = (line,)
+        return rows
 
     def _process_text_wrapper(self):
-        self._text_wrapper = TextWrapper(
+        self._text_wrapper: LineWrapper = LineWrapper(
             width=self._shape[1],
             subsequent_indent=self._wrap_subsequent_indent,
             break_on_hyphens=self._wrap_text_break_on_hyphens,
@@ -277,29 +266,31 @@ class TextBox:
 
         return *args, style
 
-    def _run_thread(self, dt: float) -> None:
+    def _resize(self, terminal_size: tuple[int, int]) -> None:
         """
-        Keep updating the window every `dt` seconds, and account for changes in the terminal size (useful when dealing
-        with relative coordinates on initialization).
+        Reformat the contents of the TextBox due to a change in terminal dimensions (useful when dealing with relative
+        coordinates on initialization).  Called by the `Screen` render scheduler.
         """
-        self._active: bool = True
-        while self._active and not System.kill_all:
-            # Reformat the contents of the TextBox due to a change in terminal dimensions.
-            if self._terminal_size != (terminal_size := System.terminal_size):
-                self._terminal_size: tuple[int, int] = terminal_size
-                # Repeat the reset process three times in order to account for lag in the terminal as it is resized.
-                # Two iterations usually is enough, but three seems to always prevent issues.
-                for i in range(3):
-                    time.sleep(0.01)
-                    self._process_text_wrapper()
-                    self._set_shape()
-                    self._set_view()
-                    self._process_text()
-
-            if self._view_changed:
-                self._view_changed: bool = False
-                self.write()
-            time.sleep(dt)
+        self._terminal_size: tuple[int, int] = terminal_size
+        self._set_shape()
+        self._process_text_wrapper()
+        self._process_text()
+        self._set_view()
+
+    def _rows_in_view(self, row: int, count: int) -> list[str, ...]:
+        """
+        Return `count` display rows of the text starting at the given row (or fewer, if the text ends first), wrapping
+        only the lines they belong to.
+        """
+        rows: list[str, ...] = []
+        line, skip = self._layout.locate_row(row)
+        # Every line occupies at least one row, so no more than `count` lines are needed.
+        for text in self._text[line : line + max(count, 0)]:
+            rows.extend(self._wrap_line(text)[skip:])
+            skip: int = 0
+            if len(rows) >= count:
+                break
+        return rows[: max(count, 0)]
 
     def _set_shape(self) -> None:
         """
@@ -323,12 +314,48 @@ class TextBox:
         """
         Backend for method `set_view` -- limits the view to prevent out of bounds errors by using commands `min` and
         `max` with the TextBox dimensions.
+
+        The text is treated as if it were aligned and padded by the TextBox dimensions on all sides, such that the view
+        can be moved until the text is just out of view -- but only the rows and columns in view are ever built.  Rows
+        and columns are counted in terminal cells (see `CellWidth`), such that every row in view is exactly as wide as
+        the TextBox, whatever wide characters or combining marks it contains.
         """
+        if self._alignment == "left":
+            pad_char: str = "<"
+        elif self._alignment == "right":
+            pad_char: str = ">"
+        elif self._alignment == "center":
+            pad_char: str = "^"
+
+        # Dimensions of the padded text.
+        self._text_shape: tuple[int, int] = (
+            2 * self._shape[0] + self._layout.rows,
+            2 * self._shape[1] + self._layout.width,
+        )
+
         row: int = max(min(self._origin[0] + self._shape[0], self._text_shape[0]), 0)
         col: int = max(min(self._origin[1] + self._shape[1], self._text_shape[1]), 0)
 
-        self._view: np.ndarray = self._text_grid[row : row + self._shape[0], col : col + self._shape[1]]
-        self._view_changed: bool = True
+        # Range of columns in view, relative to the start of the aligned text (negative within the left padding).
+        start: int = col - self._shape[1]
+        stop: int = min(col + self._shape[1], self._text_shape[1]) - self._shape[1]
+        left_pad: int = max(0, min(stop, 0) - start)
+
+        # Range of display rows in view, excluding the padding above and below the text.
+        first: int = max(row - self._shape[0], 0)
+        last: int = min(row + self._shape[0], self._text_shape[0] - self._shape[0]) - self._shape[0]
+
+        view: list[str, ...] = [" " * (stop - start)] * (min(first + self._shape[0], row + self._shape[0]) - row)
+        for line in self._rows_in_view(first, last - first):
+            if (width := CellWidth.string_width(line)) < self._shape[1]:
+                # Padded by the number of cells missing, rather than to a number of characters.
+                line: str = f"{line:{pad_char}{self._shape[1] - width + len(line)}s}"
+            view.append(" " * left_pad + CellWidth.slice(line, max(start, 0), max(stop, 0)))
+        view.extend([" " * (stop - start)] * (min(row + self._shape[0], self._text_shape[0]) - row - len(view)))
+
+        self._view: list[str, ...] = view
+        # Schedule the TextBox to be redrawn on the next frame (has no effect unless the TextBox has been started).
+        Screen.mark_dirty(self)
 
     """PUBLIC METHODS"""
 
@@ -354,21 +381,23 @@ class TextBox:
 
         self._alignment: str = mode
 
-    def start(self, dt: float = 0.005):
+    def start(self) -> None:
         """
-        Activate a thread that runs the method self._run_thread.
+        Register the TextBox with the `Screen` render scheduler (starting it if necessary), which redraws the TextBox
+        whenever its contents or view change.
         """
         if self._text is None:
             self.__call__([""])
-        self._thread: threading.Thread = threading.Thread(target=self._run_thread, args=(dt,), daemon=False)
-        self._thread.start()
+        self._active: bool = True
+        Screen.register(self)
+        Screen.start()
 
     def stop(self) -> None:
         """
-        Kill the active thread.
+        Unregister the TextBox from the `Screen` render scheduler; it will no longer be redrawn.
         """
         self._active: bool = False
-        self._thread.join()
+        Screen.unregister(self)
 
     def set_view(self, row: Optional[int] = 0, col: Optional[int] = 0) -> None:
         """
@@ -397,13 +426,9 @@ class TextBox:
         # Iterate through each row of the text.
         for m, line in enumerate(self._view):
             row: int = self._row_start + m
-            # Iterate through each column in the current row of the text.
-            for n, char in enumerate(line):
-                col: int = self._col_start + n
-                char: str = f"{self._ANSI_format}{char}\033[m"
-                # Write to the buffer, without flushing to the terminal.
-                self._term.write(row, col, char, flush=False)
+            # Write to the buffer, without flushing to the terminal.
+            self._term.write(row, self._col_start, line, flush=False, fmt=self._ANSI_format)
         # Restoring the cursor position.
         self._term.cursor_load()
-        # Flushing the results to the terminal.  Waiting to flush improves efficienty significantly.
+        # Flushing the results to the terminal -- only the cells that changed since the last frame are output.
         self._term.flush()
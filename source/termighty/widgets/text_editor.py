@@ -1,17 +1,16 @@
-import numpy as np
-
 from termighty.obj.color import Color
 from termighty.settings.config import Config
 from termighty.settings.data import Data
+from termighty.settings.system import System
 from termighty.utils.listener import Listener
-from termighty.utils import KeyProcessor
+from termighty.utils.term import Term
+from termighty.utils import CellWidth, EditHistory, KeyProcessor, LineWrapper, Search, Selection, TextBuffer
 from termighty.widgets.text_box import TextBox
 
-import textwrap
+import asyncio
 import threading
-from textwrap import TextWrapper
 
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 
 class TextEditor(TextBox):
@@ -23,9 +22,16 @@ class TextEditor(TextBox):
     * Ctrl-arrow key to move the cursor to the beginning/end of words,
     * Alt-arrow to select text,
     * Deletion of selected text,
-    * Copying & pasting of selected text.
+    * Copying & pasting of selected text,
+    * Undoing and redoing edits with Ctrl-z and Ctrl-y,
+    * Searching for text or regular expressions, with F3 and Ctrl-F3 to jump to the next or previous match.
     """
 
+    # Maximum number of formatted line numbers memoized per gutter width, after which they are cleared.
+    _gutter_cache_size: int = 4096
+    # Maximum number of lines searched for a match each time the query of an incremental search changes (see `search`).
+    _search_window: int = 1024
+
     def __init__(
         self,
         row_start: int,
@@ -53,6 +59,9 @@ class TextEditor(TextBox):
         Creates an instance of TextEditor, and initializes its attributes and those of its inherited `TextBox`.
         """
         self._line_numbers = line_numbers
+        # Held while the text is edited and while it is drawn, so that the render thread never reads the text in the
+        # middle of an edit made on the thread processing keypresses (see `_process_keys` and `write`).
+        self._lock: threading.RLock = threading.RLock()
 
         # Performing the initialization of the TextBox base class.
         super().__init__(
@@ -115,6 +124,23 @@ class TextEditor(TextBox):
         # Set the initial dynamic scroll buffers values.
         self._set_scroll_buffer()
 
+    def __call__(self, text: Union[str, list[str, ...], TextBuffer]) -> None:
+        """
+        Modify the current state of the TextEditor by replacing its contents with the given text.  The text is stored in
+        a `TextBuffer`, which `KeyProcessor` edits in place as keys are pressed.  Replacing the text clears the undo
+        history.
+        """
+        if isinstance(text, str):
+            text: list[str, ...] = [text]
+        if isinstance(text, list):
+            text: TextBuffer = TextBuffer(text)
+        with self._lock:
+            if isinstance(text, TextBuffer) and text is not self._text:
+                text.track_edits()
+                self._history.clear()
+                self._text_version += 1
+            super().__call__(text)
+
     def _init_editor_attributes(
         self,
         cursor_position: tuple[int, int],
@@ -126,13 +152,13 @@ class TextEditor(TextBox):
         line_number_background: Color,
         line_number_foreground: Color,
         line_number_style: str,
-        selected: Optional[list[tuple[int, int], ...]] = None,
+        selected: Optional[Selection] = None,
     ):
         """
         Prepare all the instance attributes for selected text, such as colors, style, and the resulting ANSI sequences
         that will be used to correctly display the text with these colors and styles.
 
-        Also initializes the coordinate list of selected text, set to an empty list by default.
+        Also initializes the selected text, set to an empty `Selection` by default.
         """
         # Set the default position of the cursor to (0, 0) if not otherwise specified.
         self._cursor_position = cursor_position
@@ -142,6 +168,9 @@ class TextEditor(TextBox):
         # Whether the TextEditor should be locked and all inputs ignored.
         self._frozen = frozen
 
+        # Key bindings of this TextEditor that extend or override those of `KeyProcessor` (see `bind_key`).
+        self._bindings: dict[str, Optional[Callable[..., tuple]]] = self._default_bindings()
+
         # Whether line numbers should be displayed on the left side of the text.
         self._line_numbers = line_numbers
 
@@ -157,7 +186,22 @@ class TextEditor(TextBox):
 
         # The full ANSI escape sequence that combines all the above three into one statement.
         self._select_ANSI_format: str = f"\033[{self._select_style_fmt}{self._select_fore_fmt};{self._select_back_fmt}m"
-        self._selected = selected if selected is not None else []
+        self._selected = selected if selected is not None else Selection()
+
+        # The undo history, and the cursor position and selection from before the edits not yet recorded in it.
+        self._history: EditHistory = EditHistory()
+        self._edit_state: tuple[tuple[int, int], Selection] = (self._cursor_position, self._selected)
+        # Incremented whenever the text is edited or replaced, to tell whether the count of search matches is current.
+        self._text_version: int = 0
+
+        # The active search (see `search`), the cursor position it started from, and the version of the text in which
+        # its matches were last counted.
+        self._search: Optional[Search] = None
+        self._search_origin: tuple[int, int] = self._cursor_position
+        self._search_version: Optional[int] = None
+        # A copy of the lines of the text to count search matches in, and the version of the text it was copied from.
+        self._search_lines: list[str, ...] = []
+        self._search_lines_version: Optional[int] = None
 
         # Saving the line number color and style settings to instance attributes.
         self._line_number_background = line_number_background
@@ -174,22 +218,188 @@ class TextEditor(TextBox):
             f"\033[{self._line_number_style_fmt}{self._line_number_fore_fmt};{self._line_number_back_fmt}m"
         )
 
-    def _process_text_wrapper(self):
-        if not self._line_numbers or self._text is None:
-            w = 0
+        # Formatted line numbers, memoized per gutter width, and the state of the gutter when it was last written (see
+        # `_write_gutter`) -- it is only written again when that state changes.
+        self._gutter_labels: dict[int, dict[int, str]] = {}
+        self._gutter_state: Optional[tuple] = None
+
+    def _commit_edits(self, cursor_position: tuple[int, int], selected: Selection) -> None:
+        """
+        Record the edits made to the text since the last call in the undo history as a single step, given the cursor
+        position and selection that resulted from them.
+        """
+        if isinstance(self._raw_text, TextBuffer) and (edits := self._raw_text.pop_edits()):
+            self._history.record(edits, self._edit_state, (cursor_position, selected))
+            self._text_version += 1
+        self._edit_state = (cursor_position, selected)
+
+    def _default_bindings(self) -> dict[str, Callable[..., tuple]]:
+        """
+        Return the key bindings that every TextEditor adds to those of `KeyProcessor`.
+        """
+        return {
+            "Ctrl-z": self._key_undo,
+            "Ctrl-y": self._key_redo,
+            "F3": self._key_find_next,
+            "Ctrl-F3": self._key_find_previous,
+        }
+
+    def _count_matches(self) -> None:
+        """
+        Start counting the matches of the active search in the background, in a copy of the text -- which is only copied
+        again once the text has changed, rather than every time the query does.
+        """
+        if self._search_lines_version != self._text_version:
+            self._search_lines = list(self._text)
+            self._search_lines_version = self._text_version
+        self._search.start_count(self._search_lines)
+        self._search_version = self._text_version
+
+    def _find(
+        self,
+        text: TextBuffer,
+        position: tuple[int, int],
+        selected: Selection,
+        backward: bool,
+        limit: Optional[int] = None,
+    ) -> tuple[tuple[int, int], Selection]:
+        """
+        Find the next match of the active search from the given position (or the previous match, if `backward` is set to
+        True) within `limit` lines if it is given, and return a cursor position at the end of the match and a
+        `Selection` of it.  Returns the given cursor position and selection if there is no active search or no match.
+        The text is not searched at all if the background count has already found no matches in it.
+        """
+        found: Optional[tuple[tuple[int, int], tuple[int, int]]] = None
+        if self._search is not None and not (self._search.count == 0 and self._search_version == self._text_version):
+            found = self._search.find(text, position, backward, limit)
+        if found is not None:
+            start, stop = found
+            position, selected = stop, Selection([(start, stop)])
+        return position, selected
+
+    def _gutter_label(self, number: int, w: int) -> str:
+        """
+        Return the given line number formatted to fill a gutter `w` columns wide, memoized per width.
+        """
+        labels: dict[int, str] = self._gutter_labels.setdefault(w, {})
+        if (label := labels.get(number)) is None:
+            if len(labels) >= self._gutter_cache_size:
+                labels.clear()
+            label = labels[number] = f"{str(number) + ' ':>{w}s}"
+        return label
+
+    def _gutter_width(self) -> int:
+        """
+        Return the number of columns reserved for displaying line numbers -- accounts for the number of lines in the
+        text, and is zero if line numbers are disabled.
+        """
+        if self._line_numbers:
+            w = max(Config.line_numbers_width, len(str(len(self._text))) + 1)
         else:
-            w = max(Config.line_numbers_width, int(np.log10(len(self._text))) + 2)
-        self._text_wrapper = TextWrapper(
+            w = 0
+        return w
+
+    def _key_find_next(
+        self, raw_text: TextBuffer, cursor_position: tuple[int, int], selected: Selection, shape: tuple[int, int]
+    ) -> tuple[TextBuffer, tuple[int, int], Selection]:
+        """
+        Key handler that selects the next match of the active search after the cursor.
+        """
+        cursor_position, selected = self._find(raw_text, cursor_position, selected, backward=False)
+        return raw_text, cursor_position, selected
+
+    def _key_find_previous(
+        self, raw_text: TextBuffer, cursor_position: tuple[int, int], selected: Selection, shape: tuple[int, int]
+    ) -> tuple[TextBuffer, tuple[int, int], Selection]:
+        """
+        Key handler that selects the previous match of the active search before the cursor (or before the selection).
+        """
+        position: tuple[int, int] = selected.start if selected else cursor_position
+        cursor_position, selected = self._find(raw_text, position, selected, backward=True)
+        return raw_text, cursor_position, selected
+
+    def _key_redo(
+        self, raw_text: TextBuffer, cursor_position: tuple[int, int], selected: Selection, shape: tuple[int, int]
+    ) -> tuple[TextBuffer, tuple[int, int], Selection]:
+        """
+        Key handler that redoes the last step undone, restoring the cursor position and selection that followed it.
+        """
+        self._commit_edits(cursor_position, selected)
+        if (state := self._history.redo(raw_text)) is not None:
+            cursor_position, selected = state
+        # The edits made by redoing are already in the history.
+        if raw_text.pop_edits():
+            self._text_version += 1
+        self._edit_state = (cursor_position, selected)
+        return raw_text, cursor_position, selected
+
+    def _key_undo(
+        self, raw_text: TextBuffer, cursor_position: tuple[int, int], selected: Selection, shape: tuple[int, int]
+    ) -> tuple[TextBuffer, tuple[int, int], Selection]:
+        """
+        Key handler that undoes the last step in the undo history, restoring the cursor position and selection that
+        preceded it.  Edits made by the keys processed before this one are recorded first, so they are undone first.
+        """
+        self._commit_edits(cursor_position, selected)
+        if (state := self._history.undo(raw_text)) is not None:
+            cursor_position, selected = state
+        # The edits made by undoing are already in the history.
+        if raw_text.pop_edits():
+            self._text_version += 1
+        self._edit_state = (cursor_position, selected)
+        return raw_text, cursor_position, selected
+
+    def _process_text_wrapper(self):
+        w = self._gutter_width() if self._text is not None else 0
+        self._text_wrapper: LineWrapper = LineWrapper(
             width=self._shape[1] - w,
             expand_tabs=False,
             replace_whitespace=False,
-            fix_sentence_endings=False,
             break_long_words=False,
             drop_whitespace=False,
             break_on_hyphens=False,
             subsequent_indent=self._wrap_subsequent_indent,
         )
 
+    def _process_keys(self, keys: list[str, ...]) -> None:
+        """
+        Apply a batch of keypresses to the text, cursor, and selection, and update the view once if anything changed --
+        so that a burst of keys (such as a paste) is drawn once, rather than once per key.  Ignored while the TextEditor
+        is frozen.  The text is edited in place, so the whole batch is processed while holding `_lock`.
+        """
+        if not self._frozen:
+            with self._lock:
+                self._edit_state = (self._cursor_position, self._selected)
+                call, self._raw_text, self._cursor_position, self._selected = KeyProcessor.process_keys(
+                    raw_text=self._raw_text,
+                    cursor_position=self._cursor_position,
+                    selected=self._selected,
+                    shape=self._shape,
+                    keys=keys,
+                    bindings=self._bindings,
+                )
+                self._commit_edits(self._cursor_position, self._selected)
+                if call:
+                    self.__call__(self._raw_text)
+
+    def _resize(self, terminal_size: tuple[int, int]) -> None:
+        """
+        Reformat the contents of the TextEditor due to a change in terminal dimensions (see `TextBox._resize`) while
+        holding `_lock`, as it is called by the `Screen` render scheduler.
+        """
+        with self._lock:
+            super()._resize(terminal_size)
+
+    async def _run_getch_async(self) -> None:
+        """
+        Coroutine equivalent of `_run_getch_thread`, which awaits batches of keypresses from
+        `Listener.aiter_key_batches`.
+        """
+        self._raw_text = self._text
+        self._term.cursor_show(flush=True)
+        async for keys in Listener.aiter_key_batches():
+            self._process_keys(keys)
+
     def _run_getch_thread(self) -> None:
         """
         Keeps updating the window every set number of seconds (given by `dt`) and accounts for changes in the terminal
@@ -200,16 +410,33 @@ class TextEditor(TextBox):
 
         self._term.cursor_show(flush=True)
         for key in getch_iterator:
-            if not self._frozen:
-                call, self._raw_text, self._cursor_position, self._selected = KeyProcessor.process_key(
-                    raw_text=self._raw_text,
-                    cursor_position=self._cursor_position,
-                    selected=self._selected,
-                    shape=self._shape,
-                    key=key,
+            # Process the key along with any others that arrived in the meantime.
+            self._process_keys([key] + getch_iterator.drain())
+
+    def _write_gutter(self, w: int) -> None:
+        """
+        Write the line numbers of the rows in view to the buffer, in a gutter `w` columns wide -- unless they are
+        already displayed.  The gutter only changes when the first row in view, the width of the gutter, the number of
+        rows, or the number of numbered rows change, so typing within a line never writes it again.
+        """
+        numbered: int = max(0, min(len(self._view), len(self._text) - self._origin[0]))
+        state: tuple = (
+            self._origin[0],
+            w,
+            len(self._view),
+            numbered,
+            self._row_start,
+            self._col_start,
+            Term._front_buffer_generation,
+        )
+        if state != self._gutter_state:
+            blank: str = " " * w
+            for m in range(len(self._view)):
+                label: str = self._gutter_label(m + 1 + self._origin[0], w) if m < numbered else blank
+                self._term.write(
+                    self._row_start + m, self._col_start, label, flush=False, fmt=self._line_number_ANSI_format
                 )
-                if call:
-                    self.__call__(self._raw_text)
+            self._gutter_state = state
 
     def _set_scroll_buffer(self) -> None:
         """
@@ -233,66 +460,60 @@ class TextEditor(TextBox):
     def _set_view(self) -> None:
         """ """
 
-        row, col = self._cursor_position
-        row_prev, col_prev = self._prev_cursor_position
+        with self._lock:
+            row, col = self._cursor_position
+            row_prev, col_prev = self._prev_cursor_position
+            # The cursor is placed by terminal cell, which differs from its column if the line contains wide characters
+            # or combining marks before it.
+            if self._text is not None and row < len(self._text):
+                col = CellWidth.column(self._text[row], col)
 
-        if row_prev != row:
-            self._origin = (self._origin[0], 0)
+            if row_prev != row:
+                self._origin = (self._origin[0], 0)
 
-        cursor_position = (
-            row + self._ref_row_start - self._origin[0],
-            col + self._ref_col_start - self._origin[1],
-        )
+            cursor_position = (
+                row + self._ref_row_start - self._origin[0],
+                col + self._ref_col_start - self._origin[1],
+            )
 
-        self._set_scroll_buffer()
+            self._set_scroll_buffer()
 
-        # Number of columns reserved for displaying line numbers -- accounts for the number of lines in the text.
-        if self._line_numbers:
-            w = max(Config.line_numbers_width, int(np.log10(len(self._text))) + 2)
-        else:
-            w = 0
+            # Number of columns reserved for displaying line numbers -- accounts for the number of lines in the text.
+            w = self._gutter_width()
 
-        # Vertically scrolls the view of the text based on the cursor position.
-        if (diff := cursor_position[0] - self._shape[0] + self._scroll_buffer[0]) >= 0:
-            self._origin = (self._origin[0] + diff, self._origin[1])
-        elif (diff := cursor_position[0] - self._scroll_buffer[0]) < 0:
-            self._origin = (max(0, self._origin[0] + diff - self._row_start), self._origin[1])
+            # Vertically scrolls the view of the text based on the cursor position.
+            if (diff := cursor_position[0] - self._shape[0] + self._scroll_buffer[0]) >= 0:
+                self._origin = (self._origin[0] + diff, self._origin[1])
+            elif (diff := cursor_position[0] - self._scroll_buffer[0]) < 0:
+                self._origin = (max(0, self._origin[0] + diff - self._row_start), self._origin[1])
 
-        if self._wrap_text:
+            if self._wrap_text:
 
-            cursor_position = (
-                row + (col // (self._shape[1] - w)) + self._row_start - self._origin[0],
-                col % (self._shape[1] - w) + self._col_start - self._origin[1] + w,
-            )
+                cursor_position = (
+                    row + (col // (self._shape[1] - w)) + self._row_start - self._origin[0],
+                    col % (self._shape[1] - w) + self._col_start - self._origin[1] + w,
+                )
 
-            self._selected_processed = [
-                (position[0] + self._row_start - self._origin[0], position[1] + self._col_start - self._origin[1])
-                for position in self._selected
-            ]
-            self._prev_cursor_position = self._cursor_position
-            self._term.cursor_move(*cursor_position, flush=True)
+                self._prev_cursor_position = self._cursor_position
+                self._term.cursor_move(*cursor_position, flush=True)
 
-        else:
+            else:
 
-            # Horizontally scrolls the view of the text based on the cursor position.
-            if (diff := cursor_position[1] - self._shape[1] + self._scroll_buffer[1]) >= 0:
-                self._origin = (self._origin[0], self._origin[1] + diff)
-            elif (diff := cursor_position[1] - self._scroll_buffer[1]) < 0:
-                self._origin = (self._origin[0], max(0, self._origin[1] + diff - self._col_start))
+                # Horizontally scrolls the view of the text based on the cursor position.
+                if (diff := cursor_position[1] - self._shape[1] + self._scroll_buffer[1]) >= 0:
+                    self._origin = (self._origin[0], self._origin[1] + diff)
+                elif (diff := cursor_position[1] - self._scroll_buffer[1]) < 0:
+                    self._origin = (self._origin[0], max(0, self._origin[1] + diff - self._col_start))
 
-            cursor_position = (
-                row + self._row_start - self._origin[0],
-                col + self._col_start - self._origin[1] + w,
-            )
+                cursor_position = (
+                    row + self._row_start - self._origin[0],
+                    col + self._col_start - self._origin[1] + w,
+                )
 
-            self._selected_processed = [
-                (position[0] + self._row_start - self._origin[0], position[1] + self._col_start - self._origin[1])
-                for position in self._selected
-            ]
-            self._prev_cursor_position = self._cursor_position
-            self._term.cursor_move(*cursor_position, flush=True)
+                self._prev_cursor_position = self._cursor_position
+                self._term.cursor_move(*cursor_position, flush=True)
 
-        super()._set_view()
+            super()._set_view()
 
     def start(self):
         """
@@ -307,6 +528,17 @@ class TextEditor(TextBox):
         self._thread = threading.Thread(target=self._run_getch_thread, daemon=False)
         self._thread.start()
 
+    def start_async(self) -> asyncio.Task:
+        """
+        Equivalent of `start` for use within an asyncio event loop: the TextEditor is drawn by `Screen.start_async` and
+        fed keypresses by `Listener.start_async`, with no threads of its own.  Returns the task processing the keys.
+        Must be called from within a coroutine, after `Screen.start_async` and `Listener.start_async`.
+        """
+        super().start()
+        self.__call__(self._text)
+        self._task = asyncio.get_running_loop().create_task(self._run_getch_async())
+        return self._task
+
     def freeze(self):
         """
         Freeze the TextEditor -- the `getch_iterator` in method `_run_getch_thread` will continue to run, but it will
@@ -320,58 +552,181 @@ class TextEditor(TextBox):
         """
         self._frozen = False
 
+    def bind_key(
+        self,
+        key: str,
+        handler: Callable[
+            [TextBuffer, tuple[int, int], Selection, tuple[int, int]], tuple[TextBuffer, tuple[int, int], Selection]
+        ],
+    ) -> None:
+        """
+        Bind the given key (such as `Ctrl-g` or `F5`) to a handler in this TextEditor, adding a new binding or
+        overriding the default one.  The handler is called with the text, the cursor position, the `Selection`, and the
+        shape of the TextEditor, and must return the new text, cursor position, and `Selection`.  The text may be
+        modified in place.
+        """
+        if not callable(handler):
+            error_message: str = f"\n\nThe handler bound to key `{key}` in {self._type} instance must be callable.\n"
+            System.kill_all = True
+            raise TypeError(error_message)
+        self._bindings[key] = handler
+
+    def unbind_key(self, key: str) -> None:
+        """
+        Remove the binding of the given key in this TextEditor, such that pressing it has no effect -- this applies to
+        default bindings and characters too.
+        """
+        self._bindings[key] = None
+
+    def search(self, query: str, regex: bool = False, case_sensitive: bool = True) -> None:
+        """
+        Search the text for the given query (a regular expression if `regex` is set to True), highlighting all the
+        matches in view and selecting the first match after the cursor.  Designed to be called again every time the
+        query changes, as it is typed: each new query is searched for from where the cursor was when the search
+        started, rather than from the last match.  An empty query ends the search (see `clear_search`).
+
+        Only the lines in view are highlighted, and the first match is only searched for within `_search_window` lines
+        of where the search started, so that each change of the query takes bounded time however large the text is --
+        `find_next` searches the whole text.  The total number of matches is counted in the background (see
+        `search_count`).
+        """
+        with self._lock:
+            if self._search is None:
+                self._search_origin = self._cursor_position
+            else:
+                self._search.cancel()
+
+            if not query:
+                self.clear_search()
+            else:
+                self._search = Search(query, regex=regex, case_sensitive=case_sensitive)
+                self._count_matches()
+                self._cursor_position, self._selected = self._find(
+                    self._text, self._search_origin, Selection(), backward=False, limit=self._search_window
+                )
+                self.__call__(self._text)
+
+    def find_next(self) -> None:
+        """
+        Select the next match of the active search after the cursor, wrapping around to the start of the text.
+        """
+        with self._lock:
+            self._cursor_position, self._selected = self._find(
+                self._text, self._cursor_position, self._selected, backward=False
+            )
+            self.__call__(self._text)
+
+    def find_previous(self) -> None:
+        """
+        Select the previous match of the active search before the cursor, wrapping around to the end of the text.
+        """
+        with self._lock:
+            _, self._cursor_position, self._selected = self._key_find_previous(
+                self._text, self._cursor_position, self._selected, self._shape
+            )
+            self.__call__(self._text)
+
+    def clear_search(self) -> None:
+        """
+        End the active search, removing the highlighting of its matches.  The selected match remains selected.
+        """
+        with self._lock:
+            if self._search is not None:
+                self._search.cancel()
+            self._search = None
+            self._search_lines = []
+            self._search_lines_version = None
+            self.__call__(self._text)
+
+    @property
+    def search_count(self) -> Optional[int]:
+        """
+        Return the number of matches of the active search in the whole text, or None if there is no active search or
+        the matches are still being counted in the background.  Counted again whenever the text has changed.
+        """
+        count: Optional[int] = None
+        if self._search is not None:
+            if self._search_version != self._text_version:
+                self._count_matches()
+            count = self._search.count
+        return count
+
+    def reset_key(self, key: str) -> None:
+        """
+        Restore the default binding of the given key in this TextEditor, undoing any calls to `bind_key` or
+        `unbind_key`.
+        """
+        self._bindings.pop(key, None)
+        if key in (default_bindings := self._default_bindings()):
+            self._bindings[key] = default_bindings[key]
+
     def write(self) -> None:
         """
-        Write the text to its designated coordinates with the view taken into account.
+        Write the text to its designated coordinates with the view taken into account.  The line numbers are written
+        separately, and only when they change (see `_write_gutter`).  Holds `_lock`, so that the text is never drawn in
+        the middle of an edit.
         """
-        if self._line_numbers:
+        with self._lock:
             # Number of columns reserved for displaying line numbers -- accounts for the number of lines in the text.
-            w = max(Config.line_numbers_width, int(np.log10(len(self._text))) + 2)
-            # Checking the shape the terminal had when this method was last called.
-            expected_shape = (self._view.shape[0], self._view.shape[1] + w)
-        else:
-            w = 0
-            expected_shape = self._view.shape
-
-        # Clearing the current_output attribute if the terminal had a different shape when last writing to the terminal.
-        if self._current_output is None or self._current_output.shape != expected_shape:
-            self._current_output = np.full(expected_shape, "", dtype=object)
-
-        # Saving the cursor position, as it will move during printing.
-        self._term.cursor_save()
-        # Hiding the cursor, otherwise it might jump around the terminal.
-        self._term.cursor_hide()
-
-        # Iterate through each row of the text.
-        for m, line in enumerate(self._view):
-            row = self._row_start + m
-            if self._line_numbers:
-                if (number := m + 1 + self._origin[0]) <= len(self._text):
-                    number = str(number) + " "
-                else:
-                    number = " "
-                # TODO: vectorize
-                # line[w:] = line[:-w]
-                # line[:w] = np.array(list(f"{number:>{w}s}"), dtype=object)
-                line = np.concatenate([np.array(list(f"{number:>{w}s}"), dtype=object), line[:-w]])
-            # Iterate through each column in the current row of the text.
-            for n, char in enumerate(line):
-                col = self._col_start + n
-                position = (row, col - w)
-                if self._line_numbers and n < w:
-                    char = f"{self._line_number_ANSI_format}{char}\033[m"
-                elif position in self._selected_processed:
-                    char = f"{self._select_ANSI_format}{char}\033[m"
-                else:
-                    char = f"{self._ANSI_format}{char}\033[m"
-                # Write to the buffer, without flushing to the terminal.
-                if char != self._current_output[m, n]:
-                    self._term.write(row, col, char, flush=False)
-                    self._current_output[m, n] = char
-
-        # Restoring the cursor position to its intended location.
-        self._term.cursor_load()
-        # Restoring the cursor after all the characters will have been printed.
-        self._term.cursor_show()
-        # Flushing the results to the terminal.  Waiting to flush improves efficienty significantly.
-        self._term.flush()
+            w = self._gutter_width()
+
+            # Saving the cursor position, as it will move during printing.
+            self._term.cursor_save()
+            # Hiding the cursor, otherwise it might jump around the terminal.
+            self._term.cursor_hide()
+
+            if w:
+                self._write_gutter(w)
+
+            # Iterate through each row of the text.
+            for m, line in enumerate(self._view):
+                row = self._row_start + m
+                # Selected columns and search matches of the row of text displayed on this row, relative to the start of
+                # the TextBox -- both are highlighted alike.  Only the rows in view are matched against the search
+                # query.
+                spans = []
+                text_row = m + self._origin[0]
+                if (self._selected or self._search is not None) and 0 <= text_row < len(self._text):
+                    text_line = self._text[text_row]
+                    if self._selected:
+                        spans.extend(self._selected.spans(text_row, len(text_line)))
+                    if self._search is not None:
+                        spans.extend(self._search.spans(text_line))
+                    # Converted from columns of the line to terminal cells.
+                    spans = [
+                        (
+                            CellWidth.column(text_line, start) - self._origin[1] + w,
+                            CellWidth.column(text_line, stop) - self._origin[1] + w,
+                        )
+                        for start, stop in spans
+                    ]
+                # The terminal cells in the current row of the text, to the right of the line numbers.
+                cells = CellWidth.cells(CellWidth.slice(line, 0, CellWidth.string_width(line) - w))
+                # Runs of cells alternating between unhighlighted and highlighted, split at the bounds of the spans
+                # (which are merged where they overlap) -- each run is written in a single call.
+                bounds = [w]
+                for start, stop in sorted(spans):
+                    start, stop = max(start, bounds[-1]), min(stop, w + len(cells))
+                    if start < stop:
+                        if start == bounds[-1] and len(bounds) > 1:
+                            bounds[-1] = stop
+                        else:
+                            bounds.extend((start, stop))
+                bounds.append(w + len(cells))
+                for k in range(len(bounds) - 1):
+                    # A run never starts on the right half of a wide character, which is written along with its left
+                    # half.
+                    start, stop = bounds[k] + (cells[bounds[k] - w : bounds[k] - w + 1] == [""]), bounds[k + 1]
+                    if start < stop:
+                        fmt = self._select_ANSI_format if k % 2 else self._ANSI_format
+                        run = "".join(cells[start - w : stop - w])
+                        # Write to the buffer, without flushing to the terminal.  Cells that are unchanged since the
+                        # last frame are filtered out by `Term` when flushing.
+                        self._term.write(row, self._col_start + start, run, flush=False, fmt=fmt)
+
+            # Restoring the cursor position to its intended location.
+            self._term.cursor_load()
+            # Restoring the cursor after all the characters will have been printed.
+            self._term.cursor_show()
+            # Flushing the results to the terminal -- only the cells that changed since the last frame are output.
+            self._term.flush()